@@ -7,15 +7,41 @@ Command-line interface for running Windows security compliance checks.
 import sys
 import json
 import time
+import hashlib
 import argparse
+import queue
 import subprocess
 import ctypes
 from typing import Dict, List, Any
 from datetime import datetime
 import os
+import sqlite3
+import socket
 
-# Import all compliance functions
-from windows_tasks import *
+from integrity import verify_paths
+from report_compare import compare_series, format_diff, REGRESSION
+from report_stream import expand_report_paths
+from fleet import aggregate_fleet, load_host_groups
+from results_store import get_store
+from result_records import ResultSet, TaskCatalog
+from retention import apply_retention, load_policies
+from sampling import (DEFAULT_FRACTION, DEFAULT_PERIOD, estimate_pass_rates, format_estimates,
+                      sample_strata, select_sample, stratify)
+
+# Import all compliance functions for the current platform
+if sys.platform.startswith('win'):
+    from windows_tasks import *
+    import windows_tasks as platform_tasks
+    DEFAULT_TASKS_FILE = "windows_tasks.json"
+else:
+    from linux_tasks import *
+    import linux_tasks as platform_tasks
+    DEFAULT_TASKS_FILE = "linux_tasks.json"
+
+
+def supports(capability: str) -> bool:
+    """Whether the platform module offers an optional feature (its CAPABILITIES)."""
+    return capability in getattr(platform_tasks, 'CAPABILITIES', ())
 
 
 class ComplianceCLI:
@@ -23,8 +49,11 @@ class ComplianceCLI:
         self.results = []
         self.start_time = None
         self.end_time = None
+        self.run_id = None
+        self.inputs = {}  # script_key -> serialized input signature of its result
+        self.sample = None  # heading -> rules and the period of a --sample run
         
-    def load_tasks(self, json_file: str = "windows_tasks.json") -> List[Dict]:
+    def load_tasks(self, json_file: str = DEFAULT_TASKS_FILE) -> List[Dict]:
         """Load compliance tasks from JSON file."""
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
@@ -47,7 +76,7 @@ class ComplianceCLI:
                 'current': 'Unknown'
             }
         
-        # Get the function from windows_tasks module
+        # Get the function from the platform tasks module
         try:
             func = globals().get(script_key)
             if not func:
@@ -80,49 +109,234 @@ class ComplianceCLI:
                 'current': 'Unknown'
             }
     
-    def run_checks(self, tasks: List[Dict], filter_heading: str = None, filter_subheading: str = None, filter_title: str = None) -> List[Dict]:
-        """Run compliance checks with optional filtering."""
+    @staticmethod
+    def matches_filters(task: Dict, filter_heading: str = None, filter_subheading: str = None, filter_title: str = None) -> bool:
+        """Whether a task passes the heading/subheading/title filters."""
+        if filter_heading and task.get('heading', '').lower() != filter_heading.lower():
+            return False
+        if filter_subheading and task.get('subheading', '').lower() != filter_subheading.lower():
+            return False
+        if filter_title and task.get('title', '').lower() != filter_title.lower():
+            return False
+        return True
+    
+    def run_tracked_check(self, task: Dict) -> Dict:
+        """Run a check and, where the platform records rule inputs, fingerprint them."""
+        if not supports('incremental'):
+            return self.run_single_check(task)
+        result, used = run_with_dependencies(lambda: self.run_single_check(task))
+        inputs = rule_inputs(used)
+        if inputs is not None:
+            serialized = json.dumps(inputs, sort_keys=True)
+            result['fingerprint'] = hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+            self.inputs[task.get('script_key')] = serialized
+        return result
+    
+    def load_reusable_results(self) -> Dict[str, Dict]:
+        """Latest stored result per rule, for rules whose inputs can be fingerprinted."""
+        if not supports('incremental'):
+            return {}
+        try:
+            return get_store().latest_results()
+        except (sqlite3.Error, OSError):
+            return {}
+    
+    def reuse_result(self, task: Dict, stored: Dict[str, Dict], memo: Dict) -> Dict:
+        """The stored result of a task marked cached if its inputs are unchanged, else None."""
+        row = stored.get(task.get('script_key'))
+        if not row or not row.get('inputs'):
+            return None
+        try:
+            inputs = json.loads(row['inputs'])
+        except ValueError:
+            return None
+        if not inputs_unchanged(inputs, memo):
+            return None
+        self.inputs[task.get('script_key')] = row['inputs']
+        return {
+            'status': row['status'],
+            'message': row['message'],
+            'previous': row['previous'],
+            'current': row['current'],
+            'fingerprint': row['fingerprint'],
+            'cached': True
+        }
+    
+    def select_sample(self, tasks: List[Dict], fraction: float = DEFAULT_FRACTION, period: int = DEFAULT_PERIOD,
+                      filter_heading: str = None, filter_subheading: str = None, filter_title: str = None) -> set:
+        """
+        Task ids of a stratified sample of the filtered tasks, rotated by the
+        rules' latest results in the store (see sampling.py).
+        """
+        eligible = [task_id for task_id, task in enumerate(tasks)
+                    if self.matches_filters(task, filter_heading, filter_subheading, filter_title)]
+        try:
+            last_seen = get_store().last_evaluated()
+        except (sqlite3.Error, OSError):
+            last_seen = {}
+        self.sample = {
+            'population': {heading: len(ids) for heading, ids in stratify(tasks, eligible).items()},
+            'period': period
+        }
+        return set(select_sample(tasks, eligible, last_seen, fraction, period))
+    
+    def sample_estimates(self) -> Dict:
+        """Estimated pass rates of a --sample run, overall and per heading."""
+        return estimate_pass_rates(sample_strata(self.sample['population'], self.results))
+    
+    def run_checks(self, tasks: List[Dict], filter_heading: str = None, filter_subheading: str = None, filter_title: str = None,
+                   incremental: bool = False, only: set = None) -> ResultSet:
+        """
+        Run compliance checks with optional filtering. With incremental=True a
+        rule whose recorded inputs are unchanged since its last stored result
+        is not re-evaluated; the stored result is reused and marked cached.
+        `only` restricts the run to those task ids (a --sample selection).
+        """
         self.start_time = time.time()
-        results = []
+        results = ResultSet(TaskCatalog(tasks))
+        stored = self.load_reusable_results() if incremental else {}
+        memo = {}
         
-        print(f"Running {len(tasks)} compliance checks...")
+        if only is not None:
+            print(f"Sampling {len(only)} of {len(tasks)} compliance checks...")
+        else:
+            print(f"Running {len(tasks)} compliance checks...")
         print("=" * 60)
         
-        for i, task in enumerate(tasks, 1):
+        for task_id, task in enumerate(tasks):
+            i = task_id + 1
             # Apply filters
-            if filter_heading and task.get('heading', '').lower() != filter_heading.lower():
-                continue
-            if filter_subheading and task.get('subheading', '').lower() != filter_subheading.lower():
+            if only is not None and task_id not in only:
                 continue
-            if filter_title and task.get('title', '').lower() != filter_title.lower():
+            if not self.matches_filters(task, filter_heading, filter_subheading, filter_title):
                 continue
             
             print(f"[{i}/{len(tasks)}] {task.get('title', 'Unknown')}")
             
             # Run the check
-            result = self.run_single_check(task)
+            result = self.reuse_result(task, stored, memo) if stored else None
+            if result is None:
+                result = self.run_tracked_check(task)
             
-            # Add task info to result
-            result.update({
-                'heading': task.get('heading', ''),
-                'subheading': task.get('subheading', ''),
-                'title': task.get('title', ''),
-                'details': task.get('details', ''),
-                'script_key': task.get('script_key', ''),
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            results.append(result)
+            # Task info is read back from the catalog entry
+            results.append(task_id, result)
             
             # Print result
             status_icon = "✓" if result['status'] == 'success' else "✗"
-            print(f"  {status_icon} {result['message']}")
+            print(f"  {status_icon} {result['message']}" + (" (cached)" if result.get('cached') else ""))
             print()
         
         self.end_time = time.time()
         self.results = results
         return results
     
+    def save_results(self) -> None:
+        """Record this run and its results in the shared results store."""
+        try:
+            store = get_store()
+            started = datetime.fromtimestamp(self.start_time).isoformat() if self.start_time else None
+            self.run_id = store.start_run('cli-sample' if self.sample else 'cli', started)
+            for result in self.results:
+                inputs = self.inputs.get(result.get('script_key')) if result.get('fingerprint') else None
+                store.add_result(self.run_id, result, inputs=inputs)
+            store.finish_run(self.run_id)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: could not save results to the store: {e}")
+    
+    def remediate_failed(self) -> None:
+        """Remediate failed checks in a single transaction, then re-run them."""
+        if not supports('remediation'):
+            print("Transactional remediation is only available on Linux.")
+            return
+        failed = [r['script_key'] for r in self.results if r['status'] != 'success']
+        applied, outcome = remediate(failed)
+        if not applied:
+            print("No failed checks have an automatic remediation.")
+            return
+        status_icon = "✓" if outcome.ok else "✗"
+        print(f"{status_icon} Remediation of {len(applied)} checks: {outcome.summary()}")
+        if outcome.backup:
+            print(f"  Backup saved to: {outcome.backup}")
+            pruned = apply_retention(["linux_backups"])
+            if pruned.deleted:
+                print(f"  Backup retention: {pruned.summary()}")
+        for index, record in enumerate(self.results):
+            if record['script_key'] in applied:
+                self.inputs.pop(record['script_key'], None)
+                self.results.replace(index, self.run_tracked_check(record.task))
+        print()
+    
+    def watch(self, tasks: List[Dict], filter_heading: str = None, filter_subheading: str = None,
+              filter_title: str = None, interval: float = 300, format: str = 'text') -> None:
+        """
+        Keep the selected rules loaded and re-run only those whose inputs
+        change, printing a drift event whenever a result changes. Rules that
+        read no watchable file (live command/state snapshots) are re-run
+        every `interval` seconds instead.
+        """
+        if not supports('watch'):
+            print("Watch mode is only available on Linux.")
+            return
+        selected = [t for t in tasks if t.get('script_key')
+                    and self.matches_filters(t, filter_heading, filter_subheading, filter_title)]
+        current = {}
+        dependencies = {}
+        for task in selected:
+            result, used = run_with_dependencies(lambda: self.run_single_check(task))
+            current[task['script_key']] = result
+            dependencies[task['script_key']] = used
+        
+        events = queue.Queue()
+        watcher = FactWatcher(on_change=lambda names, paths: events.put((names, paths))).start()
+        watched = watched_facts()
+        polled = [t for t in selected if not dependencies[t['script_key']] <= watched]
+        print(f"Watching {len(selected)} rules ({len(selected) - len(polled)} event-driven, "
+              f"{len(polled)} re-checked every {interval:g}s). Press Ctrl+C to stop.")
+        
+        def recheck(affected, paths):
+            for task in affected:
+                key = task['script_key']
+                result, used = run_with_dependencies(lambda: self.run_single_check(task))
+                dependencies[key] = used
+                previous = current[key]
+                current[key] = result
+                if (result.get('status'), result.get('current')) == (previous.get('status'), previous.get('current')):
+                    continue
+                event = {
+                    'event': 'drift',
+                    'timestamp': datetime.now().isoformat(),
+                    'script_key': key,
+                    'title': task.get('title', ''),
+                    'previous_status': previous.get('status'),
+                    'status': result.get('status'),
+                    'previous': previous.get('current'),
+                    'current': result.get('current'),
+                    'message': result.get('message'),
+                    'paths': sorted(paths)
+                }
+                if format == 'json':
+                    print(json.dumps(event), flush=True)
+                else:
+                    arrow = f"{'✓' if previous.get('status') == 'success' else '✗'} -> {'✓' if result.get('status') == 'success' else '✗'}"
+                    print(f"[{event['timestamp']}] DRIFT {event['title']}: {arrow} {event['message']}", flush=True)
+        
+        next_poll = time.monotonic() + interval
+        try:
+            while True:
+                try:
+                    names, paths = events.get(timeout=max(0.0, next_poll - time.monotonic()))
+                    while not events.empty():
+                        more_names, more_paths = events.get_nowait()
+                        names, paths = names | more_names, paths | more_paths
+                    recheck([t for t in selected if dependencies[t['script_key']] & names], paths)
+                except queue.Empty:
+                    recheck(polled, set())
+                    next_poll = time.monotonic() + interval
+        except KeyboardInterrupt:
+            print("\nWatch stopped.")
+        finally:
+            watcher.stop()
+    
     def generate_report(self, output_file: str = None, format: str = 'text') -> str:
         """Generate compliance report."""
         if not self.results:
@@ -130,7 +344,7 @@ class ComplianceCLI:
         
         # Calculate statistics
         total_checks = len(self.results)
-        successful_checks = len([r for r in self.results if r['status'] == 'success'])
+        successful_checks = self.results.count('success')
         failed_checks = total_checks - successful_checks
         duration = self.end_time - self.start_time if self.end_time and self.start_time else 0
         
@@ -142,10 +356,15 @@ class ComplianceCLI:
                     'failed_checks': failed_checks,
                     'success_rate': f"{(successful_checks/total_checks)*100:.1f}%" if total_checks > 0 else "0%",
                     'duration_seconds': round(duration, 2),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': datetime.now().isoformat(),
+                    'host': socket.gethostname()
                 },
-                'results': self.results
+                'results': list(self.results.to_dicts(details=False)),
+                # Task details once per rule rather than in every result
+                'details': self.results.details()
             }
+            if self.sample:
+                report['sampling'] = dict(self.sample_estimates(), period=self.sample['period'])
             report_text = json.dumps(report, indent=2)
         else:
             # Text format
@@ -158,7 +377,11 @@ class ComplianceCLI:
                 f"Successful: {successful_checks}",
                 f"Failed: {failed_checks}",
                 f"Success Rate: {(successful_checks/total_checks)*100:.1f}%" if total_checks > 0 else "0%",
-                "",
+                ""
+            ]
+            if self.sample:
+                report_lines += format_estimates(self.sample_estimates(), self.sample['period']) + [""]
+            report_lines += [
                 "Detailed Results:",
                 "=" * 40
             ]
@@ -276,6 +499,136 @@ class ComplianceCLI:
             print(f"python HardenSys.py --subheading \"{list(grouped[list(grouped.keys())[0]].keys())[0]}\"")
 
 
+def run_integrity(paths: List[str], baseline_name: str, update: bool = False, verbose: bool = False):
+    """Verify paths against an integrity baseline and print added/removed/modified files."""
+    start = time.time()
+    report = verify_paths(baseline_name, [os.path.abspath(p) for p in paths], update=update)
+    print(f"Integrity check '{baseline_name}': {report.summary()} in {time.time() - start:.2f} seconds")
+    if report.created:
+        print(f"Baseline '{baseline_name}' created with {len(report.added)} files")
+    for label, files in (("Added", report.added), ("Removed", report.removed), ("Modified", report.modified)):
+        if files and (verbose or (label != "Added" and not report.created) or update):
+            print(f"\n{label}:")
+            for path in files:
+                print(f"  {path}")
+    for path, error in report.errors.items():
+        print(f"  ✗ {path}: {error}")
+    # A new baseline only records the current state; changes are measured against an existing one
+    if not report.clean and not (update or report.created):
+        sys.exit(2)
+
+
+def run_retention(dry_run: bool = False, verbose: bool = False):
+    """Apply the retention policies to reports/ and backup/ and print what changed."""
+    try:
+        policies = load_policies()
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot read retention policies: {e}")
+        sys.exit(1)
+    store = None
+    try:
+        store = get_store()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warning: report index not updated: {e}")
+    result = apply_retention(policies=policies, store=store, dry_run=dry_run)
+    print(f"Retention{' (dry run)' if dry_run else ''}: {result.summary()}")
+    if verbose:
+        for label, paths in (("Removed", result.deleted), ("Compressed", result.compressed)):
+            for path in paths:
+                print(f"  {label}: {path}")
+    for error in result.errors:
+        print(f"  ✗ {error}")
+
+
+def run_compare(sources: List[str], format: str = 'text', verbose: bool = False):
+    """Compare runs (JSON reports, report directories or run:<id>) pairwise in order."""
+    sources = expand_report_paths(sources)
+    if len(sources) < 2:
+        print("Error: --compare needs at least two reports or runs")
+        sys.exit(1)
+    totals = {}
+    regressed = {}
+    pairs = 0
+    try:
+        for diff in compare_series(sources):
+            pairs += 1
+            for kind, count in diff.counts.items():
+                totals[kind] = totals.get(kind, 0) + count
+            for changes in diff.changes.values():
+                for change in changes:
+                    if change['kind'] == REGRESSION:
+                        name = change['title'] or change['rule']
+                        regressed[name] = regressed.get(name, 0) + 1
+            if format == 'json':
+                print(json.dumps(diff.to_dict()), flush=True)
+            else:
+                print(format_diff(diff, verbose))
+                print()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if format != 'json' and pairs > 1:
+        print(f"Compared {pairs + 1} runs: " + ", ".join(f"{kind}: {count}" for kind, count in sorted(totals.items())))
+        for title, count in sorted(regressed.items(), key=lambda item: -item[1])[:10]:
+            print(f"  {count}x regressed: {title}")
+    if totals.get(REGRESSION):
+        sys.exit(2)
+
+
+def run_fleet_aggregate(sources: List[str], host_groups_file: str = None, workers: int = None,
+                        top: int = 10, format: str = 'text', output_file: str = None):
+    """Aggregate per-host JSON reports into fleet pass rates and rankings."""
+    start = time.time()
+    paths = expand_report_paths(sources)
+    try:
+        host_groups = load_host_groups(host_groups_file)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot read host groups: {e}")
+        sys.exit(1)
+    summary = aggregate_fleet(paths, host_groups, workers, worst_hosts=top).to_dict(top)
+    
+    if format == 'json':
+        text = json.dumps(summary, indent=2)
+    else:
+        lines = [
+            "Fleet Compliance Summary",
+            "=" * 40,
+            f"Hosts: {summary['hosts']} ({summary['unreadable_reports']} unreadable reports)",
+            f"Results: {summary['results']}",
+            f"Fleet pass rate: {summary['pass_rate']}%",
+            f"Aggregated in {time.time() - start:.2f} seconds",
+            "",
+            "Host groups:"
+        ]
+        lines += [f"  {group}: {g['pass_rate']}% ({g['hosts']} hosts)" for group, g in summary['groups'].items()]
+        lines += ["", "Headings:"]
+        lines += [f"  {heading or 'Unknown'}: {h['pass_rate']}% ({h['failed']} failures)"
+                  for heading, h in summary['headings'].items()]
+        lines += ["", f"Top {top} failing rules:"]
+        lines += [f"  {r['failed_hosts']:>6} hosts  {r['title'] or r['rule']}" for r in summary['top_failing_rules']]
+        lines += ["", f"Worst {top} hosts:"]
+        lines += [f"  {h['host']} ({h['group']}): {h['failed']} failed, {h['pass_rate']}% passed" for h in summary['worst_hosts']]
+        text = "\n".join(lines)
+    
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Fleet summary saved to: {output_file}")
+    else:
+        print(text)
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Windows Security Compliance CLI Tool",
@@ -290,11 +643,19 @@ Examples:
   python HardenSys.py --output report.txt          # Save report to file
   python HardenSys.py --format json                # Generate JSON report
   python HardenSys.py --list                       # List available categories
+  python HardenSys.py --watch                      # Report drift as configuration files change
+  python HardenSys.py --remediate                  # Fix failed checks, then re-check
+  python HardenSys.py --sample 0.1                 # Estimate pass rates from a rotating 10% sample
+  python HardenSys.py --compare old.json new.json  # Show regressions and fixes between runs
+  python HardenSys.py --compare run:-2 run:latest  # Compare the last two stored runs
+  python HardenSys.py --fleet-aggregate reports/   # Fleet pass rates from per-host reports
+  python HardenSys.py --integrity /usr/sbin         # Verify files against the integrity baseline
+  python HardenSys.py --retention --retention-dry-run  # Show which old reports/backups would be pruned
         """
     )
     
-    parser.add_argument('--json', default='windows_tasks.json', 
-                       help='Path to tasks JSON file (default: windows_tasks.json)')
+    parser.add_argument('--json', default=DEFAULT_TASKS_FILE, 
+                       help=f'Path to tasks JSON file (default: {DEFAULT_TASKS_FILE})')
     parser.add_argument('--heading', 
                        help='Filter by heading (e.g., "Account Policies")')
     parser.add_argument('--subheading', 
@@ -311,6 +672,41 @@ Examples:
                        help='List available categories and exit')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
+    parser.add_argument('--full', action='store_true',
+                       help='Re-evaluate every rule instead of reusing results whose inputs are unchanged')
+    parser.add_argument('--no-store', action='store_true',
+                       help='Do not record this run in the results database (data/hardensys.db)')
+    parser.add_argument('--remediate', action='store_true',
+                       help='Remediate failed checks in one transaction and re-check them (Linux)')
+    parser.add_argument('--sample', nargs='?', type=float, const=DEFAULT_FRACTION, metavar='FRACTION',
+                       help=f'Evaluate a stratified sample of rules per heading (default fraction: {DEFAULT_FRACTION}) '
+                            'and report estimated pass rates with 95%% confidence intervals')
+    parser.add_argument('--sample-period', type=int, default=DEFAULT_PERIOD, metavar='RUNS',
+                       help=f'With --sample, evaluate every rule at least once per RUNS sampled runs (default: {DEFAULT_PERIOD})')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and report drift when a rule\'s input files change (Linux)')
+    parser.add_argument('--watch-interval', type=float, default=300, metavar='SECONDS',
+                       help='Re-check interval for rules without watchable inputs in --watch mode (default: 300)')
+    parser.add_argument('--compare', nargs='+', metavar='SOURCE',
+                       help='Compare runs in order: JSON reports, directories of reports, or run:<id>/run:latest/run:-2 (finished CLI runs; run:gui:latest for another source) from the results database')
+    parser.add_argument('--fleet-aggregate', nargs='+', metavar='PATH',
+                       help='Aggregate per-host JSON reports (files or directories) into fleet pass rates and rankings')
+    parser.add_argument('--host-groups', metavar='FILE',
+                       help='JSON file mapping host -> group or group -> [hosts] for --fleet-aggregate (default: report directory name)')
+    parser.add_argument('--workers', type=_positive_int,
+                       help='Worker processes for --fleet-aggregate (default: CPU count)')
+    parser.add_argument('--top', type=int, default=10,
+                       help='Number of failing rules and worst hosts to list (default: 10)')
+    parser.add_argument('--retention', action='store_true',
+                       help='Prune and compress old reports and backups per retention.json (or the defaults)')
+    parser.add_argument('--retention-dry-run', action='store_true',
+                       help='With --retention, only list what would be removed or compressed')
+    parser.add_argument('--integrity', nargs='+', metavar='PATH',
+                       help='Verify files/directories against the integrity baseline (created on first run)')
+    parser.add_argument('--baseline-name', default='default',
+                       help='Name of the integrity baseline to use (default: default)')
+    parser.add_argument('--update-baseline', action='store_true',
+                       help='Accept the current state of --integrity paths as the new baseline')
     
     args = parser.parse_args()
     
@@ -323,6 +719,24 @@ Examples:
     except:
         pass  # Not on Windows or admin check failed
     
+    if args.retention:
+        run_retention(args.retention_dry_run, args.verbose)
+        return
+    
+    if args.fleet_aggregate:
+        run_fleet_aggregate(args.fleet_aggregate, args.host_groups, args.workers, args.top, args.format, args.output)
+        return
+    
+    # Comparison mode only reads earlier runs
+    if args.compare:
+        run_compare(args.compare, args.format, args.verbose)
+        return
+    
+    # Integrity mode does not run compliance checks
+    if args.integrity:
+        run_integrity(args.integrity, args.baseline_name, args.update_baseline, args.verbose)
+        return
+    
     cli = ComplianceCLI()
     
     # Load tasks
@@ -338,9 +752,27 @@ Examples:
         cli.show_info(tasks, args.info)
         return
     
+    if args.watch:
+        cli.watch(tasks, args.heading, args.subheading, args.parameter, args.watch_interval, args.format)
+        return
+    
+    sample = None
+    if args.sample is not None:
+        if not 0 < args.sample <= 1 or args.sample_period < 1:
+            print("Error: --sample needs a fraction in (0, 1] and --sample-period at least 1")
+            sys.exit(1)
+        if args.no_store:
+            print("Warning: --no-store does not record which rules were sampled; coverage will not rotate")
+        sample = cli.select_sample(tasks, args.sample, args.sample_period, args.heading, args.subheading, args.parameter)
+    
     # Run checks
     try:
-        results = cli.run_checks(tasks, args.heading, args.subheading, args.parameter)
+        results = cli.run_checks(tasks, args.heading, args.subheading, args.parameter,
+                                 incremental=not (args.full or args.no_store), only=sample)
+        if args.remediate:
+            cli.remediate_failed()
+        if not args.no_store:
+            cli.save_results()
         
         # Generate and display report
         report = cli.generate_report(args.output, args.format)
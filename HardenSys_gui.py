@@ -6,9 +6,10 @@ import threading
 import platform
 import json
 import os
-from typing import List
+import queue
+from typing import Iterator, List
 
-from PySide6.QtCore import Qt, Signal, QObject
+from PySide6.QtCore import Qt, Signal, QObject, QTimer
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTreeWidget, QTreeWidgetItem, QLineEdit, QProgressBar, QPlainTextEdit,
@@ -16,46 +17,107 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor
 from windows_tasks import backup_password_policy, restore_password_policy
+from results_store import ResultStore, get_store
+from html_report import write_html_report
+from pdf_report import start_pdf_report
+from retention import apply_retention, extract_for_viewing, extracted, open_artifact, is_compressed, original_path
 
 
 # ----------------------- Central Logging -----------------------
 class ActionLogger:
-    def __init__(self):
-        self.actions = []  # list of dicts: {timestamp, action, details}
-        self.compliance_records = []  # list of dicts: {parameter, previous, current, status, severity, timestamp}
-        self.rollback_records = []  # list of dicts: {timestamp, parameter, backup_path}
+    """
+    Audit trail of the current GUI session. Records are persisted in the
+    shared results store (one run per session) instead of in-memory lists.
+    """
+
+    def __init__(self, store: ResultStore = None):
+        self._store = store
+        self.run_id = None
+
+    @property
+    def store(self) -> ResultStore:
+        if self._store is None:
+            self._store = get_store()
+        return self._store
+
+    def _run(self) -> int:
+        if self.run_id is None:
+            self.run_id = self.store.start_run("gui")
+        return self.run_id
 
     def log(self, action: str, details: str = ""):
         ts = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.actions.append({"timestamp": ts, "action": action, "details": details})
+        self.store.add_action(self._run(), action, details, ts)
 
     def add_compliance(self, parameter: str, previous: str, current: str, status: str, severity: str):
         ts = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.compliance_records.append({
-            "timestamp": ts,
-            "parameter": parameter,
+        self.store.add_result(self._run(), {
+            "title": parameter,
             "previous": previous,
             "current": current,
             "status": status,
-            "severity": severity,
-        })
+            "timestamp": ts,
+        }, severity)
 
     def clear(self):
-        self.actions.clear()
-        self.compliance_records.clear()
-        self.rollback_records.clear()
+        """Close the current session; later records start a new run."""
+        if self.run_id is not None:
+            self.store.finish_run(self.run_id)
+            self.run_id = None
 
     def add_rollback(self, parameter: str, backup_path: str):
         ts = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.rollback_records.append({
-            "timestamp": ts,
-            "parameter": parameter,
-            "backup_path": backup_path,
-        })
+        self.store.add_rollback(self._run(), parameter, backup_path, ts)
+
+    def iter_actions(self) -> Iterator[dict]:
+        """Session actions: {timestamp, action, details}, read from the store page by page."""
+        if self.run_id is None:
+            return
+        for a in self.store.iter_actions(self.run_id):
+            yield {"timestamp": a["timestamp"], "action": a["action"], "details": a["details"] or ""}
+
+    def iter_compliance_records(self) -> Iterator[dict]:
+        """Session results: {parameter, previous, current, status, severity, timestamp}, page by page."""
+        if self.run_id is None:
+            return
+        for r in self.store.iter_results(self.run_id):
+            yield {"timestamp": r["timestamp"], "parameter": r["title"], "previous": r["previous"],
+                   "current": r["current"], "status": r["status"], "severity": r["severity"] or ""}
+
+    @property
+    def actions(self) -> List[dict]:
+        return list(self.iter_actions())
+
+    @property
+    def compliance_records(self) -> List[dict]:
+        return list(self.iter_compliance_records())
+
+    @property
+    def rollback_records(self) -> List[dict]:
+        """Rollback points of every session, oldest first."""
+        return [{"timestamp": r["timestamp"], "parameter": r["parameter"], "backup_path": r["backup_path"]}
+                for r in reversed(self.store.rollbacks())]
+
+    def summary_counts(self) -> dict:
+        """Action, compliance and per-severity counts of the session, computed in SQL."""
+        if self.run_id is None:
+            return {"actions": 0, "compliance": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
+        counts = self.store.severity_counts(self.run_id)
+        counts["actions"] = self.store.count("actions", self.run_id)
+        counts["compliance"] = self.store.count("results", self.run_id)
+        return counts
+
+    def close(self):
+        self.clear()
+        if self._store is not None:
+            self._store.flush()
 
 
 action_logger = ActionLogger()
 
+# Reports loaded into the Reporting tab list at a time
+REPORT_PAGE_SIZE = 50
+
 class WorkerSignals(QObject):
     log = Signal(str)
     progress = Signal(int)
@@ -584,6 +646,9 @@ class HardeningTab(QWidget):
             if backup_path:
                 self.append_log(f"Backup created: {backup_path}")
                 action_logger.add_rollback(parameter="Batch Run", backup_path=backup_path)
+                outcome = apply_retention(["policy_backups"], store=action_logger.store)
+                if outcome.deleted or outcome.compressed:
+                    self.append_log(f"Backup retention: {outcome.summary()}")
                 # Refresh rollback list in Backup tab
                 try:
                     main_window = self.window()
@@ -802,7 +867,8 @@ class BackupRollbackTab(QWidget):
         
         if reply == QMessageBox.Yes:
             self.log.appendPlainText(f"🔄 Restoring policy from: {path}")
-            msg = restore_password_policy(path)
+            with extracted(path) as inf_path:
+                msg = restore_password_policy(inf_path)
             self.log.appendPlainText(msg)
         else:
             self.log.appendPlainText("❌ Policy restore cancelled by user.")
@@ -832,7 +898,8 @@ class BackupRollbackTab(QWidget):
             from pathlib import Path
             backup_dir = Path(__file__).resolve().parent / "backup"
             backup_dir.mkdir(parents=True, exist_ok=True)
-            files = sorted(backup_dir.glob("*.inf"), key=lambda p: p.stat().st_mtime, reverse=True)
+            files = sorted(list(backup_dir.glob("*.inf")) + list(backup_dir.glob("*.inf.gz")),
+                           key=lambda p: p.stat().st_mtime, reverse=True)
             self.backup_list.clear()
             for p in files:
                 item = QListWidgetItem(p.name)
@@ -859,7 +926,7 @@ class BackupRollbackTab(QWidget):
         # Try multiple encodings to render content properly
         for enc in ("utf-8-sig", "utf-16", "mbcs", "latin-1"):
             try:
-                with open(path, "r", encoding=enc) as f:
+                with open_artifact(path, "r", encoding=enc) as f:
                     text = f.read()
                 # Show file path as header for clarity
                 self.backup_content.setPlainText(f"{path}\n\n{text}")
@@ -868,7 +935,7 @@ class BackupRollbackTab(QWidget):
                 continue
         # Final fallback: binary read and decode best-effort
         try:
-            with open(path, "rb") as f:
+            with open_artifact(path, "rb") as f:
                 raw = f.read()
             self.backup_content.setPlainText(f"{path}\n\n" + raw.decode("latin-1", errors="ignore"))
         except Exception as e:
@@ -902,7 +969,9 @@ class BackupRollbackTab(QWidget):
         )
         if reply != QMessageBox.Yes:
             return
-        msg = restore_password_policy(path)
+        # The backup may have been compressed by retention since it was recorded
+        with extracted(path) as inf_path:
+            msg = restore_password_policy(inf_path)
         self.log.appendPlainText(msg)
 
     def delete_selected_backup(self):
@@ -915,8 +984,10 @@ class BackupRollbackTab(QWidget):
         try:
             import os
             os.remove(path)
+            action_logger.store.delete_rollbacks([original_path(path)])
             self.log.appendPlainText(f"🗑️ Deleted backup: {path}")
             self.refresh_backups()
+            self.refresh_task_rollbacks()
         except Exception as e:
             self.log.appendPlainText(f"❌ Failed to delete backup: {e}")
 
@@ -990,6 +1061,15 @@ class LoggingReportingTab(QWidget):
         btn_layout.addWidget(self.btn_create_pdf)
         
         create_layout.addLayout(btn_layout)
+
+        self.pdf_progress = QProgressBar()
+        self.pdf_progress.setFormat("Building PDF... %p%")
+        self.pdf_progress.setVisible(False)
+        create_layout.addWidget(self.pdf_progress)
+        self.pdf_job = None
+        self.pdf_timer = QTimer(self)
+        self.pdf_timer.setInterval(200)
+        self.pdf_timer.timeout.connect(self._poll_pdf_report)
         left_section.addWidget(create_group)
         
         # Compliance results display
@@ -1021,6 +1101,8 @@ class LoggingReportingTab(QWidget):
         # Report list
         self.report_list = QListWidget()
         self.report_list.setAlternatingRowColors(True)
+        self.report_list.verticalScrollBar().valueChanged.connect(self._on_report_list_scrolled)
+        self.reports_loaded = 0
         list_layout.addWidget(self.report_list, 1)
         
         # Action buttons for report list (icon-only)
@@ -1095,10 +1177,9 @@ class LoggingReportingTab(QWidget):
                 report_name += '.html'
             
             html_path = html_dir / report_name
-            html_content = self._build_html_report()
-            
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(html_content)
+            self._build_html_report(str(html_path))
+            self._index_report(html_path, "HTML")
+            self._apply_report_retention("html_reports")
             
             QMessageBox.information(self, "Report Created", f"HTML report saved to:\n{html_path}")
             self.refresh_report_list()
@@ -1126,40 +1207,88 @@ class LoggingReportingTab(QWidget):
             pdf_path = pdf_dir / report_name
             self._build_pdf_report(str(pdf_path))
             
-            QMessageBox.information(self, "Report Created", f"PDF report saved to:\n{pdf_path}")
-            self.refresh_report_list()
-            
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to create PDF report:\n{str(e)}")
 
+    def _on_pdf_finished(self, path: str):
+        self._pdf_done()
+        self._index_report(path, "PDF")
+        self._apply_report_retention("pdf_reports")
+        QMessageBox.information(self, "Report Created", f"PDF report saved to:\n{path}")
+        self.refresh_report_list()
+
+    def _on_pdf_failed(self, message: str):
+        self._pdf_done()
+        QMessageBox.critical(self, "Error", f"Failed to create PDF report:\n{message}")
+
+    def _pdf_done(self):
+        self.pdf_timer.stop()
+        process, _ = self.pdf_job
+        process.join()
+        self.pdf_job = None
+        self.pdf_progress.setVisible(False)
+        self.btn_create_pdf.setEnabled(True)
+
+    def _index_report(self, path, report_type: str):
+        """Record a new report in the report index with the session's pass/fail counts."""
+        try:
+            counts = action_logger.store.result_counts(action_logger.run_id) if action_logger.run_id else {}
+            action_logger.store.add_report(str(path), report_type, action_logger.run_id,
+                                           passed=counts.get('passed'), failed=counts.get('failed'))
+        except Exception as e:
+            print(f"Error indexing report: {e}")
+
+    def _apply_report_retention(self, group: str):
+        """Prune/compress older reports of a group per its retention policy, keeping the index in step."""
+        try:
+            apply_retention([group], store=action_logger.store)
+        except Exception as e:
+            print(f"Error applying report retention: {e}")
+
+    def _index_existing_reports(self):
+        """Index report files created before the index existed (only while it is empty)."""
+        from pathlib import Path
+        base_dir = Path(__file__).resolve().parent
+        for report_type, pattern in (("HTML", "html/*.html"), ("HTML", "html/*.html.gz"),
+                                     ("PDF", "pdf/*.pdf"), ("PDF", "pdf/*.pdf.gz")):
+            for report_file in (base_dir / "reports").glob(pattern):
+                created = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(report_file.stat().st_mtime))
+                action_logger.store.add_report(str(report_file), report_type, created_at=created)
+
     def refresh_report_list(self):
-        """Refresh the list of generated reports"""
+        """Reload the report list from the report index, one page at a time"""
         try:
-            from pathlib import Path
-            base_dir = Path(__file__).resolve().parent
-            html_dir = base_dir / "reports" / "html"
-            pdf_dir = base_dir / "reports" / "pdf"
-            
+            if action_logger.store.report_count() == 0:
+                self._index_existing_reports()
             self.report_list.clear()
-            
-            # Get all HTML reports
-            if html_dir.exists():
-                for html_file in sorted(html_dir.glob("*.html"), key=lambda p: p.stat().st_mtime, reverse=True):
-                    self._add_report_item(html_file, "HTML")
-            
-            # Get all PDF reports
-            if pdf_dir.exists():
-                for pdf_file in sorted(pdf_dir.glob("*.pdf"), key=lambda p: p.stat().st_mtime, reverse=True):
-                    self._add_report_item(pdf_file, "PDF")
-                    
+            self.reports_loaded = 0
+            self._load_report_page()
         except Exception as e:
             print(f"Error refreshing report list: {e}")
 
-    def _add_report_item(self, file_path, report_type):
-        """Add a report item to the list with view buttons"""
+    def _load_report_page(self):
+        reports = action_logger.store.reports(limit=REPORT_PAGE_SIZE, offset=self.reports_loaded)
+        for report in reports:
+            self._add_report_item(report)
+        self.reports_loaded += len(reports)
+
+    def _on_report_list_scrolled(self, value: int):
+        """Load the next page of reports when the list is scrolled to the bottom."""
+        if value == self.report_list.verticalScrollBar().maximum() and \
+                self.reports_loaded < action_logger.store.report_count():
+            self._load_report_page()
+
+    def _add_report_item(self, report: dict):
+        """Add an indexed report to the list with its summary and view buttons"""
         from pathlib import Path
-        file_name = file_path.name
-        file_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(file_path.stat().st_mtime))
+        file_path = Path(report['path'])
+        report_type = report['format']
+        file_time = report['created_at'].replace('T', ' ')[:19]
+        size = f"{report['size'] / 1024:.1f} KB" if report['size'] is not None else "-"
+        if report['passed'] is not None:
+            results = f"Passed: {report['passed']}  Failed: {report['failed']}"
+        else:
+            results = "Passed: -  Failed: -"
         
         # Create custom widget for the list item
         item_widget = QWidget()
@@ -1168,11 +1297,11 @@ class LoggingReportingTab(QWidget):
         
         # Report info
         info_layout = QVBoxLayout()
-        name_label = QLabel(file_name)
+        name_label = QLabel(file_path.name)
         name_label.setStyleSheet("font-weight: bold;")
-        time_label = QLabel(f"Created: {file_time}")
+        time_label = QLabel(f"Created: {file_time}  Host: {report['host'] or '-'}")
         time_label.setStyleSheet("color: #666; font-size: 11px;")
-        type_label = QLabel(f"Type: {report_type}")
+        type_label = QLabel(f"Type: {report_type}  Size: {size}  {results}")
         type_label.setStyleSheet("color: #666; font-size: 11px;")
         
         info_layout.addWidget(name_label)
@@ -1231,7 +1360,7 @@ class LoggingReportingTab(QWidget):
         try:
             import webbrowser
             import os
-            webbrowser.open(f"file://{os.path.abspath(file_path)}")
+            webbrowser.open(f"file://{os.path.abspath(extract_for_viewing(file_path))}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to open HTML report:\n{str(e)}")
 
@@ -1240,7 +1369,7 @@ class LoggingReportingTab(QWidget):
         try:
             import webbrowser
             import os
-            webbrowser.open(f"file://{os.path.abspath(file_path)}")
+            webbrowser.open(f"file://{os.path.abspath(extract_for_viewing(file_path))}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to open PDF report:\n{str(e)}")
 
@@ -1255,17 +1384,21 @@ class LoggingReportingTab(QWidget):
                 QMessageBox.warning(self, "File Not Found", f"Report file not found:\n{file_path}")
                 return
             
+            # Compressed reports are saved decompressed under their original name
+            plain = file_path.with_suffix("") if is_compressed(file_path) else file_path
+            
             # Get download location
             download_path, _ = QFileDialog.getSaveFileName(
                 self, 
                 "Save Report As", 
-                str(file_path.name),
-                f"{file_path.suffix.upper()} Files (*{file_path.suffix})"
+                str(plain.name),
+                f"{plain.suffix.upper()} Files (*{plain.suffix})"
             )
             
             if download_path:
                 # Copy file to chosen location
-                shutil.copy2(file_path, download_path)
+                with extracted(file_path) as source:
+                    shutil.copy2(source, download_path)
                 QMessageBox.information(self, "Download Complete", f"Report saved to:\n{download_path}")
             
         except Exception as e:
@@ -1278,7 +1411,9 @@ class LoggingReportingTab(QWidget):
             
             file_path = Path(file_path)
             if not file_path.exists():
+                action_logger.store.delete_report(str(file_path))
                 QMessageBox.warning(self, "File Not Found", f"Report file not found:\n{file_path}")
+                self.refresh_report_list()
                 return
             
             # Show confirmation dialog
@@ -1292,6 +1427,7 @@ class LoggingReportingTab(QWidget):
             
             if reply == QMessageBox.Yes:
                 file_path.unlink()  # Delete the file
+                action_logger.store.delete_report(str(file_path))
                 QMessageBox.information(self, "Deleted", f"Report deleted successfully:\n{file_path.name}")
                 # Refresh the report list
                 self.refresh_report_list()
@@ -1311,9 +1447,9 @@ class LoggingReportingTab(QWidget):
             # Count total files
             total_files = 0
             if html_dir.exists():
-                total_files += len(list(html_dir.glob("*.html")))
+                total_files += len(list(html_dir.glob("*.html"))) + len(list(html_dir.glob("*.html.gz")))
             if pdf_dir.exists():
-                total_files += len(list(pdf_dir.glob("*.pdf")))
+                total_files += len(list(pdf_dir.glob("*.pdf"))) + len(list(pdf_dir.glob("*.pdf.gz")))
             
             if total_files == 0:
                 QMessageBox.information(self, "No Reports", "No reports found to delete.")
@@ -1333,15 +1469,16 @@ class LoggingReportingTab(QWidget):
                 
                 # Delete HTML reports
                 if html_dir.exists():
-                    for html_file in html_dir.glob("*.html"):
+                    for html_file in list(html_dir.glob("*.html")) + list(html_dir.glob("*.html.gz")):
                         html_file.unlink()
                         deleted_count += 1
                 
                 # Delete PDF reports
                 if pdf_dir.exists():
-                    for pdf_file in pdf_dir.glob("*.pdf"):
+                    for pdf_file in list(pdf_dir.glob("*.pdf")) + list(pdf_dir.glob("*.pdf.gz")):
                         pdf_file.unlink()
                         deleted_count += 1
+                action_logger.store.clear_reports()
                 
                 QMessageBox.information(self, "Deleted", f"Successfully deleted {deleted_count} report(s).")
                 # Refresh the report list
@@ -1352,7 +1489,8 @@ class LoggingReportingTab(QWidget):
 
     def refresh_compliance_display(self):
         """Display compliance results in a readable format"""
-        if not action_logger.compliance_records:
+        records = action_logger.compliance_records
+        if not records:
             self.compliance_display.setPlainText("No compliance results available. Run some hardening tasks to see results here.")
             return
         
@@ -1361,7 +1499,7 @@ class LoggingReportingTab(QWidget):
         lines.append("=" * 50)
         lines.append("")
         
-        for record in action_logger.compliance_records:
+        for record in records:
             lines.append(f"Parameter: {record['parameter']}")
             lines.append(f"Previous: {record['previous']}")
             lines.append(f"Current: {record['current']}")
@@ -1374,225 +1512,40 @@ class LoggingReportingTab(QWidget):
         self.compliance_display.setPlainText("\n".join(lines))
 
 
-    def _build_html_report(self) -> str:
-        # Calculate summary statistics
-        total_actions = len(action_logger.actions)
-        total_compliance = len(action_logger.compliance_records)
-        high_severity = len([r for r in action_logger.compliance_records if r['severity'].upper() == 'HIGH'])
-        medium_severity = len([r for r in action_logger.compliance_records if r['severity'].upper() == 'MEDIUM'])
-        low_severity = len([r for r in action_logger.compliance_records if r['severity'].upper() == 'LOW'])
-        
-        # Build compliance rows with severity color coding
-        rows = []
-        for r in action_logger.compliance_records:
-            severity_class = "severity-high" if r['severity'].upper() == 'HIGH' else "severity-medium" if r['severity'].upper() == 'MEDIUM' else "severity-low"
-            rows.append(f"<tr><td>{r['parameter']}</td><td>{r['previous']}</td><td>{r['current']}</td><td>{r['status']}</td><td class='{severity_class}'>{r['severity']}</td><td>{r['timestamp']}</td></tr>")
-        
-        rows_html = "\n".join(rows)
-        
-        # Build action logs
-        logs = "\n".join(f"<li><strong>[{a['timestamp']}]</strong> {a['action']}: {a['details']}</li>" for a in action_logger.actions)
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="utf-8" />
-  <title>HardenSys Compliance Report</title>
-  <style>
-    body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f9f9f9; }}
-    .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-    h1 {{ color: #2c3e50; margin: 0 0 10px 0; border-bottom: 3px solid #3498db; padding-bottom: 10px; }}
-    h2 {{ color: #34495e; margin: 20px 0 10px 0; }}
-    h3 {{ color: #7f8c8d; margin: 15px 0 5px 0; }}
-    .summary {{ background: #ecf0f1; padding: 15px; border-radius: 5px; margin: 15px 0; }}
-    .summary-item {{ display: inline-block; margin: 5px 20px 5px 0; font-weight: bold; }}
-    .summary-high {{ color: #e74c3c; }}
-    .summary-medium {{ color: #f39c12; }}
-    .summary-low {{ color: #27ae60; }}
-    table {{ border-collapse: collapse; width: 100%; margin-top: 10px; }}
-    th, td {{ border: 1px solid #bdc3c7; padding: 8px 12px; text-align: left; }}
-    th {{ background: #34495e; color: white; font-weight: bold; }}
-    tr:nth-child(even) {{ background-color: #f8f9fa; }}
-    tr:hover {{ background-color: #e8f4f8; }}
-    .severity-high {{ color: #e74c3c; font-weight: bold; }}
-    .severity-medium {{ color: #f39c12; font-weight: bold; }}
-    .severity-low {{ color: #27ae60; font-weight: bold; }}
-    ul {{ margin-top: 6px; }}
-    li {{ margin: 5px 0; }}
-    .audit-trail {{ background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 15px 0; }}
-    .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #bdc3c7; color: #7f8c8d; font-size: 0.9em; }}
-  </style>
-</head>
-<body>
-  <div class="container">
-    <h1><img src="../docs/app_logo.png" alt="HardenSys" class="app_logo">HardenSys Compliance Report</h1>
-    <p><strong>Generated:</strong> {time.strftime('%Y-%m-%d %H:%M:%S')}</p>
-    
-    <div class="summary">
-      <h3>Executive Summary</h3>
-      <div class="summary-item">Total Actions: {total_actions}</div>
-      <div class="summary-item">Compliance Records: {total_compliance}</div>
-      <div class="summary-item summary-high">High Severity: {high_severity}</div>
-      <div class="summary-item summary-medium">Medium Severity: {medium_severity}</div>
-      <div class="summary-item summary-low">Low Severity: {low_severity}</div>
-    </div>
-    
-    <div class="audit-trail">
-      <h2>Audit Trail - Actions Log</h2>
-      <p>Complete chronological log of all actions performed during the hardening process:</p>
-      <ul>
-        {logs if logs else "<li>No actions recorded.</li>"}
-      </ul>
-    </div>
-    
-    <h2>Compliance Results with Severity Ratings</h2>
-    <p>Detailed compliance results showing parameter changes and severity levels:</p>
-    <table>
-      <thead>
-        <tr>
-          <th>Parameter</th>
-          <th>Previous Value</th>
-          <th>Current Value</th>
-          <th>Status</th>
-          <th>Severity</th>
-          <th>Timestamp</th>
-        </tr>
-      </thead>
-      <tbody>
-        {rows_html if rows_html else "<tr><td colspan='6'>No compliance records available.</td></tr>"}
-      </tbody>
-    </table>
-    
-    <div class="footer">
-      <p>Report generated by HardenSys</p>
-      <p>This report provides a comprehensive audit trail of system hardening activities and compliance results.</p>
-    </div>
-  </div>
-</body>
-</html>
-"""
-        return html
+    def _build_html_report(self, path: str) -> dict:
+        """Stream the session's actions and compliance records to an HTML report."""
+        return write_html_report(path, action_logger.iter_actions(), action_logger.iter_compliance_records())
 
     def _build_pdf_report(self, path: str):
-        try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib import colors
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.lib.units import inch
-        except Exception as e:
-            raise RuntimeError("ReportLab is not installed. Please install reportlab.") from e
-
-        doc = SimpleDocTemplate(path, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Title and header
-        story.append(Paragraph("HardenSys Compliance Report", styles['Title']))
-        story.append(Paragraph(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-        story.append(Spacer(1, 12))
-
-        # Executive Summary
-        story.append(Paragraph("Executive Summary", styles['Heading2']))
-        total_actions = len(action_logger.actions)
-        total_compliance = len(action_logger.compliance_records)
-        high_severity = len([r for r in action_logger.compliance_records if r['severity'].upper() == 'HIGH'])
-        medium_severity = len([r for r in action_logger.compliance_records if r['severity'].upper() == 'MEDIUM'])
-        low_severity = len([r for r in action_logger.compliance_records if r['severity'].upper() == 'LOW'])
-        
-        summary_text = f"""
-        <b>Total Actions Performed:</b> {total_actions}<br/>
-        <b>Compliance Records:</b> {total_compliance}<br/>
-        <b>High Severity Issues:</b> {high_severity}<br/>
-        <b>Medium Severity Issues:</b> {medium_severity}<br/>
-        <b>Low Severity Issues:</b> {low_severity}<br/>
-        """
-        story.append(Paragraph(summary_text, styles['Normal']))
-        story.append(Spacer(1, 12))
-
-        # Actions Log with timestamps
-        story.append(Paragraph("Audit Trail - Actions Log", styles['Heading2']))
-        story.append(Paragraph("All actions performed during the hardening process with timestamps:", styles['Normal']))
-        story.append(Spacer(1, 6))
-        
-        if action_logger.actions:
-            for i, a in enumerate(action_logger.actions, 1):
-                action_text = f"<b>[{a['timestamp']}]</b> {a['action']}"
-                if a['details']:
-                    action_text += f": {a['details']}"
-                story.append(Paragraph(f"{i}. {action_text}", styles['Normal']))
-        else:
-            story.append(Paragraph("No actions recorded.", styles['Normal']))
-        
-        story.append(PageBreak())
-
-        # Compliance Results with Severity Ratings
-        story.append(Paragraph("Compliance Results with Severity Ratings", styles['Heading2']))
-        story.append(Paragraph("Detailed compliance results showing parameter changes and severity levels:", styles['Normal']))
-        story.append(Spacer(1, 12))
-
-        if action_logger.compliance_records:
-            # Group by severity for better organization
-            severity_groups = {'HIGH': [], 'MEDIUM': [], 'LOW': []}
-            for r in action_logger.compliance_records:
-                severity = r['severity'].upper()
-                if severity in severity_groups:
-                    severity_groups[severity].append(r)
-                else:
-                    severity_groups['LOW'].append(r)
-
-            for severity, records in severity_groups.items():
-                if records:
-                    # Severity header with color coding
-                    color = colors.red if severity == 'HIGH' else colors.orange if severity == 'MEDIUM' else colors.green
-                    story.append(Paragraph(f"<font color='{color.hexval()}'><b>{severity} SEVERITY ISSUES ({len(records)})</b></font>", styles['Heading3']))
-                    
-                    for r in records:
-                        story.append(Paragraph(f"<b>Parameter:</b> {r['parameter']}", styles['Normal']))
-                        story.append(Paragraph(f"<b>Previous Value:</b> {r['previous']}", styles['Normal']))
-                        story.append(Paragraph(f"<b>Current Value:</b> {r['current']}", styles['Normal']))
-                        story.append(Paragraph(f"<b>Status:</b> {r['status']}", styles['Normal']))
-                        story.append(Paragraph(f"<b>Severity:</b> {r['severity']}", styles['Normal']))
-                        story.append(Paragraph(f"<b>Timestamp:</b> {r['timestamp']}", styles['Normal']))
-                        story.append(Spacer(1, 6))
-                    
-                    story.append(Spacer(1, 12))
-
-            # Summary table
-            story.append(Paragraph("Compliance Summary Table", styles['Heading3']))
-            data = [["Parameter", "Previous", "Current", "Status", "Severity", "Timestamp"]]
-            for r in action_logger.compliance_records:
-                # Color code severity in the table
-                severity_color = colors.red if r['severity'].upper() == 'HIGH' else colors.orange if r['severity'].upper() == 'MEDIUM' else colors.green
-                data.append([
-                    r['parameter'], 
-                    r['previous'], 
-                    r['current'], 
-                    r['status'], 
-                    f"<font color='{severity_color.hexval()}'>{r['severity']}</font>", 
-                    r['timestamp']
-                ])
-
-            table = Table(data, repeatRows=1)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-            ]))
-            story.append(table)
-        else:
-            story.append(Paragraph("No compliance records available.", styles['Normal']))
-
-        # Footer
-        story.append(Spacer(1, 24))
-        story.append(Paragraph("End of Report", styles['Normal']))
-        story.append(Paragraph(f"Report generated by HardenSys on {time.strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-
-        doc.build(story)
+        """Start building the PDF in a worker process; the UI is notified when it is ready."""
+        if self.pdf_job is not None:
+            raise RuntimeError("A PDF report is already being generated.")
+        # The worker reads the session from the database, so buffered rows must be written first
+        action_logger.store.flush()
+        self.pdf_job = start_pdf_report(path, str(action_logger.store.path), action_logger.run_id)
+        self.pdf_progress.setValue(0)
+        self.pdf_progress.setVisible(True)
+        self.btn_create_pdf.setEnabled(False)
+        self.pdf_timer.start()
+
+    def _poll_pdf_report(self):
+        """Apply the worker's queued progress events without blocking the UI thread."""
+        process, events = self.pdf_job
+        while True:
+            try:
+                kind, value = events.get_nowait()
+            except queue.Empty:
+                if not process.is_alive() and events.empty():
+                    self._on_pdf_failed(f"PDF worker exited with code {process.exitcode}")
+                return
+            if kind == "progress":
+                self.pdf_progress.setValue(value)
+            elif kind == "done":
+                self._on_pdf_finished(value)
+                return
+            else:
+                self._on_pdf_failed(value)
+                return
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -1618,6 +1571,7 @@ class MainWindow(QMainWindow):
 
 def main():
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(action_logger.close)
     win = MainWindow()
     win.show()
     sys.exit(app.exec())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+HardenSys Fleet Aggregation
+Combine per-host JSON reports into fleet-wide counters in parallel worker
+processes. Reports are stream-parsed and only counters per rule, heading
+and host group (plus the N worst hosts) are kept, so memory grows with the
+number of rules rather than the number of hosts.
+"""
+
+import os
+import json
+import heapq
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+from report_stream import iter_report, rule_id
+
+# Reports handed to a worker process per task
+FILES_PER_TASK = 32
+WORST_HOSTS = 10
+
+
+def _rate(passed: int, total: int) -> float:
+    return round(passed / total * 100, 1) if total else 0.0
+
+
+class FleetAggregate:
+    """Mergeable fleet counters."""
+
+    def __init__(self, worst_hosts: int = WORST_HOSTS):
+        self.worst_hosts = worst_hosts
+        self.hosts = 0
+        self.passed = 0
+        self.failed = 0
+        self.rules: Dict[str, List] = {}      # rule id -> [title, heading, passed, failed]
+        self.headings: Dict[str, List[int]] = {}  # heading -> [passed, failed]
+        self.groups: Dict[str, List[int]] = {}    # group -> [hosts, passed, failed]
+        self.worst: List[tuple] = []          # min-heap of (failed, -pass rate, host, group)
+        self.errors: List[str] = []
+        self.error_count = 0
+
+    def add_host(self, host: str, group: str, passed: int, failed: int):
+        self.hosts += 1
+        self.passed += passed
+        self.failed += failed
+        counts = self.groups.setdefault(group, [0, 0, 0])
+        counts[0] += 1
+        counts[1] += passed
+        counts[2] += failed
+        # The least bad kept host sits at the top of the heap and is evicted first
+        entry = (failed, -_rate(passed, passed + failed), host, group)
+        if len(self.worst) < self.worst_hosts:
+            heapq.heappush(self.worst, entry)
+        elif entry > self.worst[0]:
+            heapq.heapreplace(self.worst, entry)
+
+    def add_error(self, message: str):
+        self.error_count += 1
+        if len(self.errors) < 20:
+            self.errors.append(message)
+
+    def add_counts(self, rules: Dict[str, List], headings: Dict[str, List[int]]):
+        """Add per-rule [title, heading, passed, failed] and per-heading [passed, failed] counts."""
+        for key, (title, heading, passed, failed) in rules.items():
+            counts = self.rules.setdefault(key, [title, heading, 0, 0])
+            counts[2] += passed
+            counts[3] += failed
+        for heading, (passed, failed) in headings.items():
+            counts = self.headings.setdefault(heading, [0, 0])
+            counts[0] += passed
+            counts[1] += failed
+
+    def merge(self, other: "FleetAggregate"):
+        self.hosts += other.hosts
+        self.passed += other.passed
+        self.failed += other.failed
+        self.add_counts(other.rules, other.headings)
+        for group, (hosts, passed, failed) in other.groups.items():
+            counts = self.groups.setdefault(group, [0, 0, 0])
+            counts[0] += hosts
+            counts[1] += passed
+            counts[2] += failed
+        for entry in other.worst:
+            if len(self.worst) < self.worst_hosts:
+                heapq.heappush(self.worst, entry)
+            elif entry > self.worst[0]:
+                heapq.heapreplace(self.worst, entry)
+        self.error_count += other.error_count
+        self.errors.extend(other.errors[:max(0, 20 - len(self.errors))])
+
+    def to_dict(self, top: int = 10) -> Dict:
+        total = self.passed + self.failed
+        rules = sorted(self.rules.items(), key=lambda item: (-item[1][3], item[1][0]))
+        return {
+            "hosts": self.hosts,
+            "results": total,
+            "pass_rate": _rate(self.passed, total),
+            "groups": {group: {"hosts": hosts, "pass_rate": _rate(passed, passed + failed)}
+                       for group, (hosts, passed, failed) in sorted(self.groups.items())},
+            "headings": {heading: {"pass_rate": _rate(passed, passed + failed), "failed": failed}
+                         for heading, (passed, failed) in sorted(self.headings.items())},
+            "top_failing_rules": [
+                {"rule": key, "title": title, "heading": heading, "failed_hosts": failed,
+                 "pass_rate": _rate(passed, passed + failed)}
+                for key, (title, heading, passed, failed) in rules[:top] if failed],
+            "worst_hosts": [{"host": host, "group": group, "failed": failed, "pass_rate": -neg_rate}
+                            for failed, neg_rate, host, group in sorted(self.worst, reverse=True)],
+            "unreadable_reports": self.error_count,
+        }
+
+
+def load_host_groups(path: Optional[str]) -> Dict[str, str]:
+    """host -> group from a JSON file mapping either host -> group or group -> [hosts]."""
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    groups = {}
+    for key, value in data.items():
+        if isinstance(value, list):
+            for host in value:
+                groups[str(host)] = key
+        else:
+            groups[key] = str(value)
+    return groups
+
+
+def aggregate_reports(paths: List[str], host_groups: Dict[str, str] = None,
+                      worst_hosts: int = WORST_HOSTS) -> FleetAggregate:
+    """
+    Aggregate reports in this process. A host is named by the report's
+    summary.host (else the file name) and grouped by host_groups (else by
+    the report's parent directory).
+    """
+    host_groups = host_groups or {}
+    aggregate = FleetAggregate(worst_hosts)
+    for path in paths:
+        host = None
+        passed = failed = 0
+        rules: Dict[str, List] = {}
+        headings: Dict[str, List[int]] = {}
+        try:
+            for key, value in iter_report(path):
+                if key == "summary" and isinstance(value, dict):
+                    host = value.get("host")
+                elif key == "result" and isinstance(value, dict):
+                    ok = value.get("status") == "success"
+                    passed += ok
+                    failed += not ok
+                    heading = value.get("heading") or ""
+                    counts = rules.setdefault(rule_id(value), [value.get("title") or "", heading, 0, 0])
+                    counts[2 if ok else 3] += 1
+                    counts = headings.setdefault(heading, [0, 0])
+                    counts[0 if ok else 1] += 1
+        except (OSError, ValueError) as e:
+            aggregate.add_error(f"{path}: {e}")
+            continue
+        host = host or os.path.splitext(os.path.basename(path))[0]
+        group = host_groups.get(host) or os.path.basename(os.path.dirname(os.path.abspath(path)))
+        # Only complete reports are counted, so a truncated file cannot skew rule rates
+        aggregate.add_host(host, group, passed, failed)
+        aggregate.add_counts(rules, headings)
+    return aggregate
+
+
+def _chunks(paths: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(paths), size):
+        yield paths[start:start + size]
+
+
+def aggregate_fleet(paths: List[str], host_groups: Dict[str, str] = None, workers: int = None,
+                    worst_hosts: int = WORST_HOSTS) -> FleetAggregate:
+    """Aggregate reports in parallel worker processes and merge their counters."""
+    total = FleetAggregate(worst_hosts)
+    if len(paths) <= FILES_PER_TASK or workers == 1:
+        total.merge(aggregate_reports(paths, host_groups, worst_hosts))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        work = functools.partial(aggregate_reports, host_groups=host_groups, worst_hosts=worst_hosts)
+        for partial in pool.map(work, _chunks(paths, FILES_PER_TASK)):
+            total.merge(partial)
+    return total
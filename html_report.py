@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+HardenSys HTML Report Writer
+Streams the compliance report straight to a file in a single pass over the
+action log and compliance records. Every value is HTML-escaped, summary
+counts are accumulated while rows are written, and long lists are split
+into collapsible sections of PAGE_ROWS rows with an embedded filter.
+"""
+
+import html
+import functools
+import time
+from typing import Dict, Iterable, TextIO
+
+# Rows per collapsible section; only the first section of each list starts open
+PAGE_ROWS = 500
+SEVERITIES = ("HIGH", "MEDIUM", "LOW")
+
+_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <title>HardenSys Compliance Report</title>
+  <style>
+    body { font-family: Arial, sans-serif; margin: 20px; background-color: #f9f9f9; }
+    .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); display: flex; flex-direction: column; }
+    .header { order: -2; }
+    h1 { color: #2c3e50; margin: 0 0 10px 0; border-bottom: 3px solid #3498db; padding-bottom: 10px; }
+    h2 { color: #34495e; margin: 20px 0 10px 0; }
+    h3 { color: #7f8c8d; margin: 15px 0 5px 0; }
+    .summary { order: -1; background: #ecf0f1; padding: 15px; border-radius: 5px; margin: 15px 0; }
+    .summary-item { display: inline-block; margin: 5px 20px 5px 0; font-weight: bold; }
+    .summary-high { color: #e74c3c; }
+    .summary-medium { color: #f39c12; }
+    .summary-low { color: #27ae60; }
+    .filter { margin: 10px 0; }
+    .filter input { width: 300px; padding: 4px; }
+    details.page { margin: 6px 0; content-visibility: auto; contain-intrinsic-size: auto 600px; }
+    details.page > summary { cursor: pointer; font-weight: bold; color: #34495e; }
+    table { border-collapse: collapse; width: 100%; margin-top: 10px; }
+    th, td { border: 1px solid #bdc3c7; padding: 8px 12px; text-align: left; }
+    th { background: #34495e; color: white; font-weight: bold; }
+    tr:nth-child(even) { background-color: #f8f9fa; }
+    tr:hover { background-color: #e8f4f8; }
+    .severity-high { color: #e74c3c; font-weight: bold; }
+    .severity-medium { color: #f39c12; font-weight: bold; }
+    .severity-low { color: #27ae60; font-weight: bold; }
+    ul { margin-top: 6px; }
+    li { margin: 5px 0; }
+    .audit-trail { background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 15px 0; }
+    .footer { margin-top: 30px; padding-top: 20px; border-top: 1px solid #bdc3c7; color: #7f8c8d; font-size: 0.9em; }
+  </style>
+</head>
+<body>
+  <div class="container">
+"""
+
+_TABLE_HEAD = """<table>
+      <thead>
+        <tr>
+          <th>Parameter</th>
+          <th>Previous Value</th>
+          <th>Current Value</th>
+          <th>Status</th>
+          <th>Severity</th>
+          <th>Timestamp</th>
+        </tr>
+      </thead>
+      <tbody>
+"""
+
+# Text filter over actions and results, severity filter over results; debounced
+_SCRIPT = """<script>
+(function () {
+  var text = document.getElementById('filter-text'), severity = document.getElementById('filter-severity'), timer;
+  function apply() {
+    var q = text.value.toLowerCase(), s = severity.value;
+    document.querySelectorAll('details.page').forEach(function (page) {
+      var shown = 0;
+      page.querySelectorAll('tbody tr, li').forEach(function (row) {
+        var ok = (!q || row.textContent.toLowerCase().indexOf(q) >= 0) &&
+                 (!s || row.tagName === 'LI' || row.getAttribute('data-severity') === s);
+        row.hidden = !ok;
+        if (ok) { shown++; }
+      });
+      page.hidden = !shown;
+      if ((q || s) && shown) { page.open = true; }
+    });
+  }
+  function schedule() { clearTimeout(timer); timer = setTimeout(apply, 250); }
+  text.addEventListener('input', schedule);
+  severity.addEventListener('change', apply);
+})();
+</script>
+"""
+
+
+@functools.lru_cache(maxsize=4096)
+def _escape(text: str) -> str:
+    return html.escape(text, quote=True)
+
+
+def _e(value) -> str:
+    # Statuses, severities and values repeat across rows, so escapes are cached
+    return _escape("" if value is None else str(value))
+
+
+class HtmlReportWriter:
+    """
+    Writes one report to an open text file. Call actions() and records()
+    once each, then finish(); the summary is emitted last and placed at the
+    top by CSS, so no second pass over the rows is needed.
+    """
+
+    def __init__(self, f: TextIO, page_rows: int = PAGE_ROWS):
+        self.f = f
+        self.page_rows = page_rows
+        self.counts: Dict[str, int] = {"actions": 0, "compliance": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
+        self.generated = time.strftime('%Y-%m-%d %H:%M:%S')
+        f.write(_HEAD)
+        f.write(f"""    <div class="header">
+      <h1><img src="../docs/app_logo.png" alt="HardenSys" class="app_logo">HardenSys Compliance Report</h1>
+      <p><strong>Generated:</strong> {_e(self.generated)}</p>
+      <div class="filter">
+        <input id="filter-text" type="search" placeholder="Filter actions and results..." />
+        <select id="filter-severity">
+          <option value="">All severities</option>
+          <option value="HIGH">High</option>
+          <option value="MEDIUM">Medium</option>
+          <option value="LOW">Low</option>
+        </select>
+      </div>
+    </div>
+""")
+
+    def _open_page(self, label: str, n: int, prefix: str):
+        page = n // self.page_rows + 1
+        is_open = " open" if page == 1 else ""
+        self.f.write(f'    <details class="page"{is_open}><summary>{label}, page {page} '
+                     f'(from #{n + 1})</summary>\n{prefix}')
+
+    def actions(self, actions: Iterable[Dict]):
+        """Stream the action log: {timestamp, action, details}."""
+        self.f.write('    <div class="audit-trail">\n      <h2>Audit Trail - Actions Log</h2>\n'
+                     '      <p>Complete chronological log of all actions performed during the hardening process:</p>\n')
+        n = 0
+        for a in actions:
+            if n % self.page_rows == 0:
+                if n:
+                    self.f.write("      </ul></details>\n")
+                self._open_page("Actions", n, "      <ul>\n")
+            n += 1
+            details = f": {_e(a.get('details'))}" if a.get('details') else ""
+            self.f.write(f"        <li><strong>[{_e(a.get('timestamp'))}]</strong> {_e(a.get('action'))}{details}</li>\n")
+        self.f.write("      </ul></details>\n" if n else "      <ul><li>No actions recorded.</li></ul>\n")
+        self.f.write("    </div>\n")
+        self.counts["actions"] = n
+
+    def records(self, records: Iterable[Dict]):
+        """Stream compliance records: {parameter, previous, current, status, severity, timestamp}."""
+        self.f.write('    <h2>Compliance Results with Severity Ratings</h2>\n'
+                     '    <p>Detailed compliance results showing parameter changes and severity levels:</p>\n')
+        n = 0
+        for r in records:
+            if n % self.page_rows == 0:
+                if n:
+                    self.f.write("      </tbody>\n    </table></details>\n")
+                self._open_page("Results", n, "    " + _TABLE_HEAD)
+            n += 1
+            severity = str(r.get('severity') or "").upper()
+            if severity in SEVERITIES:
+                self.counts[severity] += 1
+            else:
+                severity = "LOW"
+            self.f.write(f"<tr data-severity='{severity}'><td>{_e(r.get('parameter'))}</td><td>{_e(r.get('previous'))}</td>"
+                         f"<td>{_e(r.get('current'))}</td><td>{_e(r.get('status'))}</td>"
+                         f"<td class='severity-{severity.lower()}'>{_e(r.get('severity'))}</td>"
+                         f"<td>{_e(r.get('timestamp'))}</td></tr>\n")
+        if n:
+            self.f.write("      </tbody>\n    </table></details>\n")
+        else:
+            self.f.write("    " + _TABLE_HEAD + "<tr><td colspan='6'>No compliance records available.</td></tr>\n"
+                         "      </tbody>\n    </table>\n")
+        self.counts["compliance"] = n
+
+    def finish(self) -> Dict[str, int]:
+        """Write the summary, footer and filter script; returns the counts."""
+        c = self.counts
+        self.f.write(f"""    <div class="summary">
+      <h3>Executive Summary</h3>
+      <div class="summary-item">Total Actions: {c['actions']}</div>
+      <div class="summary-item">Compliance Records: {c['compliance']}</div>
+      <div class="summary-item summary-high">High Severity: {c['HIGH']}</div>
+      <div class="summary-item summary-medium">Medium Severity: {c['MEDIUM']}</div>
+      <div class="summary-item summary-low">Low Severity: {c['LOW']}</div>
+    </div>
+
+    <div class="footer">
+      <p>Report generated by HardenSys</p>
+      <p>This report provides a comprehensive audit trail of system hardening activities and compliance results.</p>
+    </div>
+  </div>
+""")
+        self.f.write(_SCRIPT)
+        self.f.write("</body>\n</html>\n")
+        return dict(c)
+
+
+def write_html_report(path: str, actions: Iterable[Dict], records: Iterable[Dict],
+                      page_rows: int = PAGE_ROWS) -> Dict[str, int]:
+    """Write a complete report to `path`; returns its summary counts."""
+    with open(path, "w", encoding="utf-8") as f:
+        writer = HtmlReportWriter(f, page_rows)
+        writer.actions(actions)
+        writer.records(records)
+        return writer.finish()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+HardenSys Integrity Baseline
+Parallel, incremental file hashing with a stored baseline.
+"""
+
+import os
+import json
+import mmap
+import stat
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# Use repo-local baseline directory: <repo>/baseline
+BASELINE_DIR = Path(__file__).resolve().parent / "baseline"
+DEFAULT_ALGORITHM = "sha512"
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def hash_file(path: str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """Hex digest of a file, read through a memory map in large chunks."""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, size, CHUNK_SIZE):
+                digest.update(mapped[offset:offset + CHUNK_SIZE])
+    return digest.hexdigest()
+
+
+def _fingerprint(st: os.stat_result) -> List[int]:
+    # ctime cannot be set from user space, so restoring mtime after an edit still forces a re-hash
+    return [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+
+
+def iter_files(roots: List[str]):
+    """Yield (path, lstat) for every regular file under roots (files or directories)."""
+    for root in roots:
+        try:
+            st = os.lstat(root)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            yield root, st
+            continue
+        if not stat.S_ISDIR(st.st_mode):
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.lstat(path)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    yield path, st
+
+
+class IntegrityReport:
+    """Outcome of comparing a tree against its baseline."""
+
+    def __init__(self):
+        self.added: List[str] = []
+        self.removed: List[str] = []
+        self.modified: List[str] = []
+        self.unchanged = 0
+        self.hashed = 0
+        self.errors: Dict[str, str] = {}
+        self.created = False  # True when this scan created the baseline
+
+    @property
+    def clean(self) -> bool:
+        return not (self.added or self.removed or self.modified)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.removed)} removed, {len(self.modified)} modified, "
+                f"{self.unchanged} unchanged ({self.hashed} hashed)")
+
+
+class IntegrityBaseline:
+    """
+    Stored digests for a named set of paths. Each entry keeps the file's
+    (device, inode, size, mtime_ns, ctime_ns) so unchanged files are not
+    re-hashed.
+    """
+
+    def __init__(self, name: str, algorithm: str = DEFAULT_ALGORITHM, directory: Path = None):
+        self.name = name
+        self.algorithm = algorithm
+        self.path = Path(directory or BASELINE_DIR) / f"integrity_{name}.json"
+        self.entries: Dict[str, Dict] = {}
+        self.exists = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('algorithm') == self.algorithm:
+                self.entries = data.get('files', {})
+                self.exists = True
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'algorithm': self.algorithm, 'files': self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.exists = True
+
+    def scan(self, roots: List[str], workers: Optional[int] = None, update: bool = False) -> IntegrityReport:
+        """
+        Compare roots against the baseline, hashing only new or changed files
+        in parallel. With update=True (or when no baseline exists yet) the
+        baseline is replaced by the current state and saved.
+        """
+        report = IntegrityReport()
+        current: Dict[str, Dict] = {}
+        to_hash = []
+        for path, st in iter_files(roots):
+            fingerprint = _fingerprint(st)
+            previous = self.entries.get(path)
+            if previous and previous.get('fingerprint') == fingerprint:
+                current[path] = previous
+                report.unchanged += 1
+            else:
+                to_hash.append((path, fingerprint))
+
+        def digest(item):
+            path, fingerprint = item
+            try:
+                return path, fingerprint, hash_file(path, self.algorithm), None
+            except OSError as e:
+                return path, fingerprint, None, str(e)
+
+        with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 2)) as pool:
+            for path, fingerprint, value, error in pool.map(digest, to_hash):
+                if error:
+                    report.errors[path] = error
+                    continue
+                report.hashed += 1
+                current[path] = {'fingerprint': fingerprint, 'digest': value}
+                previous = self.entries.get(path)
+                if previous is None:
+                    report.added.append(path)
+                elif previous.get('digest') != value:
+                    report.modified.append(path)
+                else:
+                    report.unchanged += 1
+
+        report.removed = sorted(path for path in self.entries
+                                if path not in current and path not in report.errors
+                                and any(path == root or path.startswith(root.rstrip('/') + '/') for root in roots))
+        if update or not self.exists:
+            report.created = not self.exists
+            for path in report.removed:
+                self.entries.pop(path, None)
+            self.entries.update(current)
+            self.save()
+        else:
+            # Refresh fingerprints of files whose content did not change
+            refreshed = False
+            for path, entry in current.items():
+                previous = self.entries.get(path)
+                if previous and previous.get('digest') == entry['digest'] and previous is not entry:
+                    self.entries[path] = entry
+                    refreshed = True
+            if refreshed:
+                self.save()
+        return report
+
+
+def verify_paths(name: str, roots: List[str], update: bool = False, workers: Optional[int] = None) -> IntegrityReport:
+    """Verify roots against the named baseline (created on first use)."""
+    return IntegrityBaseline(name).scan(roots, workers=workers, update=update)
@@ -0,0 +1,3469 @@
+import os
+import re
+import atexit
+import pickle
+import subprocess
+import glob
+import time
+import stat
+import queue
+import threading
+import collections
+import platform
+import socket
+import ipaddress
+
+import integrity
+import remediation
+
+# Optional CLI features this platform module supports (see HardenSys.py):
+# incremental reuse of stored results, transactional remediation, watch mode
+CAPABILITIES = frozenset({"incremental", "remediation", "watch"})
+
+
+# ----------------------- Shared helpers -----------------------
+
+# Parsed facts keyed by name -> (signature, value, built_at, max_age). A fact
+# is rebuilt when the (inode, size, mtime_ns, ctime_ns) signature of one of its
+# source paths changes, or when it is older than the caller's max_age (for
+# facts with no files). Facts built with persist=True are also kept on disk
+# between runs, so an unchanged host only re-stats their source paths.
+_fact_cache = {}
+# Facts whose source paths a running FactWatcher covers: served without stat
+_watched_facts = set()
+_active_watcher = None
+# Set of fact names used by the rule being run under run_with_dependencies
+_fact_recorder = None
+# Names of facts derived only from files (built with persist=True)
+_file_facts = set()
+_MISSING = object()
+# Pseudo-fact recorded by rules that read the clock; it is not file-derived,
+# so their results are never reused and watch mode re-checks them on its interval
+CLOCK_FACT = "clock"
+
+FACT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "linux_facts.pickle")
+FACT_CACHE_VERSION = 4
+
+
+def _path_signature(paths):
+    """Return a (path, ino, size, mtime_ns, ctime_ns) tuple for every path, None if missing."""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns))
+        except OSError:
+            signature.append((path, None, None, None, None))
+    return tuple(signature)
+
+
+class PersistentFactStore:
+    """Pickled name -> (signature, value) map, loaded on first use and saved at exit."""
+
+    def __init__(self, path=FACT_CACHE_FILE):
+        self.path = path
+        self.entries = None
+        self.dirty = False
+        self.enabled = os.environ.get("HARDENSYS_FACT_CACHE", "1") != "0"
+
+    def _load(self):
+        if self.entries is not None:
+            return
+        self.entries = {}
+        if not self.enabled:
+            return
+        try:
+            with open(self.path, "rb") as f:
+                st = os.fstat(f.fileno())
+                # Only trust a cache written by this user and not writable by others
+                if st.st_uid != os.geteuid() or st.st_mode & 0o022:
+                    return
+                data = pickle.load(f)
+            if isinstance(data, dict) and data.get("version") == FACT_CACHE_VERSION:
+                self.entries = data["facts"]
+        except Exception:
+            self.entries = {}
+
+    def get(self, name, signature):
+        self._load()
+        entry = self.entries.get(name)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        return _MISSING
+
+    def latest(self, name):
+        """The stored value for name whatever its signature, or None."""
+        self._load()
+        entry = self.entries.get(name)
+        return entry[1] if entry is not None else None
+
+    def put(self, name, signature, value):
+        self._load()
+        self.entries[name] = (signature, value)
+        self.dirty = True
+
+    def discard(self, name):
+        if self.entries and self.entries.pop(name, None) is not None:
+            self.dirty = True
+
+    def save(self):
+        if not (self.enabled and self.dirty):
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            data = pickle.dumps({"version": FACT_CACHE_VERSION, "facts": self.entries}, pickle.HIGHEST_PROTOCOL)
+            remediation.atomic_write(self.path, data, mode=0o600)
+            self.dirty = False
+        except Exception:
+            pass
+
+
+_fact_store = PersistentFactStore()
+atexit.register(_fact_store.save)
+
+
+def _cached_fact(name, paths, builder, max_age=None, persist=False):
+    """Return builder(), reusing the previous value while paths are unchanged."""
+    if _fact_recorder is not None:
+        _fact_recorder.add(name)
+    cached = _fact_cache.get(name)
+    if cached is not None and name in _watched_facts:
+        return cached[1]
+    paths = list(paths() if callable(paths) else paths)
+    signature = _path_signature(paths)
+    if cached is not None and cached[0] == signature:
+        if max_age is None or time.monotonic() - cached[2] < max_age:
+            return cached[1]
+    if persist:
+        _file_facts.add(name)
+    value = _fact_store.get(name, signature) if persist else _MISSING
+    if value is _MISSING:
+        value = builder()
+        if persist and getattr(value, "unreadable", None):
+            # Built without files this process could not read: neither stored nor reusable
+            _file_facts.discard(name)
+        elif persist:
+            _fact_store.put(name, signature, value)
+    _fact_cache[name] = (signature, value, time.monotonic(), max_age)
+    if _active_watcher is not None and max_age is None:
+        _active_watcher.track(name, signature)
+    return value
+
+
+def _previous_fact(name):
+    """The last value built for name, in memory or on disk, even if it is stale."""
+    cached = _fact_cache.get(name)
+    if cached is not None:
+        return cached[1]
+    return _fact_store.latest(name)
+
+
+def run_with_dependencies(func):
+    """Run a rule and return (result, set of the fact names it used)."""
+    global _fact_recorder
+    previous, used = _fact_recorder, set()
+    _fact_recorder = used
+    try:
+        return func(), used
+    finally:
+        _fact_recorder = previous
+        if previous is not None:
+            previous.update(used)
+
+
+def _today():
+    """Days since the epoch, recorded as a CLOCK_FACT dependency of the running rule."""
+    if _fact_recorder is not None:
+        _fact_recorder.add(CLOCK_FACT)
+    return int(time.time() // 86400)
+
+
+def rule_inputs(used):
+    """
+    Input signature of a rule from the facts it used: {fact name: signature},
+    plus this module's own signature so changed rule code invalidates it.
+    None when the rule used no facts or one that is not derived only from
+    files (command output, /proc snapshots, scans), so it cannot be reused.
+    """
+    if not used or any(name not in _file_facts or name not in _fact_cache for name in used):
+        return None
+    inputs = {name: _fact_cache[name][0] for name in sorted(used)}
+    inputs["__rules__"] = _path_signature([os.path.abspath(__file__)])
+    return inputs
+
+
+def inputs_unchanged(inputs, memo=None):
+    """Whether every path of a stored rule_inputs() signature still has the same stat signature."""
+    memo = {} if memo is None else memo
+    for name, signature in inputs.items():
+        key = (name, repr(signature))
+        if key not in memo:
+            current = _path_signature([entry[0] for entry in signature])
+            memo[key] = [list(entry) for entry in current] == [list(entry) for entry in signature]
+        if not memo[key]:
+            return False
+    return True
+
+
+def watched_facts():
+    """Names of the facts a running FactWatcher keeps up to date."""
+    return set(_watched_facts)
+
+
+def invalidate_facts(names=None):
+    """Drop the named facts (every fact when None) from memory and from the on-disk store."""
+    for name in list(_fact_cache if names is None else names):
+        _fact_cache.pop(name, None)
+        _watched_facts.discard(name)
+        _fact_store.discard(name)
+
+
+class FactWatcher:
+    """
+    Long-lived invalidation: watches the directories holding the source paths
+    of the cached facts with inotify (through watchfiles) and drops only the
+    facts whose paths changed. While it runs, watched facts are returned
+    without re-stat'ing their paths. on_change(names, paths) is called from
+    the watcher thread after each batch of invalidations.
+    """
+
+    def __init__(self, on_change=None, debounce_ms=200):
+        self.on_change = on_change
+        self.debounce_ms = debounce_ms
+        self.dirs = set()
+        self._index = collections.defaultdict(set)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _watch_dir(path):
+        return path if os.path.isdir(path) else os.path.dirname(path)
+
+    def track(self, name, signature):
+        """Index a fact's paths; it is served unchecked if all of them are covered."""
+        if not signature:
+            return
+        for entry in signature:
+            self._index[entry[0]].add(name)
+        if all(self._watch_dir(entry[0]) in self.dirs for entry in signature):
+            _watched_facts.add(name)
+
+    def start(self):
+        global _active_watcher
+        import watchfiles  # only needed in watch mode
+        facts = [(name, cached[0]) for name, cached in list(_fact_cache.items()) if cached[3] is None]
+        self.dirs = {self._watch_dir(entry[0]) for _, signature in facts for entry in signature}
+        self.dirs = {d for d in self.dirs if os.path.isdir(d)}
+        for name, signature in facts:
+            self.track(name, signature)
+        _active_watcher = self
+        self._thread = threading.Thread(target=self._run, args=(watchfiles,), daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self, watchfiles):
+        if not self.dirs:
+            return
+        for changes in watchfiles.watch(*sorted(self.dirs), watch_filter=None, recursive=False,
+                                        debounce=self.debounce_ms, stop_event=self._stop):
+            paths = {path for _, path in changes}
+            names = set()
+            for path in paths:
+                names |= self._index.get(path, set()) | self._index.get(os.path.dirname(path), set())
+            invalidate_facts(names)
+            if names and self.on_change:
+                self.on_change(names, paths)
+
+    def stop(self):
+        global _active_watcher
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if _active_watcher is self:
+            _active_watcher = None
+            _watched_facts.clear()
+
+
+def _read_lines(path):
+    """Read a text file and return its lines, or [] if it cannot be read."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+
+def _list_files(directory, pattern="*"):
+    """Sorted regular files in directory matching pattern ([] if missing)."""
+    return sorted(p for p in glob.glob(os.path.join(directory, pattern)) if os.path.isfile(p))
+
+
+def _check_result(passed, message, current):
+    """Build the result dictionary for a check-only (audit) rule."""
+    return {
+        "status": "success" if passed else "error",
+        "message": f"{'✅' if passed else '❌'} {message}",
+        "previous": "Not applicable (check only)",
+        "current": current
+    }
+
+
+def _error_result(e):
+    return {
+        "status": "error",
+        "message": f"❌ Error: {str(e)}",
+        "previous": "Unknown",
+        "current": "Unknown"
+    }
+
+
+def _to_int(value, default=None):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return default
+
+
+# ----------------------- PAM stack index -----------------------
+
+PAM_DIR = "/etc/pam.d"
+SECURITY_DIR = "/etc/security"
+PAM_TYPES = ("auth", "account", "password", "session")
+
+# Module -> (main config file, drop-in directory) relative to SECURITY_DIR.
+# pam_pwquality reads pwquality.conf.d/*.conf in C collation order before
+# pwquality.conf; for every module the arguments on the PAM line win.
+PAM_MODULE_CONFIGS = {
+    "pam_pwquality.so": ("pwquality.conf", "pwquality.conf.d"),
+    "pam_faillock.so": ("faillock.conf", None),
+    "pam_pwhistory.so": ("pwhistory.conf", None),
+}
+
+
+def _split_pam_tokens(line):
+    """Split a PAM line on whitespace, keeping [...] groups as one token."""
+    tokens = []
+    current = ""
+    depth = 0
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        if depth == 0 and ch == "#":
+            break
+        if ch == "\\" and depth and i + 1 < len(line) and line[i + 1] == "]":
+            current += "]"
+            i += 2
+            continue
+        if ch == "[":
+            depth += 1
+        elif ch == "]" and depth:
+            depth -= 1
+        if ch.isspace() and depth == 0:
+            if current:
+                tokens.append(current)
+                current = ""
+        else:
+            current += ch
+        i += 1
+    if current:
+        tokens.append(current)
+    return tokens
+
+
+def _parse_module_options(args):
+    """Turn PAM module arguments into a dict: key=value -> value, flag -> True."""
+    options = {}
+    for arg in args:
+        if arg.startswith("[") and arg.endswith("]"):
+            arg = arg[1:-1]
+        key, sep, value = arg.partition("=")
+        options[key.strip()] = value.strip() if sep else True
+    return options
+
+
+def _parse_module_config(lines):
+    """Parse a pwquality/faillock/pwhistory style 'key = value' file."""
+    options = {}
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        key, sep, value = line.partition("=")
+        options[key.strip()] = value.strip() if sep else True
+    return options
+
+
+class PamEntry:
+    """One module line of an expanded PAM stack."""
+
+    def __init__(self, pam_type, control, module, args, source, optional=False):
+        self.type = pam_type
+        self.control = control
+        self.module = os.path.basename(module)
+        self.args = args
+        self.source = source
+        self.optional = optional
+        self.options = _parse_module_options(args)
+
+    def __repr__(self):
+        return f"PamEntry({self.type} {self.control} {self.module} {' '.join(self.args)})"
+
+
+class PamIndex:
+    """
+    Parsed view of /etc/pam.d and the module configuration files.
+    Each service file and its @include / include / substack chain is read
+    once and expanded into an ordered list of PamEntry objects.
+    """
+
+    def __init__(self, pam_dir=PAM_DIR, security_dir=SECURITY_DIR):
+        self.pam_dir = pam_dir
+        self.security_dir = security_dir
+        self._files = {}
+        self._stacks = {}
+        self._configs = {}
+
+    def _file_entries(self, name):
+        """Raw (type, control, module/target, args, source, optional) tuples of one file."""
+        if name not in self._files:
+            entries = []
+            path = os.path.join(self.pam_dir, name)
+            pending = ""
+            for lineno, raw in enumerate(_read_lines(path), 1):
+                if raw.endswith("\\"):
+                    pending += raw[:-1] + " "
+                    continue
+                line = (pending + raw).strip()
+                pending = ""
+                if not line or line.startswith("#"):
+                    continue
+                source = f"{path}:{lineno}"
+                tokens = _split_pam_tokens(line)
+                if tokens[0] == "@include" and len(tokens) > 1:
+                    entries.append((None, "@include", tokens[1], [], source, False))
+                    continue
+                if len(tokens) < 3:
+                    continue
+                pam_type, control, module = tokens[0], tokens[1], tokens[2]
+                optional = pam_type.startswith("-")
+                pam_type = pam_type.lstrip("-").lower()
+                if pam_type not in PAM_TYPES:
+                    continue
+                entries.append((pam_type, control, module, tokens[3:], source, optional))
+            self._files[name] = entries
+        return self._files[name]
+
+    def _expand(self, name, only_type, seen):
+        stack = []
+        if name in seen:
+            return stack
+        seen = seen | {name}
+        for pam_type, control, module, args, source, optional in self._file_entries(name):
+            if control == "@include":
+                stack.extend(self._expand(module, only_type, seen))
+            elif only_type and pam_type != only_type:
+                continue
+            elif control in ("include", "substack"):
+                stack.extend(self._expand(module, pam_type, seen))
+            else:
+                stack.append(PamEntry(pam_type, control, module, args, source, optional))
+        return stack
+
+    def stack(self, service, pam_type=None):
+        """Ordered, include-expanded module list for a service."""
+        if service not in self._stacks:
+            self._stacks[service] = self._expand(service, None, frozenset())
+        entries = self._stacks[service]
+        if pam_type:
+            return [e for e in entries if e.type == pam_type]
+        return list(entries)
+
+    def find(self, service, module, pam_type=None):
+        """All stack entries of a service that load the given module."""
+        return [e for e in self.stack(service, pam_type) if e.module == module]
+
+    def has_module(self, service, module, pam_type=None):
+        return bool(self.find(service, module, pam_type))
+
+    def module_config(self, module):
+        """Options from the module's own configuration files, merged in read order."""
+        if module not in self._configs:
+            options = {}
+            config = PAM_MODULE_CONFIGS.get(module)
+            if config:
+                main_file, drop_in_dir = config
+                if drop_in_dir:
+                    for path in _list_files(os.path.join(self.security_dir, drop_in_dir), "*.conf"):
+                        options.update(_parse_module_config(_read_lines(path)))
+                options.update(_parse_module_config(_read_lines(os.path.join(self.security_dir, main_file))))
+            self._configs[module] = options
+        return dict(self._configs[module])
+
+    def effective_options(self, service, module, pam_type=None):
+        """
+        Effective options for every invocation of module in a service: the
+        config file values overridden by that line's own arguments.
+        """
+        results = []
+        for entry in self.find(service, module, pam_type):
+            options = self.module_config(module)
+            options.update(entry.options)
+            results.append(options)
+        return results
+
+    def source_paths(self):
+        """Every file the index reads, used to detect changes."""
+        paths = [self.pam_dir] + _list_files(self.pam_dir)
+        for main_file, drop_in_dir in PAM_MODULE_CONFIGS.values():
+            paths.append(os.path.join(self.security_dir, main_file))
+            if drop_in_dir:
+                directory = os.path.join(self.security_dir, drop_in_dir)
+                paths.append(directory)
+                paths.extend(_list_files(directory, "*.conf"))
+        return paths
+
+
+def get_pam_index(pam_dir=PAM_DIR, security_dir=SECURITY_DIR):
+    """Return the shared PamIndex, rebuilt only when a PAM file changes."""
+    index = PamIndex(pam_dir, security_dir)
+    return _cached_fact(f"pam:{pam_dir}:{security_dir}", index.source_paths, lambda: index, persist=True)
+
+
+def _pam_module_enabled(module, required):
+    """required: list of (service, pam_type) pairs that must load module."""
+    try:
+        index = get_pam_index()
+        missing = [f"{service} ({pam_type})" for service, pam_type in required
+                   if not index.has_module(service, module, pam_type)]
+        if missing:
+            return _check_result(False, f"{module} missing from: {', '.join(missing)}", "Not enabled")
+        return _check_result(True, f"{module} is enabled", "Enabled")
+    except Exception as e:
+        return _error_result(e)
+
+
+def _pam_option_check(service, module, pam_type, label, evaluate):
+    """
+    Check one option across every invocation of module in service.
+    evaluate(options) -> (passed, shown_value).
+    """
+    try:
+        invocations = get_pam_index().effective_options(service, module, pam_type)
+        if not invocations:
+            return _check_result(False, f"{module} is not used in {service}", "Not configured")
+        values = []
+        passed = True
+        for options in invocations:
+            ok, shown = evaluate(options)
+            passed = passed and ok
+            values.append(str(shown))
+        current = ", ".join(dict.fromkeys(values))
+        return _check_result(passed, f"{label}: {current}", current)
+    except Exception as e:
+        return _error_result(e)
+
+
+def _int_option(name, default, predicate):
+    def evaluate(options):
+        value = _to_int(options.get(name, default))
+        return (value is not None and predicate(value)), f"{name}={value if value is not None else options.get(name)}"
+    return evaluate
+
+
+def _flag_option(name):
+    def evaluate(options):
+        present = name in options and options[name] not in ("0", "false", "no")
+        return present, name if present else f"{name} not set"
+    return evaluate
+
+
+def pam_unix_enabled():
+    """Ensure pam_unix is used by common-account, common-auth, common-password and common-session."""
+    return _pam_module_enabled("pam_unix.so", [
+        ("common-account", "account"),
+        ("common-auth", "auth"),
+        ("common-password", "password"),
+        ("common-session", "session"),
+    ])
+
+
+def pam_faillock_enabled():
+    """Ensure pam_faillock is used by common-auth and common-account."""
+    return _pam_module_enabled("pam_faillock.so", [
+        ("common-auth", "auth"),
+        ("common-account", "account"),
+    ])
+
+
+def pam_pwquality_enabled():
+    """Ensure pam_pwquality is used by common-password."""
+    return _pam_module_enabled("pam_pwquality.so", [("common-password", "password")])
+
+
+def pam_pwhistory_enabled():
+    """Ensure pam_pwhistory is used by common-password."""
+    return _pam_module_enabled("pam_pwhistory.so", [("common-password", "password")])
+
+
+def faillock_deny():
+    """Ensure pam_faillock 'deny' is set to 1-5 failed attempts."""
+    return _pam_option_check("common-auth", "pam_faillock.so", "auth", "Failed attempts lockout",
+                             _int_option("deny", 3, lambda v: 0 < v <= 5))
+
+
+def faillock_unlock_time():
+    """Ensure pam_faillock 'unlock_time' is 0 (never) or at least 900 seconds."""
+    return _pam_option_check("common-auth", "pam_faillock.so", "auth", "Unlock time",
+                             _int_option("unlock_time", 600, lambda v: v == 0 or v >= 900))
+
+
+def faillock_root():
+    """Ensure pam_faillock locks root with even_deny_root or root_unlock_time >= 60."""
+    def evaluate(options):
+        if "even_deny_root" in options:
+            return True, "even_deny_root"
+        root_unlock = _to_int(options.get("root_unlock_time"))
+        if root_unlock is not None:
+            return root_unlock >= 60, f"root_unlock_time={root_unlock}"
+        return False, "root not included"
+    return _pam_option_check("common-auth", "pam_faillock.so", "auth", "Lockout for root", evaluate)
+
+
+def pwquality_difok():
+    """Ensure pam_pwquality 'difok' is 2 or more."""
+    return _pam_option_check("common-password", "pam_pwquality.so", "password", "Changed characters",
+                             _int_option("difok", 1, lambda v: v >= 2))
+
+
+def pwquality_minlen():
+    """Ensure pam_pwquality 'minlen' is 14 or more."""
+    return _pam_option_check("common-password", "pam_pwquality.so", "password", "Minimum length",
+                             _int_option("minlen", 8, lambda v: v >= 14))
+
+
+def pwquality_maxrepeat():
+    """Ensure pam_pwquality 'maxrepeat' is 1-3."""
+    return _pam_option_check("common-password", "pam_pwquality.so", "password", "Same consecutive characters",
+                             _int_option("maxrepeat", 0, lambda v: 0 < v <= 3))
+
+
+def pwquality_maxsequence():
+    """Ensure pam_pwquality 'maxsequence' is 1-3."""
+    return _pam_option_check("common-password", "pam_pwquality.so", "password", "Maximum sequential characters",
+                             _int_option("maxsequence", 0, lambda v: 0 < v <= 3))
+
+
+def pwquality_dictcheck():
+    """Ensure pam_pwquality 'dictcheck' is not disabled."""
+    return _pam_option_check("common-password", "pam_pwquality.so", "password", "Dictionary check",
+                             _int_option("dictcheck", 1, lambda v: v != 0))
+
+
+def pwquality_enforcing():
+    """Ensure pam_pwquality 'enforcing' is not disabled."""
+    return _pam_option_check("common-password", "pam_pwquality.so", "password", "Quality checking",
+                             _int_option("enforcing", 1, lambda v: v != 0))
+
+
+def pwquality_enforce_for_root():
+    """Ensure pam_pwquality 'enforce_for_root' is set."""
+    return _pam_option_check("common-password", "pam_pwquality.so", "password", "Quality for root",
+                             _flag_option("enforce_for_root"))
+
+
+def pwhistory_remember():
+    """Ensure pam_pwhistory 'remember' is 24 or more."""
+    return _pam_option_check("common-password", "pam_pwhistory.so", "password", "Password history",
+                             _int_option("remember", 10, lambda v: v >= 24))
+
+
+def pwhistory_enforce_for_root():
+    """Ensure pam_pwhistory 'enforce_for_root' is set."""
+    return _pam_option_check("common-password", "pam_pwhistory.so", "password", "History for root",
+                             _flag_option("enforce_for_root"))
+
+
+def pwhistory_use_authtok():
+    """Ensure pam_pwhistory has 'use_authtok' set."""
+    return _pam_option_check("common-password", "pam_pwhistory.so", "password", "pam_pwhistory",
+                             _flag_option("use_authtok"))
+
+
+# ----------------------- Installed-package index -----------------------
+
+DPKG_STATUS = "/var/lib/dpkg/status"
+RPM_DB_DIR = "/var/lib/rpm"
+
+
+def _debian_version_key(part):
+    """Split a Debian upstream/revision string into comparable chunks."""
+    def char_order(ch):
+        if ch == "~":
+            return -1
+        if ch.isalpha():
+            return ord(ch)
+        return ord(ch) + 256
+    key = []
+    for text, digits in re.findall(r"(\D*)(\d*)", part):
+        key.append(tuple(char_order(ch) for ch in text) + (0,))
+        key.append(int(digits) if digits else 0)
+    return key
+
+
+def compare_debian_versions(a, b):
+    """Compare two Debian version strings like dpkg --compare-versions (-1, 0, 1)."""
+    def split(version):
+        epoch, _, rest = version.partition(":") if ":" in version else ("0", "", version)
+        upstream, _, revision = rest.rpartition("-") if "-" in rest else (rest, "", "0")
+        return [_to_int(epoch, 0), _debian_version_key(upstream), _debian_version_key(revision)]
+    left, right = split(a), split(b)
+    return (left > right) - (left < right)
+
+
+class PackageIndex:
+    """
+    name -> (status, version) map of the host's packages.
+    Subclasses implement available(), source_paths() and load(); a provider
+    for another package manager only needs those three methods.
+    """
+
+    def __init__(self):
+        self.packages = {}
+
+    @classmethod
+    def available(cls):
+        return False
+
+    @classmethod
+    def source_paths(cls):
+        return []
+
+    def load(self):
+        raise NotImplementedError
+
+    def get(self, name):
+        """(status, version) for a package, or None if unknown."""
+        return self.packages.get(name)
+
+    def installed(self, name):
+        entry = self.packages.get(name)
+        return bool(entry) and entry[0] == "installed"
+
+    def version(self, name):
+        entry = self.packages.get(name)
+        return entry[1] if entry and entry[0] == "installed" else None
+
+    def version_at_least(self, name, minimum):
+        current = self.version(name)
+        return current is not None and compare_debian_versions(current, minimum) >= 0
+
+
+class DpkgPackageIndex(PackageIndex):
+    """Package index stream-parsed from the dpkg status database."""
+
+    status_file = DPKG_STATUS
+
+    @classmethod
+    def available(cls):
+        return os.path.isfile(cls.status_file)
+
+    @classmethod
+    def source_paths(cls):
+        return [cls.status_file]
+
+    def load(self):
+        packages = {}
+        fields = {}
+
+        def flush():
+            name = fields.get("Package")
+            if name:
+                status = fields.get("Status", "").split()
+                state = status[-1] if status else "unknown"
+                # Multi-arch packages appear once per architecture; keep the installed one
+                if state == "installed" or name not in packages:
+                    packages[name] = (state, fields.get("Version", ""))
+            fields.clear()
+
+        with open(self.status_file, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    flush()
+                elif not line[0].isspace():
+                    key, _, value = line.partition(":")
+                    if key in ("Package", "Status", "Version"):
+                        fields[key] = value.strip()
+        flush()
+        self.packages = packages
+        return self
+
+
+class RpmPackageIndex(PackageIndex):
+    """Package index for rpm hosts, built from a single 'rpm -qa' query."""
+
+    @classmethod
+    def available(cls):
+        return os.path.isdir(RPM_DB_DIR) and not DpkgPackageIndex.available()
+
+    @classmethod
+    def source_paths(cls):
+        return [RPM_DB_DIR] + _list_files(RPM_DB_DIR)
+
+    def load(self):
+        result = subprocess.run(
+            ["rpm", "-qa", "--queryformat", "%{NAME}\t%{EPOCHNUM}:%{VERSION}-%{RELEASE}\n"],
+            capture_output=True, text=True
+        )
+        packages = {}
+        for line in result.stdout.splitlines():
+            name, _, version = line.partition("\t")
+            if name:
+                packages[name] = ("installed", version)
+        self.packages = packages
+        return self
+
+
+# Tried in order; the first provider whose available() is True is used.
+PACKAGE_INDEX_PROVIDERS = [DpkgPackageIndex, RpmPackageIndex]
+
+
+def register_package_index(provider, first=True):
+    """Add a PackageIndex subclass for another package manager."""
+    if provider not in PACKAGE_INDEX_PROVIDERS:
+        if first:
+            PACKAGE_INDEX_PROVIDERS.insert(0, provider)
+        else:
+            PACKAGE_INDEX_PROVIDERS.append(provider)
+
+
+def get_package_index():
+    """Return the shared package index, reloaded only when the database changes."""
+    for provider in PACKAGE_INDEX_PROVIDERS:
+        if provider.available():
+            return _cached_fact(f"packages:{provider.__name__}", provider.source_paths,
+                                lambda: provider().load(), persist=True)
+    return PackageIndex()
+
+
+def _package_status(names):
+    """Installed versions of the given package names as 'name version' strings."""
+    index = get_package_index()
+    return [f"{name} {index.version(name)}" for name in names if index.installed(name)]
+
+
+def _package_not_installed(label, names):
+    try:
+        installed = _package_status(names)
+        if installed:
+            return _check_result(False, f"{label} is installed: {', '.join(installed)}", "Installed")
+        return _check_result(True, f"{label} is not installed", "Not installed")
+    except Exception as e:
+        return _error_result(e)
+
+
+def _package_installed(label, names, minimum=None):
+    """Pass when any of names is installed (at minimum version, if given)."""
+    try:
+        index = get_package_index()
+        for name in names:
+            if index.installed(name):
+                version = index.version(name)
+                if minimum and not index.version_at_least(name, minimum):
+                    return _check_result(False, f"{label} {version} is older than {minimum}", version)
+                return _check_result(True, f"{label} is installed ({name} {version})", version)
+        return _check_result(False, f"{label} is not installed", "Not installed")
+    except Exception as e:
+        return _error_result(e)
+
+
+def prelink_not_installed():
+    """Ensure prelink is not installed."""
+    return _package_not_installed("prelink", ["prelink"])
+
+
+def nis_client_not_installed():
+    """Ensure the NIS client is not installed."""
+    return _package_not_installed("NIS client", ["nis"])
+
+
+def rsh_client_not_installed():
+    """Ensure the rsh client is not installed."""
+    return _package_not_installed("rsh client", ["rsh-client"])
+
+
+def talk_client_not_installed():
+    """Ensure the talk client is not installed."""
+    return _package_not_installed("talk client", ["talk"])
+
+
+def telnet_client_not_installed():
+    """Ensure the telnet client is not installed."""
+    return _package_not_installed("telnet client", ["telnet", "inetutils-telnet"])
+
+
+def ldap_client_not_installed():
+    """Ensure the LDAP client utilities are not installed."""
+    return _package_not_installed("LDAP client", ["ldap-utils"])
+
+
+def ftp_client_not_installed():
+    """Ensure the ftp client is not installed."""
+    return _package_not_installed("ftp client", ["ftp", "tnftp"])
+
+
+def sudo_installed():
+    """Ensure sudo (or sudo-ldap) is installed."""
+    return _package_installed("sudo", ["sudo", "sudo-ldap"])
+
+
+def ufw_installed():
+    """Ensure ufw is installed."""
+    return _package_installed("ufw", ["ufw"])
+
+
+def iptables_persistent_not_installed():
+    """Ensure iptables-persistent is not installed alongside ufw."""
+    return _package_not_installed("iptables-persistent", ["iptables-persistent"])
+
+
+def aide_installed():
+    """Ensure AIDE and aide-common are installed."""
+    try:
+        index = get_package_index()
+        missing = [name for name in ("aide", "aide-common") if not index.installed(name)]
+        if missing:
+            return _check_result(False, f"Not installed: {', '.join(missing)}", "Not installed")
+        return _check_result(True, f"AIDE is installed ({index.version('aide')})", index.version("aide"))
+    except Exception as e:
+        return _error_result(e)
+
+
+def pam_latest_installed():
+    """Ensure libpam-runtime is at least version 1.5.2-6."""
+    return _package_installed("libpam-runtime", ["libpam-runtime"], minimum="1.5.2-6")
+
+
+def libpam_modules_installed():
+    """Ensure libpam-modules is at least version 1.5.2-6."""
+    return _package_installed("libpam-modules", ["libpam-modules"], minimum="1.5.2-6")
+
+
+def libpam_pwquality_installed():
+    """Ensure libpam-pwquality is installed."""
+    return _package_installed("libpam-pwquality", ["libpam-pwquality"])
+
+
+# ----------------------- systemd unit states -----------------------
+
+SYSTEMD_SYSTEM_DIR = "/etc/systemd/system"
+SYSTEMD_RUNTIME_DIR = "/run/systemd/system"
+SYSTEMD_UNIT_DIRS = [
+    "/etc/systemd/system",
+    "/run/systemd/system",
+    "/usr/local/lib/systemd/system",
+    "/usr/lib/systemd/system",
+    "/lib/systemd/system",
+]
+# systemd adds/removes invocation links here as units start and stop
+SYSTEMD_UNITS_RUNTIME = "/run/systemd/units"
+
+
+def _unit_name(unit):
+    return unit if "." in unit else f"{unit}.service"
+
+
+class UnitStates:
+    """
+    Snapshot of every systemd unit's load, active and enablement state.
+    Load/active state comes from a single 'systemctl list-units --all';
+    enablement is resolved from the symlink trees under /etc/systemd/system.
+    """
+
+    def __init__(self, system_dir=SYSTEMD_SYSTEM_DIR, unit_dirs=None):
+        self.system_dir = system_dir
+        self.unit_dirs = unit_dirs if unit_dirs is not None else SYSTEMD_UNIT_DIRS
+        self.runtime = {}
+        self.enabled = set()
+        self.masked = set()
+        self.linked = set()
+        self.aliases = {}
+        self.systemd_running = False
+
+    def load(self):
+        self._load_runtime()
+        self._load_symlinks()
+        return self
+
+    def _load_runtime(self):
+        try:
+            result = subprocess.run(
+                ["systemctl", "list-units", "--all", "--full", "--plain", "--no-legend", "--no-pager"],
+                capture_output=True, text=True
+            )
+        except OSError:
+            return
+        if result.returncode != 0:
+            return
+        self.systemd_running = True
+        for line in result.stdout.splitlines():
+            parts = line.split(None, 4)
+            if len(parts) >= 4:
+                self.runtime[parts[0]] = {"load": parts[1], "active": parts[2], "sub": parts[3]}
+
+    def _load_symlinks(self):
+        for base in (self.system_dir, SYSTEMD_RUNTIME_DIR):
+            if not os.path.isdir(base):
+                continue
+            for name in os.listdir(base):
+                path = os.path.join(base, name)
+                if os.path.islink(path):
+                    target = os.readlink(path)
+                    if target == "/dev/null":
+                        self.masked.add(name)
+                    elif name == os.path.basename(target):
+                        # Unit file added with 'systemctl link'
+                        self.linked.add(name)
+                    else:
+                        # Alias link such as dbus-org.freedesktop.timesync1.service
+                        self.aliases[name] = os.path.basename(target)
+                        self.enabled.add(os.path.basename(target))
+                elif os.path.isfile(path) and os.path.getsize(path) == 0:
+                    self.masked.add(name)
+                elif os.path.isdir(path) and name.endswith((".wants", ".requires")):
+                    for unit in os.listdir(path):
+                        self.enabled.add(unit)
+                        if "@" in unit:
+                            # getty@tty1.service enables the getty@.service template
+                            prefix, _, suffix = unit.partition("@")
+                            self.enabled.add(f"{prefix}@{suffix[suffix.rfind('.'):]}")
+
+    def _unit_file(self, unit):
+        for directory in self.unit_dirs:
+            path = os.path.join(directory, unit)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def state(self, unit):
+        """{'load', 'active', 'sub', 'enabled'} for one unit."""
+        unit = _unit_name(unit)
+        runtime = self.runtime.get(unit, {})
+        if unit in self.masked:
+            enabled = "masked"
+        elif unit in self.enabled:
+            enabled = "enabled"
+        elif unit in self.linked:
+            enabled = "linked"
+        else:
+            path = self._unit_file(unit)
+            if path is None:
+                enabled = "not-found"
+            elif any(line.strip() == "[Install]" for line in _read_lines(path)):
+                enabled = "disabled"
+            else:
+                enabled = "static"
+        return {
+            "load": runtime.get("load", "loaded" if enabled != "not-found" else "not-found"),
+            "active": runtime.get("active", "inactive"),
+            "sub": runtime.get("sub", "dead"),
+            "enabled": enabled,
+        }
+
+    def is_enabled(self, unit):
+        return self.state(unit)["enabled"] == "enabled"
+
+    def is_active(self, unit):
+        return self.state(unit)["active"] in ("active", "activating", "reloading")
+
+    def is_masked(self, unit):
+        return self.state(unit)["enabled"] == "masked"
+
+    def in_use(self, unit):
+        return self.is_enabled(unit) or self.is_active(unit)
+
+    def source_paths(self):
+        paths = [self.system_dir, SYSTEMD_RUNTIME_DIR, SYSTEMD_UNITS_RUNTIME]
+        if os.path.isdir(self.system_dir):
+            paths.extend(os.path.join(self.system_dir, name) for name in sorted(os.listdir(self.system_dir))
+                         if name.endswith((".wants", ".requires")))
+        return paths
+
+
+def get_unit_states(system_dir=SYSTEMD_SYSTEM_DIR):
+    """Return the shared unit-state snapshot, refreshed when units change."""
+    snapshot = UnitStates(system_dir)
+    return _cached_fact(f"units:{system_dir}", snapshot.source_paths, snapshot.load)
+
+
+def _describe_unit(unit, state):
+    return f"{_unit_name(unit)} ({state['enabled']}, {state['active']})"
+
+
+def _service_not_in_use(label, packages, units):
+    """Pass when none of packages is installed, or none of units is enabled or active."""
+    try:
+        if packages and not _package_status(packages):
+            return _check_result(True, f"{label} is not installed", "Not installed")
+        states = get_unit_states()
+        in_use = [_describe_unit(unit, states.state(unit)) for unit in units if states.in_use(unit)]
+        if in_use:
+            return _check_result(False, f"{label} in use: {', '.join(in_use)}", "In use")
+        return _check_result(True, f"{label} is installed but not enabled or active", "Not in use")
+    except Exception as e:
+        return _error_result(e)
+
+
+def _service_enabled_active(label, unit, allow_static=False):
+    try:
+        state = get_unit_states().state(unit)
+        enabled = state["enabled"] == "enabled" or (allow_static and state["enabled"] == "static")
+        active = state["active"] == "active"
+        return _check_result(enabled and active, f"{label}: {_describe_unit(unit, state)}",
+                             f"{state['enabled']}, {state['active']}")
+    except Exception as e:
+        return _error_result(e)
+
+
+def autofs_not_in_use():
+    """Ensure autofs services are not in use."""
+    return _service_not_in_use("autofs", ["autofs"], ["autofs.service"])
+
+
+def avahi_not_in_use():
+    """Ensure avahi daemon services are not in use."""
+    return _service_not_in_use("avahi-daemon", ["avahi-daemon"], ["avahi-daemon.socket", "avahi-daemon.service"])
+
+
+def dhcp_server_not_in_use():
+    """Ensure dhcp server services are not in use."""
+    return _service_not_in_use("DHCP server", ["isc-dhcp-server", "kea"],
+                               ["isc-dhcp-server.service", "isc-dhcp-server6.service",
+                                "kea-dhcp4-server.service", "kea-dhcp6-server.service"])
+
+
+def dns_server_not_in_use():
+    """Ensure dns server services are not in use."""
+    return _service_not_in_use("DNS server", ["bind9"], ["named.service", "bind9.service"])
+
+
+def dnsmasq_not_in_use():
+    """Ensure dnsmasq services are not in use."""
+    return _service_not_in_use("dnsmasq", ["dnsmasq"], ["dnsmasq.service"])
+
+
+def ftp_server_not_in_use():
+    """Ensure ftp server services are not in use."""
+    return _service_not_in_use("FTP server", ["vsftpd"], ["vsftpd.service"])
+
+
+def ldap_server_not_in_use():
+    """Ensure ldap server services are not in use."""
+    return _service_not_in_use("LDAP server", ["slapd"], ["slapd.service"])
+
+
+def message_access_server_not_in_use():
+    """Ensure message access (IMAP/POP3) server services are not in use."""
+    return _service_not_in_use("IMAP/POP3 server", ["dovecot-imapd", "dovecot-pop3d"],
+                               ["dovecot.socket", "dovecot.service"])
+
+
+def nfs_server_not_in_use():
+    """Ensure network file system services are not in use."""
+    return _service_not_in_use("NFS server", ["nfs-kernel-server"], ["nfs-server.service"])
+
+
+def nis_server_not_in_use():
+    """Ensure nis server services are not in use."""
+    return _service_not_in_use("NIS server", ["ypserv"], ["ypserv.service"])
+
+
+def print_server_not_in_use():
+    """Ensure print server services are not in use."""
+    return _service_not_in_use("CUPS", ["cups"], ["cups.socket", "cups.service"])
+
+
+def rpcbind_not_in_use():
+    """Ensure rpcbind services are not in use."""
+    return _service_not_in_use("rpcbind", ["rpcbind"], ["rpcbind.socket", "rpcbind.service"])
+
+
+def rsync_not_in_use():
+    """Ensure rsync services are not in use."""
+    return _service_not_in_use("rsync", ["rsync"], ["rsync.service"])
+
+
+def samba_not_in_use():
+    """Ensure samba file server services are not in use."""
+    return _service_not_in_use("Samba", ["samba"], ["smbd.service"])
+
+
+def snmp_not_in_use():
+    """Ensure snmp services are not in use."""
+    return _service_not_in_use("SNMP", ["snmpd"], ["snmpd.service"])
+
+
+def tftp_server_not_in_use():
+    """Ensure tftp server services are not in use."""
+    return _service_not_in_use("TFTP server", ["tftpd-hpa"], ["tftpd-hpa.service"])
+
+
+def web_proxy_not_in_use():
+    """Ensure web proxy server services are not in use."""
+    return _service_not_in_use("Squid", ["squid"], ["squid.service"])
+
+
+def web_server_not_in_use():
+    """Ensure web server services are not in use."""
+    return _service_not_in_use("Web server", ["apache2", "nginx"],
+                               ["apache2.socket", "apache2.service", "nginx.service"])
+
+
+def xinetd_not_in_use():
+    """Ensure xinetd services are not in use."""
+    return _service_not_in_use("xinetd", ["xinetd"], ["xinetd.service"])
+
+
+def x_window_server_not_in_use():
+    """Ensure X window server components are not installed."""
+    return _package_not_installed("X window server", ["xserver-common"])
+
+
+def bluetooth_not_in_use():
+    """Ensure bluetooth services are not in use."""
+    return _service_not_in_use("Bluetooth", ["bluez"], ["bluetooth.service"])
+
+
+TIME_SYNC_UNITS = ["systemd-timesyncd.service", "chrony.service"]
+
+
+def time_sync_in_use():
+    """Ensure systemd-timesyncd or chrony is in use."""
+    try:
+        states = get_unit_states()
+        in_use = [unit for unit in TIME_SYNC_UNITS if states.is_enabled(unit) and states.is_active(unit)]
+        if in_use:
+            return _check_result(True, f"Time synchronization in use: {', '.join(in_use)}", ", ".join(in_use))
+        return _check_result(False, "No time synchronization daemon is enabled and active", "None")
+    except Exception as e:
+        return _error_result(e)
+
+
+def single_time_sync_daemon():
+    """Ensure exactly one time synchronization daemon is in use."""
+    try:
+        states = get_unit_states()
+        in_use = [unit for unit in TIME_SYNC_UNITS if states.in_use(unit)]
+        current = ", ".join(in_use) or "None"
+        return _check_result(len(in_use) == 1, f"Time synchronization daemons in use: {current}", current)
+    except Exception as e:
+        return _error_result(e)
+
+
+def timesyncd_enabled_running():
+    """Ensure systemd-timesyncd is enabled and running."""
+    return _service_enabled_active("systemd-timesyncd", "systemd-timesyncd.service")
+
+
+def chrony_enabled_running():
+    """Ensure chrony is enabled and running."""
+    return _service_enabled_active("chrony", "chrony.service")
+
+
+def cron_enabled_active():
+    """Ensure the cron daemon is enabled and active."""
+    return _service_enabled_active("cron", "cron.service")
+
+
+def ufw_service_enabled():
+    """Ensure the ufw service is enabled and active and ufw.conf has ENABLED=yes."""
+    result = _service_enabled_active("ufw", "ufw.service")
+    if result["status"] == "success" and not get_ufw_ruleset().enabled:
+        return _check_result(False, "ufw.service is running but ENABLED=no in /etc/ufw/ufw.conf", "Disabled")
+    return result
+
+
+def journald_service():
+    """Ensure systemd-journald is enabled (static) and active."""
+    return _service_enabled_active("systemd-journald", "systemd-journald.service", allow_static=True)
+
+
+def auditd_service():
+    """Ensure auditd packages are installed and the auditd service is enabled and active."""
+    try:
+        missing = [name for name in ("auditd", "audispd-plugins") if not get_package_index().installed(name)]
+        if missing:
+            return _check_result(False, f"Not installed: {', '.join(missing)}", "Not installed")
+        return _service_enabled_active("auditd", "auditd.service")
+    except Exception as e:
+        return _error_result(e)
+
+
+# ----------------------- Filesystem walker -----------------------
+
+MOUNTS_FILE = "/proc/self/mounts"
+
+# Never walked: kernel pseudo filesystems and network/cluster filesystems.
+PSEUDO_FILESYSTEMS = {
+    "proc", "sysfs", "devtmpfs", "devpts", "cgroup", "cgroup2", "securityfs",
+    "debugfs", "tracefs", "pstore", "bpf", "mqueue", "hugetlbfs", "configfs",
+    "fusectl", "autofs", "binfmt_misc", "efivarfs", "rpc_pipefs", "nsfs",
+    "selinuxfs", "ramfs", "squashfs", "iso9660",
+}
+NETWORK_FILESYSTEMS = {
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "ncpfs", "afs", "ceph", "glusterfs",
+    "lustre", "gfs2", "ocfs2", "9p", "fuse.sshfs", "fuse.glusterfs", "fuse.s3fs",
+    "davfs", "fuse.davfs2",
+}
+
+# Findings kept per rule for reporting; the total count is always exact.
+FILESYSTEM_FINDINGS_LIMIT = 100
+# Seconds a completed walk is reused by the other filesystem rules
+FILESYSTEM_SCAN_MAX_AGE = 300
+
+WORLD_WRITABLE = "world_writable"
+UNOWNED = "unowned"
+SUID_SGID = "suid_sgid"
+
+
+def local_mounts(mounts_file=MOUNTS_FILE):
+    """(device, mountpoint, fstype) of every local, non-pseudo mount."""
+    mounts = []
+    for line in _read_lines(mounts_file):
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        device, mountpoint, fstype = parts[0], parts[1].replace("\\040", " "), parts[2]
+        if fstype in PSEUDO_FILESYSTEMS or fstype in NETWORK_FILESYSTEMS:
+            continue
+        if fstype.startswith("fuse.") and fstype != "fuse.lxcfs":
+            continue
+        mounts.append((device, mountpoint, fstype))
+    return mounts
+
+
+def _walk_roots(mounts):
+    """One root per device: bind mounts of a device already being walked are dropped."""
+    roots = {}
+    for _, mountpoint, _ in sorted(mounts, key=lambda m: len(m[1])):
+        try:
+            dev = os.lstat(mountpoint).st_dev
+        except OSError:
+            continue
+        if dev not in roots:
+            roots[dev] = mountpoint
+    return roots
+
+
+def _walk_device(root, dev, uids, gids, emit, stop):
+    """Walk one device without crossing into other filesystems."""
+    pending = [root]
+    while pending and not stop.is_set():
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if st.st_dev != dev:
+                        continue
+                    mode = st.st_mode
+                    is_dir = stat.S_ISDIR(mode)
+                    is_file = stat.S_ISREG(mode)
+                    if is_dir:
+                        pending.append(entry.path)
+                    if (is_file or (is_dir and not mode & stat.S_ISVTX)) and mode & stat.S_IWOTH:
+                        emit(WORLD_WRITABLE, entry.path, f"{stat.filemode(mode)}")
+                    if st.st_uid not in uids or st.st_gid not in gids:
+                        emit(UNOWNED, entry.path, f"uid={st.st_uid} gid={st.st_gid}")
+                    if is_file and mode & (stat.S_ISUID | stat.S_ISGID):
+                        emit(SUID_SGID, entry.path, f"{stat.filemode(mode)}")
+        except OSError:
+            continue
+
+
+def iter_filesystem_findings(mounts=None, max_workers=16):
+    """
+    Walk every local mount once, one thread per device, and yield
+    (rule, path, detail) tuples for world-writable, unowned and SUID/SGID
+    entries as soon as a worker finds them.
+    """
+    roots = _walk_roots(mounts if mounts is not None else local_mounts())
+    if not roots:
+        return
+    uids, gids = get_account_database().ids
+    findings = queue.Queue(maxsize=1000)
+    stop = threading.Event()
+    done = object()
+
+    def emit(rule, path, detail):
+        while not stop.is_set():
+            try:
+                findings.put((rule, path, detail), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    devices = queue.Queue()
+    for dev, root in roots.items():
+        devices.put((root, dev))
+
+    def worker():
+        # One thread per device; with more devices than workers, threads take turns
+        try:
+            while not stop.is_set():
+                try:
+                    root, dev = devices.get_nowait()
+                except queue.Empty:
+                    break
+                _walk_device(root, dev, uids, gids, emit, stop)
+        finally:
+            while not stop.is_set():
+                try:
+                    findings.put(done, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(min(len(roots), max_workers))]
+    for thread in threads:
+        thread.start()
+    remaining = len(threads)
+    try:
+        while remaining:
+            item = findings.get()
+            if item is done:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        stop.set()
+
+
+class FilesystemScan:
+    """
+    Exact counts plus the first `limit` findings per rule of one walk. Every
+    SUID/SGID path is kept as well, since audit rules are required for each.
+    """
+
+    def __init__(self, limit=FILESYSTEM_FINDINGS_LIMIT):
+        self.limit = limit
+        self.counts = {WORLD_WRITABLE: 0, UNOWNED: 0, SUID_SGID: 0}
+        self.samples = {WORLD_WRITABLE: [], UNOWNED: [], SUID_SGID: []}
+        self.suid_sgid_paths = set()
+
+    def add(self, rule, path, detail):
+        self.counts[rule] += 1
+        if rule == SUID_SGID:
+            self.suid_sgid_paths.add(path)
+        if len(self.samples[rule]) < self.limit:
+            self.samples[rule].append((path, detail))
+
+    def run(self, findings=None):
+        for rule, path, detail in (findings if findings is not None else iter_filesystem_findings()):
+            self.add(rule, path, detail)
+        return self
+
+
+def get_filesystem_scan(limit=FILESYSTEM_FINDINGS_LIMIT):
+    """Run (or reuse) the shared single-pass walk used by the filesystem rules."""
+    return _cached_fact(f"filesystem:{limit}", [MOUNTS_FILE], lambda: FilesystemScan(limit).run(),
+                        max_age=FILESYSTEM_SCAN_MAX_AGE)
+
+
+def _filesystem_rule(rule, label, passed_when_empty=True):
+    try:
+        scan = get_filesystem_scan()
+        count = scan.counts[rule]
+        if not count:
+            return _check_result(passed_when_empty, f"No {label} found", "None")
+        shown = ", ".join(path for path, _ in scan.samples[rule][:10])
+        more = f" (+{count - 10} more)" if count > 10 else ""
+        return _check_result(not passed_when_empty, f"{count} {label}: {shown}{more}", f"{count} found")
+    except Exception as e:
+        return _error_result(e)
+
+
+def world_writable_files():
+    """Ensure no world-writable files, and world-writable directories have the sticky bit."""
+    return _filesystem_rule(WORLD_WRITABLE, "world-writable files/directories")
+
+
+def unowned_files():
+    """Ensure no files or directories are without an owner or group."""
+    return _filesystem_rule(UNOWNED, "unowned/ungrouped files")
+
+
+def suid_sgid_files():
+    """List SUID and SGID files for review (reported, not failed)."""
+    try:
+        scan = get_filesystem_scan()
+        count = scan.counts[SUID_SGID]
+        shown = ", ".join(path for path, _ in scan.samples[SUID_SGID][:10])
+        return _check_result(True, f"{count} SUID/SGID files to review: {shown}" if count else "No SUID/SGID files found",
+                             f"{count} found")
+    except Exception as e:
+        return _error_result(e)
+
+
+# ----------------------- Account database index -----------------------
+
+PASSWD_FILE = "/etc/passwd"
+SHADOW_FILE = "/etc/shadow"
+GROUP_FILE = "/etc/group"
+GSHADOW_FILE = "/etc/gshadow"
+LOGIN_DEFS = "/etc/login.defs"
+SHELLS_FILE = "/etc/shells"
+USERADD_DEFAULTS = "/etc/default/useradd"
+
+# The password fields hold only _password_marker() of the file's field, so
+# hashes are neither kept in memory nor persisted with the fact cache
+PasswdEntry = collections.namedtuple("PasswdEntry", "name password uid gid gecos home shell")
+ShadowEntry = collections.namedtuple(
+    "ShadowEntry", "name password last_change min_days max_days warn_days inactive expire")
+GroupEntry = collections.namedtuple("GroupEntry", "name password gid members")
+GshadowEntry = collections.namedtuple("GshadowEntry", "name password admins members")
+
+
+def _password_marker(value):
+    """
+    What the checks read from a password field: its lock prefix ('!', '*')
+    and hash scheme ('$6$', '$y$', ...), 'x' for a shadowed entry, '?' for
+    any other non-empty value and '' for an empty one.
+    """
+    rest = value.lstrip("!*")
+    lock = value[:len(value) - len(rest)]
+    if rest.startswith("$"):
+        scheme = rest.split("$", 2)
+        rest = f"${scheme[1]}$" if len(scheme) == 3 else "$?"
+    elif rest and rest != "x":
+        rest = "?"
+    return lock + rest
+
+
+def _split_colon_file(lines, fields):
+    """Rows of a colon-separated database, padded/truncated to `fields` columns."""
+    rows = []
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        parts = line.split(":")
+        rows.append((parts + [""] * fields)[:fields])
+    return rows
+
+
+def _split_members(value):
+    return tuple(m for m in value.split(",") if m)
+
+
+class AccountDatabase:
+    """
+    /etc/passwd, /etc/shadow, /etc/group and /etc/gshadow parsed once and
+    indexed by name, by UID/GID and by group membership. Name and id
+    indexes map to lists so duplicates stay visible. Files that could not
+    be read are kept in `unreadable`; the shadow and gshadow data then
+    raise instead of looking empty.
+    """
+
+    def __init__(self, passwd=PASSWD_FILE, shadow=SHADOW_FILE, group=GROUP_FILE, gshadow=GSHADOW_FILE,
+                 login_defs=LOGIN_DEFS, shells=SHELLS_FILE, useradd=USERADD_DEFAULTS):
+        self.paths = [passwd, shadow, group, gshadow, login_defs, shells, useradd]
+        self.unreadable = {}
+        self.users = []
+        self._shadow = []
+        self.groups = []
+        self._gshadow = []
+        self.users_by_name = collections.defaultdict(list)
+        self.users_by_uid = collections.defaultdict(list)
+        self.users_by_gid = collections.defaultdict(list)
+        self._shadow_by_name = {}
+        self.groups_by_name = collections.defaultdict(list)
+        self.groups_by_gid = collections.defaultdict(list)
+        self._gshadow_by_name = {}
+        self.group_members = collections.defaultdict(set)
+        self.login_defs = {}
+        self.shells = []
+        self.useradd = {}
+
+    def _lines(self, path):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read().splitlines()
+        except OSError as e:
+            self.unreadable[path] = e.strerror or str(e)
+            return []
+
+    def _readable(self, path, data):
+        if path in self.unreadable:
+            raise OSError(f"cannot read {path}: {self.unreadable[path]}")
+        return data
+
+    @property
+    def shadow(self):
+        return self._readable(self.paths[1], self._shadow)
+
+    @property
+    def shadow_by_name(self):
+        return self._readable(self.paths[1], self._shadow_by_name)
+
+    @property
+    def gshadow(self):
+        return self._readable(self.paths[3], self._gshadow)
+
+    @property
+    def gshadow_by_name(self):
+        return self._readable(self.paths[3], self._gshadow_by_name)
+
+    def load(self):
+        passwd, shadow, group, gshadow, login_defs, shells, useradd = self.paths
+        for name, password, uid, gid, gecos, home, shell in _split_colon_file(self._lines(passwd), 7):
+            entry = PasswdEntry(name, _password_marker(password), _to_int(uid), _to_int(gid), gecos, home, shell)
+            self.users.append(entry)
+            self.users_by_name[name].append(entry)
+            self.users_by_uid[entry.uid].append(entry)
+            self.users_by_gid[entry.gid].append(entry)
+        for row in _split_colon_file(self._lines(shadow), 9):
+            entry = ShadowEntry(row[0], _password_marker(row[1]), *(_to_int(v) for v in row[2:8]))
+            self._shadow.append(entry)
+            self._shadow_by_name[entry.name] = entry
+        for name, password, gid, members in _split_colon_file(self._lines(group), 4):
+            entry = GroupEntry(name, _password_marker(password), _to_int(gid), _split_members(members))
+            self.groups.append(entry)
+            self.groups_by_name[name].append(entry)
+            self.groups_by_gid[entry.gid].append(entry)
+            self.group_members[name].update(entry.members)
+        for name, password, admins, members in _split_colon_file(self._lines(gshadow), 4):
+            entry = GshadowEntry(name, _password_marker(password), _split_members(admins), _split_members(members))
+            self._gshadow.append(entry)
+            self._gshadow_by_name[name] = entry
+        for line in _read_lines(login_defs):
+            parts = line.split("#", 1)[0].split()
+            if len(parts) >= 2:
+                self.login_defs[parts[0]] = parts[1]
+        self.shells = [line.strip() for line in _read_lines(shells)
+                       if line.strip() and not line.strip().startswith("#")]
+        self.useradd = _parse_module_config(_read_lines(useradd))
+        return self
+
+    def user(self, name):
+        entries = self.users_by_name.get(name)
+        return entries[0] if entries else None
+
+    def members_of(self, group_name):
+        """Supplementary members plus users whose primary group it is."""
+        members = set(self.group_members.get(group_name, ()))
+        for group in self.groups_by_name.get(group_name, []):
+            members.update(u.name for u in self.users_by_gid.get(group.gid, []))
+        return members
+
+    def uid_min(self):
+        return _to_int(self.login_defs.get("UID_MIN"), 1000)
+
+    def valid_shells(self):
+        """Shells from /etc/shells that allow a login."""
+        return [s for s in self.shells if not s.endswith(("/nologin", "/false"))]
+
+    def has_password(self, name):
+        """True if the shadow entry holds a usable (hashed) password."""
+        entry = self.shadow_by_name.get(name)
+        return bool(entry) and entry.password.startswith("$")
+
+    def is_locked(self, name):
+        entry = self.shadow_by_name.get(name)
+        return bool(entry) and entry.password.startswith(("!", "*"))
+
+    def interactive_users(self):
+        """Users with a valid login shell."""
+        shells = set(self.valid_shells())
+        return [u for u in self.users if u.shell in shells]
+
+    @property
+    def ids(self):
+        """(known UIDs, known GIDs) for ownership checks."""
+        return set(self.users_by_uid), set(self.groups_by_gid)
+
+
+def get_account_database():
+    """Return the shared AccountDatabase, re-parsed only when one of its files changes."""
+    database = AccountDatabase()
+    return _cached_fact("accounts", database.paths, database.load, persist=True)
+
+
+def _account_rule(label, builder):
+    """builder(db) -> list of offending strings; empty means compliant."""
+    try:
+        offenders = builder(get_account_database())
+        if offenders:
+            shown = ", ".join(offenders[:20]) + (f" (+{len(offenders) - 20} more)" if len(offenders) > 20 else "")
+            return _check_result(False, f"{label}: {shown}", f"{len(offenders)} found")
+        return _check_result(True, f"{label}: none", "Compliant")
+    except Exception as e:
+        return _error_result(e)
+
+
+def _duplicates(index):
+    return sorted(str(key) for key, entries in index.items() if len(entries) > 1)
+
+
+def _aging_rule(label, defs_key, field, predicate):
+    """Check a login.defs default and the matching shadow field of every user with a password."""
+    def builder(db):
+        offenders = []
+        default = _to_int(db.login_defs.get(defs_key))
+        if default is None or not predicate(default):
+            offenders.append(f"{defs_key}={db.login_defs.get(defs_key, 'unset')} in login.defs")
+        for entry in db.shadow:
+            if db.has_password(entry.name):
+                value = getattr(entry, field)
+                if value is None or not predicate(value):
+                    offenders.append(f"{entry.name} ({field}={value})")
+        return offenders
+    return _account_rule(label, builder)
+
+
+def password_expiration():
+    """Ensure PASS_MAX_DAYS and every user's maximum password age is 1-365 days."""
+    return _aging_rule("Password expiration not within 365 days", "PASS_MAX_DAYS", "max_days",
+                       lambda v: 0 < v <= 365)
+
+
+def password_min_days():
+    """Ensure PASS_MIN_DAYS and every user's minimum password age is at least 1 day."""
+    return _aging_rule("Minimum password days below 1", "PASS_MIN_DAYS", "min_days", lambda v: v >= 1)
+
+
+def password_warn_days():
+    """Ensure PASS_WARN_AGE and every user's warning period is at least 7 days."""
+    return _aging_rule("Password warning days below 7", "PASS_WARN_AGE", "warn_days", lambda v: v >= 7)
+
+
+def password_hashing_algorithm():
+    """Ensure ENCRYPT_METHOD is SHA512 or YESCRYPT and stored hashes use it."""
+    def builder(db):
+        offenders = []
+        method = db.login_defs.get("ENCRYPT_METHOD", "unset")
+        if method.upper() not in ("SHA512", "YESCRYPT"):
+            offenders.append(f"ENCRYPT_METHOD={method}")
+        for entry in db.shadow:
+            if db.has_password(entry.name) and not entry.password.startswith(("$6$", "$y$")):
+                offenders.append(f"{entry.name} (weak hash)")
+        return offenders
+    return _account_rule("Weak password hashing", builder)
+
+
+def inactive_password_lock():
+    """Ensure useradd INACTIVE and every user's inactivity lock is 0-45 days."""
+    def builder(db):
+        offenders = []
+        default = _to_int(db.useradd.get("INACTIVE"), -1)
+        if not 0 <= default <= 45:
+            offenders.append(f"useradd INACTIVE={default}")
+        for entry in db.shadow:
+            if db.has_password(entry.name) and (entry.inactive is None or not 0 <= entry.inactive <= 45):
+                offenders.append(f"{entry.name} (inactive={entry.inactive})")
+        return offenders
+    return _account_rule("Inactive password lock not within 45 days", builder)
+
+
+def last_password_change_past():
+    """Ensure every user's last password change date is in the past."""
+    today = _today()
+    return _account_rule("Last password change in the future", lambda db: [
+        e.name for e in db.shadow if e.last_change is not None and e.last_change > today])
+
+
+def root_only_uid0():
+    """Ensure root is the only UID 0 account."""
+    return _account_rule("Other UID 0 accounts", lambda db: [
+        u.name for u in db.users_by_uid.get(0, []) if u.name != "root"])
+
+
+def root_only_gid0_account():
+    """Ensure root is the only account with primary GID 0."""
+    allowed = {"root", "sync", "shutdown", "halt", "operator"}
+    return _account_rule("Other GID 0 accounts", lambda db: [
+        u.name for u in db.users_by_gid.get(0, []) if u.name not in allowed])
+
+
+def root_only_gid0_group():
+    """Ensure group root is the only GID 0 group."""
+    return _account_rule("Other GID 0 groups", lambda db: [
+        g.name for g in db.groups_by_gid.get(0, []) if g.name != "root"])
+
+
+def root_account_access():
+    """Ensure the root account has a password set or is locked."""
+    def builder(db):
+        entry = db.shadow_by_name.get("root")
+        if entry is None:
+            return ["root missing from /etc/shadow"]
+        if not (db.has_password("root") or db.is_locked("root")):
+            return ["root has no password and is not locked"]
+        return []
+    return _account_rule("Root account access", builder)
+
+
+def system_accounts_no_login_shell():
+    """Ensure system accounts (UID < UID_MIN) do not have a valid login shell."""
+    exempt = {"root", "halt", "sync", "shutdown", "nfsnobody"}
+
+    def builder(db):
+        shells = set(db.valid_shells())
+        uid_min = db.uid_min()
+        return [f"{u.name} ({u.shell})" for u in db.users
+                if u.name not in exempt and u.uid is not None
+                and (u.uid < uid_min or u.uid == 65534) and u.shell in shells]
+    return _account_rule("System accounts with a login shell", builder)
+
+
+def accounts_without_shell_locked():
+    """Ensure accounts without a valid login shell are locked."""
+    def builder(db):
+        shells = set(db.valid_shells())
+        return [u.name for u in db.users
+                if u.name != "root" and u.shell not in shells and not db.is_locked(u.name)]
+    return _account_rule("Unlocked accounts without a login shell", builder)
+
+
+def nologin_not_in_shells():
+    """Ensure nologin is not listed in /etc/shells."""
+    return _account_rule("nologin listed in /etc/shells", lambda db: [
+        s for s in db.shells if s.endswith("/nologin")])
+
+
+def shadowed_passwords():
+    """Ensure every /etc/passwd account uses shadowed passwords."""
+    return _account_rule("Accounts without shadowed passwords", lambda db: [
+        u.name for u in db.users if u.password != "x"])
+
+
+def shadow_password_fields_not_empty():
+    """Ensure no /etc/shadow password field is empty."""
+    return _account_rule("Accounts with empty passwords", lambda db: [
+        e.name for e in db.shadow if e.password == ""])
+
+
+def passwd_groups_exist():
+    """Ensure every GID in /etc/passwd exists in /etc/group."""
+    return _account_rule("Users with a missing group", lambda db: [
+        f"{u.name} (gid {u.gid})" for u in db.users if u.gid not in db.groups_by_gid])
+
+
+def shadow_group_empty():
+    """Ensure the shadow group has no members."""
+    return _account_rule("Members of the shadow group", lambda db: sorted(db.members_of("shadow")))
+
+
+def duplicate_uids():
+    """Ensure no duplicate UIDs exist."""
+    return _account_rule("Duplicate UIDs", lambda db: _duplicates(db.users_by_uid))
+
+
+def duplicate_gids():
+    """Ensure no duplicate GIDs exist."""
+    return _account_rule("Duplicate GIDs", lambda db: _duplicates(db.groups_by_gid))
+
+
+def duplicate_usernames():
+    """Ensure no duplicate user names exist."""
+    return _account_rule("Duplicate user names", lambda db: _duplicates(db.users_by_name))
+
+
+def duplicate_group_names():
+    """Ensure no duplicate group names exist."""
+    return _account_rule("Duplicate group names", lambda db: _duplicates(db.groups_by_name))
+
+
+# ----------------------- auditd rule compiler -----------------------
+
+AUDIT_RULES_DIR = "/etc/audit/rules.d"
+# Seconds an 'auditctl -l' snapshot is reused
+AUDIT_RUNNING_MAX_AGE = 300
+
+_AUDIT_FIELD_RE = re.compile(r"^([A-Za-z0-9_]+)(!=|>=|<=|&=|=|<|>|&)(.*)$")
+_AUID_UNSET = ("-1", "4294967295", "unset")
+
+
+def _normalize_audit_field(name, op, value):
+    if name in ("auid", "uid", "euid", "suid", "fsuid", "loginuid") and value in _AUID_UNSET:
+        value = "unset"
+    if name in ("path", "dir") and len(value) > 1:
+        value = value.rstrip("/")
+    if name == "perm":
+        value = "".join(sorted(value))
+    return (name, op, value)
+
+
+class AuditRule:
+    """
+    Canonical form of one audit rule. File watches (-w, or -F path/dir with
+    -F perm and no syscalls) become kind 'watch'; syscall rules keep their
+    list/action, arch, syscall set and remaining fields; -e/-b/-f and similar
+    become kind 'control'. The key never takes part in matching.
+    """
+
+    def __init__(self, kind, list_action=None, syscalls=(), fields=(), key=None, source=""):
+        self.kind = kind
+        self.list_action = list_action
+        self.syscalls = frozenset(syscalls)
+        self.fields = frozenset(fields)
+        self.key = key
+        self.source = source
+
+    def field(self, name):
+        for field_name, _, value in self.fields:
+            if field_name == name:
+                return value
+        return None
+
+    def atoms(self):
+        """
+        Decompose into hashable atoms: one per (path, permission) for watches
+        and one per (arch, syscall) for syscall rules, so rule sets can be
+        compared with plain set operations.
+        """
+        if self.kind == "control":
+            return {("control",) + tuple(sorted(self.fields))}
+        if self.kind == "watch":
+            target = self.field("path") or self.field("dir")
+            rest = frozenset(f for f in self.fields if f[0] not in ("path", "dir", "perm"))
+            return {("watch", target, perm, rest) for perm in (self.field("perm") or "rwxa")}
+        arch = self.field("arch")
+        rest = frozenset(f for f in self.fields if f[0] != "arch")
+        return {("syscall", self.list_action, arch, syscall, rest) for syscall in (self.syscalls or {"all"})}
+
+    def __repr__(self):
+        return f"AuditRule({self.kind} {self.list_action or ''} {sorted(self.syscalls)} {sorted(self.fields)} key={self.key})"
+
+
+def parse_audit_rule(line, source=""):
+    """Compile one auditctl-syntax line into an AuditRule (None for comments/blank)."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    tokens = line.split()
+    list_action = None
+    syscalls = set()
+    fields = []
+    key = None
+    watch = None
+    perms = None
+    controls = []
+    i = 0
+    while i < len(tokens):
+        opt = tokens[i]
+        arg = tokens[i + 1] if i + 1 < len(tokens) else ""
+        if opt in ("-a", "-A"):
+            list_action = ",".join(sorted(arg.split(",")))
+            i += 2
+        elif opt == "-w":
+            watch = arg
+            i += 2
+        elif opt == "-p":
+            perms = arg
+            i += 2
+        elif opt == "-k":
+            key = arg
+            i += 2
+        elif opt == "-S":
+            syscalls.update(s for s in arg.split(",") if s)
+            i += 2
+        elif opt in ("-F", "-C"):
+            match = _AUDIT_FIELD_RE.match(arg)
+            if match:
+                name, op, value = match.groups()
+                if opt == "-F" and name in ("key", "filterkey"):
+                    key = value
+                elif opt == "-C":
+                    # auditctl -l may list 'euid!=uid' as 'uid!=euid'
+                    if op in ("=", "!="):
+                        name, value = sorted((name, value))
+                    fields.append((f"C:{name}", op, value))
+                else:
+                    fields.append(_normalize_audit_field(name, op, value))
+            i += 2
+        elif opt.startswith("-"):
+            controls.append((opt, arg if arg and not arg.startswith("-") else ""))
+            i += 2 if arg and not arg.startswith("-") else 1
+        else:
+            i += 1
+    if watch is not None:
+        fields.append(_normalize_audit_field("path", "=", watch))
+        fields.append(_normalize_audit_field("perm", "=", perms or "rwxa"))
+        return AuditRule("watch", "always,exit", (), fields, key, source)
+    if list_action is None:
+        if not controls:
+            return None
+        return AuditRule("control", None, (), controls, key, source)
+    # auditctl -l lists path rules with '-S all'
+    syscalls.discard("all")
+    names = {f[0] for f in fields}
+    if not syscalls and ("path" in names or "dir" in names) and "perm" in names:
+        return AuditRule("watch", list_action, (), fields, key, source)
+    return AuditRule("syscall", list_action, syscalls, fields, key, source)
+
+
+class AuditRuleset:
+    """A compiled set of audit rules with its atom set for membership tests."""
+
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+        self.atoms = set()
+        for rule in self.rules:
+            self.atoms.update(rule.atoms())
+
+    @classmethod
+    def from_lines(cls, lines, source=""):
+        rules = []
+        for lineno, line in enumerate(lines, 1):
+            rule = parse_audit_rule(line, f"{source}:{lineno}")
+            if rule is not None:
+                rules.append(rule)
+        return cls(rules)
+
+    def missing(self, required):
+        """Atoms of the required ruleset that this ruleset does not contain."""
+        return required.atoms - self.atoms
+
+    def controls(self):
+        return [rule for rule in self.rules if rule.kind == "control"]
+
+
+def load_disk_audit_rules(rules_dir=AUDIT_RULES_DIR):
+    """Compile /etc/audit/rules.d/*.rules in the order augenrules merges them."""
+    rules = []
+    for path in _list_files(rules_dir, "*.rules"):
+        rules.extend(AuditRuleset.from_lines(_read_lines(path), path).rules)
+    return AuditRuleset(rules)
+
+
+def load_running_audit_rules():
+    """Compile the loaded kernel ruleset from one 'auditctl -l', or None if unavailable."""
+    try:
+        result = subprocess.run(["auditctl", "-l"], capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    lines = [] if result.stdout.strip() == "No rules" else result.stdout.splitlines()
+    return AuditRuleset.from_lines(lines, "auditctl")
+
+
+def get_audit_rules(rules_dir=AUDIT_RULES_DIR):
+    """(on-disk ruleset, running ruleset or None), each compiled once and shared."""
+    paths = lambda: [rules_dir] + _list_files(rules_dir, "*.rules")
+    disk = _cached_fact(f"audit-disk:{rules_dir}", paths, lambda: load_disk_audit_rules(rules_dir),
+                        persist=True)
+    running = _cached_fact(f"audit-running:{rules_dir}", paths, load_running_audit_rules,
+                           max_age=AUDIT_RUNNING_MAX_AGE)
+    return disk, running
+
+
+def _audit_arches():
+    return ["b64", "b32"] if platform.machine() in ("x86_64", "aarch64", "ppc64le", "s390x") else ["b32"]
+
+
+def _audit_syscall_rules(syscalls, filters=""):
+    """Required syscall rule lines for every supported arch."""
+    return [f"-a always,exit -F arch={arch} -S {syscalls} {filters}".strip() for arch in _audit_arches()]
+
+
+def _audit_user_filter():
+    return f"-F auid>={get_account_database().uid_min()} -F auid!=unset"
+
+
+def _audit_exec_rule(path):
+    return f"-a always,exit -F path={path} -F perm=x {_audit_user_filter()}"
+
+
+def _describe_audit_atom(atom):
+    if atom[0] == "watch":
+        return f"{atom[1]} -p {atom[2]}"
+    if atom[0] == "syscall":
+        return f"{atom[2] or 'any arch'} -S {atom[3]}"
+    return " ".join(" ".join(part) for part in atom[1:])
+
+
+def _audit_requirement(label, lines):
+    """Pass when every atom of the required lines is in the on-disk and running rules."""
+    try:
+        required = AuditRuleset.from_lines(lines() if callable(lines) else lines, "required")
+        disk, running = get_audit_rules()
+        missing = {"on disk": disk.missing(required)}
+        if running is not None:
+            missing["running"] = running.missing(required)
+        gaps = []
+        for where, atoms in missing.items():
+            for atom in sorted(atoms, key=str)[:5]:
+                gaps.append(f"{where}: {_describe_audit_atom(atom)}")
+        if gaps:
+            return _check_result(False, f"{label} not fully audited: {'; '.join(gaps)}", "Missing rules")
+        scope = "on disk and running" if running is not None else "on disk (running rules unavailable)"
+        return _check_result(True, f"{label} audited {scope}", "Configured")
+    except Exception as e:
+        return _error_result(e)
+
+
+def _sudo_log_audit_lines():
+    logfile = get_sudoers_model().setting("logfile")
+    return [f"-w {logfile if isinstance(logfile, str) and logfile else '/var/log/sudo.log'} -p wa"]
+
+
+# script_key -> (label, required rule lines or a callable building them)
+AUDIT_REQUIREMENTS = {
+    "audit_sudoers_changes": ("sudoers changes", ["-w /etc/sudoers -p wa", "-w /etc/sudoers.d -p wa"]),
+    "audit_user_emulation": ("Actions as another user", lambda: [
+        f"-a always,exit -F arch={arch} -C euid!=uid -F auid!=unset -S execve" for arch in _audit_arches()]),
+    "audit_sudo_log": ("sudo log file", _sudo_log_audit_lines),
+    "audit_time_change": ("Date and time changes", lambda: (
+        _audit_syscall_rules("adjtimex,settimeofday")
+        + _audit_syscall_rules("clock_settime", "-F a0=0x0")
+        + ["-w /etc/localtime -p wa"])),
+    "audit_network_environment": ("Network environment changes", lambda: (
+        _audit_syscall_rules("sethostname,setdomainname")
+        + [f"-w {path} -p wa" for path in
+           ("/etc/issue", "/etc/issue.net", "/etc/hosts", "/etc/networks", "/etc/network", "/etc/netplan")])),
+    "audit_privileged_commands": ("Privileged commands", lambda: [
+        _audit_exec_rule(path) for path in sorted(get_filesystem_scan().suid_sgid_paths)]),
+    "audit_unsuccessful_access": ("Unsuccessful file access", lambda: [
+        line for exit_code in ("-EACCES", "-EPERM")
+        for line in _audit_syscall_rules("creat,open,openat,truncate,ftruncate",
+                                         f"-F exit={exit_code} {_audit_user_filter()}")]),
+    "audit_identity_changes": ("User/group modifications", [
+        f"-w {path} -p wa" for path in ("/etc/group", "/etc/passwd", "/etc/gshadow", "/etc/shadow",
+                                        "/etc/security/opasswd", "/etc/nsswitch.conf", "/etc/pam.conf",
+                                        "/etc/pam.d")]),
+    "audit_permission_changes": ("DAC permission changes", lambda: (
+        _audit_syscall_rules("chmod,fchmod,fchmodat", _audit_user_filter())
+        + _audit_syscall_rules("chown,fchown,lchown,fchownat", _audit_user_filter())
+        + _audit_syscall_rules("setxattr,lsetxattr,fsetxattr,removexattr,lremovexattr,fremovexattr",
+                               _audit_user_filter()))),
+    "audit_mounts": ("File system mounts", lambda: _audit_syscall_rules("mount", _audit_user_filter())),
+    "audit_session_initiation": ("Session initiation", [
+        "-w /var/run/utmp -p wa", "-w /var/log/wtmp -p wa", "-w /var/log/btmp -p wa"]),
+    "audit_logins": ("Login and logout", ["-w /var/log/lastlog -p wa", "-w /var/run/faillock -p wa"]),
+    "audit_file_deletion": ("File deletion", lambda: _audit_syscall_rules(
+        "unlink,unlinkat,rename,renameat", _audit_user_filter())),
+    "audit_mac_changes": ("Mandatory Access Control changes", [
+        "-w /etc/apparmor -p wa", "-w /etc/apparmor.d -p wa"]),
+    "audit_chcon": ("chcon", lambda: [_audit_exec_rule("/usr/bin/chcon")]),
+    "audit_setfacl": ("setfacl", lambda: [_audit_exec_rule("/usr/bin/setfacl")]),
+    "audit_chacl": ("chacl", lambda: [_audit_exec_rule("/usr/bin/chacl")]),
+    "audit_usermod": ("usermod", lambda: [_audit_exec_rule("/usr/sbin/usermod")]),
+    "audit_kernel_modules": ("Kernel module changes", lambda: (
+        [f"-a always,exit -F arch={_audit_arches()[0]} "
+         f"-S init_module,finit_module,delete_module,create_module,query_module {_audit_user_filter()}",
+         _audit_exec_rule("/usr/bin/kmod")])),
+}
+
+
+def audit_sudoers_changes():
+    """Ensure changes to sudoers are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_sudoers_changes"])
+
+
+def audit_user_emulation():
+    """Ensure actions as another user are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_user_emulation"])
+
+
+def audit_sudo_log():
+    """Ensure modifications of the sudo log file (Defaults logfile) are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_sudo_log"])
+
+
+def audit_time_change():
+    """Ensure date and time changes are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_time_change"])
+
+
+def audit_network_environment():
+    """Ensure changes to the network environment are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_network_environment"])
+
+
+def audit_privileged_commands():
+    """Ensure use of every SUID/SGID program found on local filesystems is collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_privileged_commands"])
+
+
+def audit_unsuccessful_access():
+    """Ensure unsuccessful file access attempts are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_unsuccessful_access"])
+
+
+def audit_identity_changes():
+    """Ensure user and group modifications are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_identity_changes"])
+
+
+def audit_permission_changes():
+    """Ensure discretionary access control changes are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_permission_changes"])
+
+
+def audit_mounts():
+    """Ensure successful file system mounts are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_mounts"])
+
+
+def audit_session_initiation():
+    """Ensure session initiation information is collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_session_initiation"])
+
+
+def audit_logins():
+    """Ensure login and logout events are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_logins"])
+
+
+def audit_file_deletion():
+    """Ensure file deletion events by users are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_file_deletion"])
+
+
+def audit_mac_changes():
+    """Ensure changes to AppArmor policy are collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_mac_changes"])
+
+
+def audit_chcon():
+    """Ensure use of chcon is collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_chcon"])
+
+
+def audit_setfacl():
+    """Ensure use of setfacl is collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_setfacl"])
+
+
+def audit_chacl():
+    """Ensure use of chacl is collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_chacl"])
+
+
+def audit_usermod():
+    """Ensure use of usermod is collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_usermod"])
+
+
+def audit_kernel_modules():
+    """Ensure kernel module loading and unloading is collected."""
+    return _audit_requirement(*AUDIT_REQUIREMENTS["audit_kernel_modules"])
+
+
+def audit_immutable():
+    """Ensure the on-disk audit configuration ends with '-e 2'."""
+    try:
+        disk, _ = get_audit_rules()
+        controls = [dict(rule.fields) for rule in disk.controls() if any(f[0] == "-e" for f in rule.fields)]
+        last = controls[-1].get("-e") if controls else None
+        return _check_result(last == "2", f"Audit configuration immutable flag: -e {last or 'not set'}",
+                             f"-e {last}" if last else "Not set")
+    except Exception as e:
+        return _error_result(e)
+
+
+def audit_running_matches_disk():
+    """Ensure the running audit rules equal the on-disk rules (set difference of atoms)."""
+    try:
+        disk, running = get_audit_rules()
+        if running is None:
+            return _check_result(False, "Running audit rules unavailable (auditctl -l failed)", "Unknown")
+        # Control settings such as -D/-b/-e are not listed by auditctl -l
+        disk_atoms = {atom for atom in disk.atoms if atom[0] != "control"}
+        running_atoms = {atom for atom in running.atoms if atom[0] != "control"}
+        only_disk, only_running = disk_atoms - running_atoms, running_atoms - disk_atoms
+        if only_disk or only_running:
+            return _check_result(False, f"Rules differ: {len(only_disk)} only on disk, "
+                                        f"{len(only_running)} only running", "Different")
+        return _check_result(True, "Running and on-disk audit rules are identical", "Identical")
+    except Exception as e:
+        return _error_result(e)
+
+
+# ----------------------- Batch permission evaluator -----------------------
+
+AUDITD_CONF = "/etc/audit/auditd.conf"
+AUDIT_TOOLS = ["/sbin/auditctl", "/sbin/aureport", "/sbin/ausearch", "/sbin/autrace", "/sbin/auditd",
+               "/sbin/augenrules"]
+# Seconds the batch stat results are reused across rules
+PERMISSION_CACHE_MAX_AGE = 60
+
+
+def _audit_log_dir():
+    """Directory of the auditd log_file (default /var/log/audit)."""
+    options = _parse_module_config(_read_lines(AUDITD_CONF))
+    return os.path.dirname(options.get("log_file") or "/var/log/audit/audit.log")
+
+
+def _spec(paths, mode=None, owner=None, group=None, required=False, kind=None, group_mode=None):
+    """
+    One permission assertion. paths may hold globs or callables returning
+    paths; mode is the most permissive allowed mode; owner/group are tuples
+    of allowed names; None leaves that attribute unchecked.
+    """
+    return {"paths": paths, "mode": mode, "owner": owner, "group": group, "required": required,
+            "kind": kind, "group_mode": group_mode or {}}
+
+
+ROOT = ("root",)
+ROOT_OR_SHADOW = ("root", "shadow")
+CRON_DIRS = ["/etc/cron.hourly", "/etc/cron.daily", "/etc/cron.weekly", "/etc/cron.monthly", "/etc/cron.d"]
+
+PERMISSION_SPECS = {
+    "bootloader_config_permissions": _spec(["/boot/grub/grub.cfg"], 0o600, ROOT, ROOT),
+    "motd_permissions": _spec(["/etc/motd"], 0o644, ROOT, ROOT),
+    "issue_permissions": _spec(["/etc/issue"], 0o644, ROOT, ROOT),
+    "issue_net_permissions": _spec(["/etc/issue.net"], 0o644, ROOT, ROOT),
+    "crontab_permissions": _spec(["/etc/crontab"], 0o600, ROOT, ROOT),
+    "cron_hourly_permissions": _spec(["/etc/cron.hourly"], 0o700, ROOT, ROOT, kind="dir"),
+    "cron_daily_permissions": _spec(["/etc/cron.daily"], 0o700, ROOT, ROOT, kind="dir"),
+    "cron_weekly_permissions": _spec(["/etc/cron.weekly"], 0o700, ROOT, ROOT, kind="dir"),
+    "cron_monthly_permissions": _spec(["/etc/cron.monthly"], 0o700, ROOT, ROOT, kind="dir"),
+    "cron_d_permissions": _spec(["/etc/cron.d"], 0o700, ROOT, ROOT, kind="dir"),
+    "crontab_restricted": _spec(["/etc/cron.allow"], 0o640, ROOT, ("root", "crontab"), required=True),
+    "sshd_config_permissions": _spec(["/etc/ssh/sshd_config", "/etc/ssh/sshd_config.d/*.conf"],
+                                     0o600, ROOT, ROOT),
+    "ssh_private_key_permissions": _spec(["/etc/ssh/ssh_host_*_key"], 0o600, ROOT, ("root", "ssh_keys", "_ssh"),
+                                         group_mode={"ssh_keys": 0o640, "_ssh": 0o640}),
+    "ssh_public_key_permissions": _spec(["/etc/ssh/ssh_host_*_key.pub"], 0o644, ROOT, ROOT),
+    "audit_log_files_mode": _spec([lambda: os.path.join(_audit_log_dir(), "*")], mode=0o640),
+    "audit_log_files_owner": _spec([lambda: os.path.join(_audit_log_dir(), "*")], owner=ROOT),
+    "audit_log_files_group": _spec([lambda: os.path.join(_audit_log_dir(), "*")], group=("root", "adm")),
+    "audit_log_directory_mode": _spec([_audit_log_dir], mode=0o750, kind="dir", required=True),
+    "audit_config_files_mode": _spec(["/etc/audit/*.conf", "/etc/audit/rules.d/*.rules"], mode=0o640),
+    "audit_config_files_owner": _spec(["/etc/audit/*.conf", "/etc/audit/rules.d/*.rules"], owner=ROOT),
+    "audit_config_files_group": _spec(["/etc/audit/*.conf", "/etc/audit/rules.d/*.rules"], group=ROOT),
+    "audit_tools_mode": _spec(AUDIT_TOOLS, mode=0o755),
+    "audit_tools_owner": _spec(AUDIT_TOOLS, owner=ROOT),
+    "audit_tools_group": _spec(AUDIT_TOOLS, group=ROOT),
+    "etc_passwd_permissions": _spec(["/etc/passwd"], 0o644, ROOT, ROOT, required=True),
+    "etc_passwd_backup_permissions": _spec(["/etc/passwd-"], 0o644, ROOT, ROOT),
+    "etc_group_permissions": _spec(["/etc/group"], 0o644, ROOT, ROOT, required=True),
+    "etc_group_backup_permissions": _spec(["/etc/group-"], 0o644, ROOT, ROOT),
+    "etc_shadow_permissions": _spec(["/etc/shadow"], 0o640, ROOT, ROOT_OR_SHADOW, required=True),
+    "etc_shadow_backup_permissions": _spec(["/etc/shadow-"], 0o640, ROOT, ROOT_OR_SHADOW),
+    "etc_gshadow_permissions": _spec(["/etc/gshadow"], 0o640, ROOT, ROOT_OR_SHADOW, required=True),
+    "etc_gshadow_backup_permissions": _spec(["/etc/gshadow-"], 0o640, ROOT, ROOT_OR_SHADOW),
+    "etc_shells_permissions": _spec(["/etc/shells"], 0o644, ROOT, ROOT),
+    "opasswd_permissions": _spec(["/etc/security/opasswd", "/etc/security/opasswd.old"], 0o600, ROOT, ROOT),
+}
+
+
+class PermissionEvaluator:
+    """
+    Evaluates every permission spec in one batch: globs are expanded once,
+    every distinct path is stat'ed once, and results are kept per path.
+    """
+
+    def __init__(self, specs=None):
+        self.specs = specs if specs is not None else PERMISSION_SPECS
+        self.stats = {}
+        self.paths = {}
+        self.results = {}
+
+    def _expand(self, spec):
+        paths = []
+        for pattern in spec["paths"]:
+            pattern = pattern() if callable(pattern) else pattern
+            if glob.has_magic(pattern):
+                paths.extend(sorted(p for p in glob.glob(pattern) if os.path.isfile(p)))
+            else:
+                paths.append(pattern)
+        return paths
+
+    def run(self):
+        for name, spec in self.specs.items():
+            self.paths[name] = self._expand(spec)
+        for path in {p for paths in self.paths.values() for p in paths}:
+            try:
+                self.stats[path] = os.stat(path)
+            except OSError:
+                self.stats[path] = None
+        db = get_account_database()
+        for name, spec in self.specs.items():
+            self.results[name] = [self._evaluate(spec, path, db) for path in self.paths[name]]
+        return self
+
+    def _evaluate(self, spec, path, db):
+        """(path, passed, shown, problems) for one path."""
+        st = self.stats.get(path)
+        if st is None:
+            return (path, not spec["required"], "missing", ["does not exist"] if spec["required"] else [])
+        owner = db.users_by_uid.get(st.st_uid)
+        group = db.groups_by_gid.get(st.st_gid)
+        owner_name = owner[0].name if owner else str(st.st_uid)
+        group_name = group[0].name if group else str(st.st_gid)
+        mode = stat.S_IMODE(st.st_mode)
+        problems = []
+        allowed = spec["group_mode"].get(group_name, spec["mode"])
+        if allowed is not None and mode & ~allowed:
+            problems.append(f"mode {mode:04o} exceeds {allowed:04o}")
+        if spec["owner"] and owner_name not in spec["owner"]:
+            problems.append(f"owner {owner_name}")
+        if spec["group"] and group_name not in spec["group"]:
+            problems.append(f"group {group_name}")
+        if spec["kind"] == "dir" and not stat.S_ISDIR(st.st_mode):
+            problems.append("not a directory")
+        return (path, not problems, f"{mode:04o} {owner_name}:{group_name}", problems)
+
+
+def get_permission_results():
+    """Run (or reuse) the shared batch evaluation of PERMISSION_SPECS."""
+    return _cached_fact("permissions", [], lambda: PermissionEvaluator().run(),
+                        max_age=PERMISSION_CACHE_MAX_AGE)
+
+
+def _permission_rule(name):
+    try:
+        results = get_permission_results().results[name]
+        failures = [f"{path} ({', '.join(problems)})" for path, passed, _, problems in results if not passed]
+        present = [f"{path} {shown}" for path, _, shown, _ in results if shown != "missing"]
+        if failures:
+            return _check_result(False, f"Incorrect permissions: {'; '.join(failures[:10])}", f"{len(failures)} failed")
+        if not present:
+            return _check_result(True, "No files to check (not present)", "Not present")
+        shown = "; ".join(present[:10]) + (f" (+{len(present) - 10} more)" if len(present) > 10 else "")
+        return _check_result(True, f"Permissions correct: {shown}", "Compliant")
+    except Exception as e:
+        return _error_result(e)
+
+
+def bootloader_config_permissions():
+    """Ensure access to the bootloader config is configured."""
+    return _permission_rule("bootloader_config_permissions")
+
+
+def motd_permissions():
+    """Ensure access to /etc/motd is configured."""
+    return _permission_rule("motd_permissions")
+
+
+def issue_permissions():
+    """Ensure access to /etc/issue is configured."""
+    return _permission_rule("issue_permissions")
+
+
+def issue_net_permissions():
+    """Ensure access to /etc/issue.net is configured."""
+    return _permission_rule("issue_net_permissions")
+
+
+def crontab_permissions():
+    """Ensure permissions on /etc/crontab are configured."""
+    return _permission_rule("crontab_permissions")
+
+
+def cron_hourly_permissions():
+    """Ensure permissions on /etc/cron.hourly are configured."""
+    return _permission_rule("cron_hourly_permissions")
+
+
+def cron_daily_permissions():
+    """Ensure permissions on /etc/cron.daily are configured."""
+    return _permission_rule("cron_daily_permissions")
+
+
+def cron_weekly_permissions():
+    """Ensure permissions on /etc/cron.weekly are configured."""
+    return _permission_rule("cron_weekly_permissions")
+
+
+def cron_monthly_permissions():
+    """Ensure permissions on /etc/cron.monthly are configured."""
+    return _permission_rule("cron_monthly_permissions")
+
+
+def cron_d_permissions():
+    """Ensure permissions on /etc/cron.d are configured."""
+    return _permission_rule("cron_d_permissions")
+
+
+def crontab_restricted():
+    """Ensure /etc/cron.allow exists and is restricted."""
+    return _permission_rule("crontab_restricted")
+
+
+def sshd_config_permissions():
+    """Ensure permissions on /etc/ssh/sshd_config are configured."""
+    return _permission_rule("sshd_config_permissions")
+
+
+def ssh_private_key_permissions():
+    """Ensure permissions on SSH private host key files are configured."""
+    return _permission_rule("ssh_private_key_permissions")
+
+
+def ssh_public_key_permissions():
+    """Ensure permissions on SSH public host key files are configured."""
+    return _permission_rule("ssh_public_key_permissions")
+
+
+def audit_log_files_mode():
+    """Ensure audit log files mode is 0640 or more restrictive."""
+    return _permission_rule("audit_log_files_mode")
+
+
+def audit_log_files_owner():
+    """Ensure audit log files are owned by root."""
+    return _permission_rule("audit_log_files_owner")
+
+
+def audit_log_files_group():
+    """Ensure audit log files group owner is root or adm."""
+    return _permission_rule("audit_log_files_group")
+
+
+def audit_log_directory_mode():
+    """Ensure the audit log directory mode is 0750 or more restrictive."""
+    return _permission_rule("audit_log_directory_mode")
+
+
+def audit_config_files_mode():
+    """Ensure audit configuration files mode is 0640 or more restrictive."""
+    return _permission_rule("audit_config_files_mode")
+
+
+def audit_config_files_owner():
+    """Ensure audit configuration files are owned by root."""
+    return _permission_rule("audit_config_files_owner")
+
+
+def audit_config_files_group():
+    """Ensure audit configuration files group owner is root."""
+    return _permission_rule("audit_config_files_group")
+
+
+def audit_tools_mode():
+    """Ensure audit tools mode is 0755 or more restrictive."""
+    return _permission_rule("audit_tools_mode")
+
+
+def audit_tools_owner():
+    """Ensure audit tools are owned by root."""
+    return _permission_rule("audit_tools_owner")
+
+
+def audit_tools_group():
+    """Ensure audit tools group owner is root."""
+    return _permission_rule("audit_tools_group")
+
+
+def etc_passwd_permissions():
+    """Ensure permissions on /etc/passwd are configured."""
+    return _permission_rule("etc_passwd_permissions")
+
+
+def etc_passwd_backup_permissions():
+    """Ensure permissions on /etc/passwd- are configured."""
+    return _permission_rule("etc_passwd_backup_permissions")
+
+
+def etc_group_permissions():
+    """Ensure permissions on /etc/group are configured."""
+    return _permission_rule("etc_group_permissions")
+
+
+def etc_group_backup_permissions():
+    """Ensure permissions on /etc/group- are configured."""
+    return _permission_rule("etc_group_backup_permissions")
+
+
+def etc_shadow_permissions():
+    """Ensure permissions on /etc/shadow are configured."""
+    return _permission_rule("etc_shadow_permissions")
+
+
+def etc_shadow_backup_permissions():
+    """Ensure permissions on /etc/shadow- are configured."""
+    return _permission_rule("etc_shadow_backup_permissions")
+
+
+def etc_gshadow_permissions():
+    """Ensure permissions on /etc/gshadow are configured."""
+    return _permission_rule("etc_gshadow_permissions")
+
+
+def etc_gshadow_backup_permissions():
+    """Ensure permissions on /etc/gshadow- are configured."""
+    return _permission_rule("etc_gshadow_backup_permissions")
+
+
+def etc_shells_permissions():
+    """Ensure permissions on /etc/shells are configured."""
+    return _permission_rule("etc_shells_permissions")
+
+
+def opasswd_permissions():
+    """Ensure permissions on /etc/security/opasswd are configured."""
+    return _permission_rule("opasswd_permissions")
+
+
+# ----------------------- Integrity checking -----------------------
+
+def audit_tools_integrity():
+    """Ensure audit tools match their recorded SHA-512 baseline (recorded on first run)."""
+    try:
+        tools = [path for path in AUDIT_TOOLS if os.path.isfile(path)]
+        if not tools:
+            return _check_result(False, "Audit tools not found", "Not installed")
+        baseline = integrity.IntegrityBaseline("audit_tools")
+        created = not baseline.exists
+        report = baseline.scan(tools)
+        if created:
+            return _check_result(True, f"Integrity baseline recorded for {len(tools)} audit tools", "Baseline created")
+        if report.clean and not report.errors:
+            return _check_result(True, f"Audit tools match baseline ({report.summary()})", "Unchanged")
+        changed = report.modified + report.removed + list(report.errors)
+        return _check_result(False, f"Audit tools changed: {', '.join(changed)}", report.summary())
+    except Exception as e:
+        return _error_result(e)
+
+
+# ----------------------- Listening-socket inventory -----------------------
+
+PROC_DIR = "/proc"
+# Seconds a socket inventory is reused across port-based rules
+SOCKET_INVENTORY_MAX_AGE = 30
+# Processes allowed to listen on non-loopback addresses
+APPROVED_LISTENERS = {"sshd", "chronyd", "systemd-resolve", "systemd-timesyn", "ntpd"}
+MTA_PORTS = (25, 465, 587)
+
+_TCP_LISTEN = "0A"
+_UDP_UNCONNECTED = "07"
+
+ListeningSocket = collections.namedtuple("ListeningSocket", "proto address port inode pids commands")
+
+
+def _decode_proc_address(value):
+    """Decode a /proc/net hex 'address:port' into (ip string, port)."""
+    address, _, port = value.partition(":")
+    raw = bytes.fromhex(address)
+    if len(raw) == 4:
+        ip = socket.inet_ntop(socket.AF_INET, raw[::-1])
+    else:
+        # IPv6 is stored as four host-order 32-bit words
+        ip = socket.inet_ntop(socket.AF_INET6, b"".join(raw[i:i + 4][::-1] for i in range(0, 16, 4)))
+    return ip, int(port, 16)
+
+
+def _is_loopback(address):
+    try:
+        ip = ipaddress.ip_address(address)
+        if getattr(ip, "ipv4_mapped", None):
+            ip = ip.ipv4_mapped
+        return ip.is_loopback
+    except ValueError:
+        return False
+
+
+def socket_owners(proc_dir=PROC_DIR):
+    """Map socket inode -> [(pid, comm)] from one scan of /proc/*/fd."""
+    owners = collections.defaultdict(list)
+    try:
+        pids = [name for name in os.listdir(proc_dir) if name.isdigit()]
+    except OSError:
+        return owners
+    for pid in pids:
+        fd_dir = os.path.join(proc_dir, pid, "fd")
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        comm = None
+        for fd in fds:
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd))
+            except OSError:
+                continue
+            if target.startswith("socket:["):
+                if comm is None:
+                    lines = _read_lines(os.path.join(proc_dir, pid, "comm"))
+                    comm = lines[0] if lines else "?"
+                entry = (int(pid), comm)
+                inode = int(target[8:-1])
+                if entry not in owners[inode]:
+                    owners[inode].append(entry)
+    return owners
+
+
+class SocketInventory:
+    """Every listening TCP socket and bound UDP socket, with owning processes."""
+
+    def __init__(self, proc_dir=PROC_DIR):
+        self.proc_dir = proc_dir
+        self.sockets = []
+
+    def load(self):
+        listening = []
+        for proto, state in (("tcp", _TCP_LISTEN), ("tcp6", _TCP_LISTEN),
+                             ("udp", _UDP_UNCONNECTED), ("udp6", _UDP_UNCONNECTED)):
+            for line in _read_lines(os.path.join(self.proc_dir, "net", proto))[1:]:
+                parts = line.split()
+                if len(parts) < 10 or parts[3] != state:
+                    continue
+                address, port = _decode_proc_address(parts[1])
+                listening.append((proto, address, port, int(parts[9])))
+        owners = socket_owners(self.proc_dir) if listening else {}
+        self.sockets = [
+            ListeningSocket(proto, address, port, inode,
+                            tuple(pid for pid, _ in owners.get(inode, [])),
+                            tuple(sorted({comm for _, comm in owners.get(inode, [])})))
+            for proto, address, port, inode in listening
+        ]
+        return self
+
+    def on_port(self, port, proto=None):
+        return [s for s in self.sockets if s.port == port and (proto is None or s.proto.startswith(proto))]
+
+    def external(self):
+        """Sockets reachable from other hosts (not bound to loopback)."""
+        return [s for s in self.sockets if not _is_loopback(s.address)]
+
+    def open_ports(self):
+        """{(proto without version, port)} of externally reachable sockets."""
+        return {(s.proto.rstrip("6"), s.port) for s in self.external()}
+
+
+def get_socket_inventory(proc_dir=PROC_DIR):
+    """Return the shared socket inventory for all port-based rules."""
+    return _cached_fact(f"sockets:{proc_dir}", [], lambda: SocketInventory(proc_dir).load(),
+                        max_age=SOCKET_INVENTORY_MAX_AGE)
+
+
+def _describe_socket(s):
+    owner = ",".join(s.commands) or "unknown"
+    return f"{s.proto} {s.address}:{s.port} ({owner})"
+
+
+def approved_services_listening():
+    """Ensure only approved services listen on non-loopback interfaces."""
+    try:
+        unapproved = [_describe_socket(s) for s in get_socket_inventory().external()
+                      if not s.commands or not set(s.commands) <= APPROVED_LISTENERS]
+        if unapproved:
+            return _check_result(False, f"Unapproved listeners: {'; '.join(unapproved[:20])}", f"{len(unapproved)} found")
+        return _check_result(True, "Only approved services are listening", "Compliant")
+    except Exception as e:
+        return _error_result(e)
+
+
+def mta_local_only():
+    """Ensure the mail transfer agent only listens on loopback."""
+    try:
+        inventory = get_socket_inventory()
+        exposed = [_describe_socket(s) for port in MTA_PORTS for s in inventory.on_port(port, "tcp")
+                   if not _is_loopback(s.address)]
+        if exposed:
+            return _check_result(False, f"MTA listening externally: {'; '.join(exposed)}", "Not local-only")
+        return _check_result(True, "MTA is not listening on non-loopback addresses", "Local-only")
+    except Exception as e:
+        return _error_result(e)
+
+
+# ----------------------- ufw ruleset model -----------------------
+
+UFW_DIR = "/etc/ufw"
+UFW_DEFAULTS = "/etc/default/ufw"
+# Seconds an iptables-save snapshot is reused
+IPTABLES_SNAPSHOT_MAX_AGE = 60
+
+UfwRule = collections.namedtuple("UfwRule", "action proto dport dst sport src direction interface v6")
+
+
+def _parse_shell_assignments(lines):
+    """KEY=value pairs from a shell-style config file, quotes removed."""
+    values = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.partition("=")
+        values[key.strip()] = value.strip().strip("\"'")
+    return values
+
+
+def _parse_ufw_tuple(line, v6):
+    """Decode a '### tuple ###' comment from user.rules/user6.rules."""
+    parts = line.split("### tuple ###", 1)[1].split()
+    parts = [p for p in parts if not p.startswith("comment=")]
+    if len(parts) < 7:
+        return None
+    action, proto, dport, dst, sport, src = parts[:6]
+    direction = parts[-1]
+    direction, _, interface = direction.partition("_")
+    return UfwRule(action, proto, dport, dst, sport, src, direction, interface or None, v6)
+
+
+class UfwRuleset:
+    """
+    Structured view of the ufw configuration: enabled flag, default
+    policies, user rules (both address families), the loopback rules in
+    before.rules and an optional iptables-save snapshot.
+    """
+
+    def __init__(self, ufw_dir=UFW_DIR, defaults_file=UFW_DEFAULTS):
+        self.ufw_dir = ufw_dir
+        self.defaults_file = defaults_file
+        self.config = {}
+        self.defaults = {}
+        self.rules = []
+        self.before_rules = []
+
+    def source_paths(self):
+        names = ("ufw.conf", "user.rules", "user6.rules", "before.rules", "before6.rules")
+        return [os.path.join(self.ufw_dir, name) for name in names] + [self.defaults_file]
+
+    def load(self):
+        self.config = _parse_shell_assignments(_read_lines(os.path.join(self.ufw_dir, "ufw.conf")))
+        self.defaults = _parse_shell_assignments(_read_lines(self.defaults_file))
+        for name, v6 in (("user.rules", False), ("user6.rules", True)):
+            for line in _read_lines(os.path.join(self.ufw_dir, name)):
+                if line.startswith("### tuple ###"):
+                    rule = _parse_ufw_tuple(line, v6)
+                    if rule:
+                        self.rules.append(rule)
+        for name in ("before.rules", "before6.rules"):
+            self.before_rules.extend(line.strip() for line in _read_lines(os.path.join(self.ufw_dir, name))
+                                     if line.startswith("-A "))
+        return self
+
+    @property
+    def installed(self):
+        return os.path.isfile(os.path.join(self.ufw_dir, "ufw.conf"))
+
+    @property
+    def enabled(self):
+        return self.config.get("ENABLED", "no").lower() == "yes"
+
+    def policy(self, chain):
+        """Default policy for 'INPUT', 'OUTPUT' or 'FORWARD' (e.g. DROP)."""
+        return self.defaults.get(f"DEFAULT_{chain}_POLICY", "unset").upper()
+
+    def allowed_port_index(self):
+        """proto -> (exact ports, [(low, high)], allow-any) built from inbound allow rules."""
+        index = {}
+        for rule in self.rules:
+            # Loopback-only rules do not open a port to other hosts
+            if rule.action not in ("allow", "limit") or rule.direction != "in" or rule.interface == "lo":
+                continue
+            for proto in (("tcp", "udp") if rule.proto == "any" else (rule.proto,)):
+                ports, ranges, any_port = index.get(proto, (set(), [], False))
+                if rule.dport == "any":
+                    any_port = True
+                else:
+                    for part in rule.dport.split(","):
+                        low, sep, high = part.partition(":")
+                        if sep:
+                            ranges.append((_to_int(low, -1), _to_int(high, -1)))
+                        elif _to_int(part) is not None:
+                            ports.add(_to_int(part))
+                index[proto] = (ports, ranges, any_port)
+        return index
+
+    def uncovered_ports(self, open_ports):
+        """Open (proto, port) pairs with no inbound allow rule, in one pass."""
+        index = self.allowed_port_index()
+        uncovered = []
+        for proto, port in sorted(open_ports):
+            ports, ranges, any_port = index.get(proto, (set(), [], False))
+            if not (any_port or port in ports or any(low <= port <= high for low, high in ranges)):
+                uncovered.append((proto, port))
+        return uncovered
+
+    def loopback_configured(self):
+        """Missing loopback protections (accept on lo, deny 127.0.0.0/8 and ::1 inbound)."""
+        missing = []
+        accepts_in = ("-A ufw-before-input -i lo -j ACCEPT" in self.before_rules
+                      or any(r.action == "allow" and r.direction == "in" and r.interface == "lo" for r in self.rules))
+        accepts_out = ("-A ufw-before-output -o lo -j ACCEPT" in self.before_rules
+                       or any(r.action == "allow" and r.direction == "out" and r.interface == "lo" for r in self.rules))
+        if not accepts_in:
+            missing.append("allow in on lo")
+        if not accepts_out:
+            missing.append("allow out on lo")
+        for source, v6 in (("127.0.0.0/8", False), ("::1", True)):
+            if not any(r.action == "deny" and r.direction == "in" and r.src == source and not r.interface
+                       for r in self.rules if r.v6 == v6):
+                missing.append(f"deny in from {source}")
+        return missing
+
+
+def load_iptables_snapshot():
+    """'-A' lines of one iptables-save (and ip6tables-save) run, or None if unavailable."""
+    lines = []
+    found = False
+    for command in ("iptables-save", "ip6tables-save"):
+        try:
+            result = subprocess.run([command], capture_output=True, text=True)
+        except OSError:
+            continue
+        if result.returncode == 0:
+            found = True
+            lines.extend(line for line in result.stdout.splitlines() if line.startswith("-A "))
+    return lines if found else None
+
+
+def get_ufw_ruleset(ufw_dir=UFW_DIR, defaults_file=UFW_DEFAULTS):
+    """Return the shared ufw model, re-parsed only when its files change."""
+    ruleset = UfwRuleset(ufw_dir, defaults_file)
+    return _cached_fact(f"ufw:{ufw_dir}", ruleset.source_paths, ruleset.load, persist=True)
+
+
+def get_iptables_snapshot():
+    return _cached_fact("iptables", [], load_iptables_snapshot, max_age=IPTABLES_SNAPSHOT_MAX_AGE)
+
+
+def _ufw_rule(builder):
+    """builder(ruleset) -> (passed, message, current); fails early if ufw is not installed."""
+    try:
+        ruleset = get_ufw_ruleset()
+        if not ruleset.installed:
+            return _check_result(False, "ufw is not installed", "Not installed")
+        return _check_result(*builder(ruleset))
+    except Exception as e:
+        return _error_result(e)
+
+
+def ufw_loopback_configured():
+    """Ensure ufw loopback traffic is configured."""
+    def builder(ruleset):
+        missing = ruleset.loopback_configured()
+        if missing:
+            return False, f"Loopback rules missing: {', '.join(missing)}", "Incomplete"
+        return True, "Loopback traffic is configured", "Configured"
+    return _ufw_rule(builder)
+
+
+def ufw_outbound_configured():
+    """Report the ufw outbound policy and rules (manual review)."""
+    def builder(ruleset):
+        outbound = [r for r in ruleset.rules if r.direction == "out"]
+        policy = ruleset.policy("OUTPUT")
+        return True, f"Outbound policy {policy}, {len(outbound)} outbound rules (review manually)", policy
+    return _ufw_rule(builder)
+
+
+def ufw_rules_for_open_ports():
+    """Ensure every externally reachable listening port has a ufw allow rule."""
+    def builder(ruleset):
+        uncovered = ruleset.uncovered_ports(get_socket_inventory().open_ports())
+        if uncovered:
+            shown = ", ".join(f"{port}/{proto}" for proto, port in uncovered)
+            return False, f"Open ports without ufw rules: {shown}", f"{len(uncovered)} uncovered"
+        return True, "All open ports have ufw rules", "Compliant"
+    return _ufw_rule(builder)
+
+
+def ufw_default_deny():
+    """Ensure the ufw default incoming, outgoing and routed policies are deny/reject."""
+    def builder(ruleset):
+        policies = {chain: ruleset.policy(chain) for chain in ("INPUT", "OUTPUT", "FORWARD")}
+        current = ", ".join(f"{chain}={policy}" for chain, policy in policies.items())
+        passed = all(policy in ("DROP", "REJECT") for policy in policies.values())
+        return passed, f"Default policies: {current}", current
+    return _ufw_rule(builder)
+
+
+def ufw_not_with_iptables():
+    """Ensure ufw is not mixed with rules managed directly through iptables."""
+    def builder(ruleset):
+        snapshot = get_iptables_snapshot()
+        if snapshot is None:
+            return True, "iptables-save unavailable; no foreign iptables rules detected", "Unknown"
+        foreign = []
+        for line in snapshot:
+            parts = line.split()
+            chain = parts[1] if len(parts) > 1 else ""
+            target = parts[parts.index("-j") + 1] if "-j" in parts[:-1] else ""
+            if not chain.startswith("ufw") and not target.startswith("ufw"):
+                foreign.append(line)
+        if foreign:
+            return False, f"{len(foreign)} iptables rules outside ufw: {'; '.join(foreign[:5])}", "Mixed"
+        return True, "All iptables rules are managed by ufw", "ufw only"
+    return _ufw_rule(builder)
+
+
+# ----------------------- sudoers model -----------------------
+
+SUDOERS_FILE = "/etc/sudoers"
+_SUDO_TAGS = {"NOPASSWD", "PASSWD", "NOEXEC", "EXEC", "SETENV", "NOSETENV", "LOG_INPUT", "NOLOG_INPUT",
+              "LOG_OUTPUT", "NOLOG_OUTPUT", "MAIL", "NOMAIL", "FOLLOW", "NOFOLLOW", "INTERCEPT", "NOINTERCEPT"}
+_SUDO_ALIASES = ("User_Alias", "Runas_Alias", "Host_Alias", "Cmnd_Alias", "Cmd_Alias")
+
+
+def _split_sudoers_list(text):
+    """Split on commas that are not inside double quotes or escaped."""
+    items, current, quoted, i = [], "", False, 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            current += text[i:i + 2]
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+        if ch == "," and not quoted:
+            items.append(current.strip())
+            current = ""
+        else:
+            current += ch
+        i += 1
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+class SudoersModel:
+    """
+    /etc/sudoers and every file it includes, merged into one list of
+    Defaults settings and one list of user specifications, in the order
+    sudo reads them.
+    """
+
+    def __init__(self, sudoers_file=SUDOERS_FILE):
+        self.sudoers_file = sudoers_file
+        self.files = []
+        self.directories = []   # @includedir targets
+        self.defaults = []      # (scope, name, op, value, source)
+        self.user_specs = []    # (text, tags, source)
+        self.aliases = {}
+
+    def load(self):
+        self._read(self.sudoers_file, set())
+        return self
+
+    def source_paths(self):
+        return self.directories + self.files
+
+    def _logical_lines(self, path):
+        pending = ""
+        for lineno, raw in enumerate(_read_lines(path), 1):
+            if raw.endswith("\\"):
+                pending += raw[:-1] + " "
+                continue
+            yield lineno, (pending + raw).strip()
+            pending = ""
+
+    def _read(self, path, seen):
+        real = os.path.realpath(path)
+        if real in seen:
+            return
+        seen.add(real)
+        self.files.append(path)
+        directory = os.path.dirname(path)
+        for lineno, line in self._logical_lines(path):
+            source = f"{path}:{lineno}"
+            if not line:
+                continue
+            include = re.match(r"^[#@](include|includedir)\s+(.+)$", line)
+            if include:
+                kind, target = include.group(1), include.group(2).strip().strip('"')
+                target = os.path.join(directory, target) if not os.path.isabs(target) else target
+                if kind == "include":
+                    self._read(target, seen)
+                elif os.path.isdir(target):
+                    self.directories.append(target)
+                    # sudo skips names ending in '~' or containing '.'
+                    for name in sorted(os.listdir(target)):
+                        if not name.endswith("~") and "." not in name and os.path.isfile(os.path.join(target, name)):
+                            self._read(os.path.join(target, name), seen)
+                continue
+            if line.startswith("#"):
+                continue
+            line = re.sub(r"(?<!\\)#.*$", "", line).strip()
+            if re.match(r"^Defaults([:@>!]\S+)?\s", line + " "):
+                head, params = (line.split(None, 1) + [""])[:2]
+                scope = head[len("Defaults"):] or "global"
+                for param in _split_sudoers_list(params):
+                    self._add_default(scope, param, source)
+            elif line.split(None, 1)[0] in _SUDO_ALIASES:
+                kind, definition = (line.split(None, 1) + [""])[:2]
+                for alias in definition.split(":"):
+                    name, _, members = alias.partition("=")
+                    self.aliases[name.strip()] = (kind, members.strip())
+            else:
+                tags = {tag for tag in re.findall(r"\b([A-Z_]+)\s*:", line) if tag in _SUDO_TAGS}
+                self.user_specs.append((line, tags, source))
+
+    def _add_default(self, scope, param, source):
+        param = param.strip()
+        if not param:
+            return
+        if param.startswith("!"):
+            self.defaults.append((scope, param[1:].strip(), "!", False, source))
+            return
+        match = re.match(r"^([A-Za-z_]+)\s*(\+=|-=|=)\s*(.*)$", param)
+        if match:
+            name, op, value = match.groups()
+            self.defaults.append((scope, name, op, value.strip().strip('"'), source))
+        else:
+            self.defaults.append((scope, param, "", True, source))
+
+    def setting(self, name, scope="global"):
+        """Effective value of a Defaults setting for scope (last assignment wins), or None."""
+        value = None
+        for entry_scope, entry_name, op, entry_value, _ in self.defaults:
+            if entry_name == name and entry_scope == scope and op in ("", "=", "!"):
+                value = entry_value
+        return value
+
+    def default_sources(self, name, value=None):
+        """Sources of every Defaults entry for name (optionally with a given value)."""
+        return [source for _, entry_name, _, entry_value, source in self.defaults
+                if entry_name == name and (value is None or entry_value == value)]
+
+    def specs_with_tag(self, tag):
+        return [(text, source) for text, tags, source in self.user_specs if tag in tags]
+
+
+def get_sudoers_model(sudoers_file=SUDOERS_FILE):
+    """Return the shared sudoers model, rebuilt when any included file changes."""
+    name = f"sudoers:{sudoers_file}"
+
+    def paths():
+        # The include chain is taken from the last model built; a changed
+        # include line changes sudoers_file itself and forces a rebuild
+        model = _previous_fact(name) or SudoersModel(sudoers_file).load()
+        return model.source_paths()
+    return _cached_fact(name, paths, lambda: SudoersModel(sudoers_file).load(),
+                        persist=True)
+
+
+def _sudo_rule(builder):
+    try:
+        model = get_sudoers_model()
+        if not os.path.isfile(model.sudoers_file):
+            return _check_result(False, f"{model.sudoers_file} not found", "Not installed")
+        return _check_result(*builder(model))
+    except Exception as e:
+        return _error_result(e)
+
+
+def sudo_use_pty():
+    """Ensure sudo commands use a pty."""
+    def builder(model):
+        value = model.setting("use_pty")
+        return value is True, f"Defaults use_pty {'set' if value is True else 'not set'}", str(value is True)
+    return _sudo_rule(builder)
+
+
+def sudo_logfile():
+    """Ensure a sudo log file is configured."""
+    def builder(model):
+        value = model.setting("logfile")
+        if isinstance(value, str) and value:
+            return True, f"sudo logs to {value}", value
+        return False, "Defaults logfile is not set", "Not set"
+    return _sudo_rule(builder)
+
+
+def sudo_requires_password():
+    """Ensure no sudo rule uses NOPASSWD."""
+    def builder(model):
+        specs = model.specs_with_tag("NOPASSWD")
+        if specs:
+            return False, f"NOPASSWD used at: {', '.join(source for _, source in specs)}", f"{len(specs)} rules"
+        return True, "No NOPASSWD rules", "Compliant"
+    return _sudo_rule(builder)
+
+
+def sudo_reauthentication():
+    """Ensure re-authentication is not globally disabled with !authenticate."""
+    def builder(model):
+        sources = model.default_sources("authenticate", False)
+        if sources:
+            return False, f"!authenticate set at: {', '.join(sources)}", "Disabled"
+        return True, "Re-authentication is not disabled", "Compliant"
+    return _sudo_rule(builder)
+
+
+def sudo_timestamp_timeout():
+    """Ensure sudo timestamp_timeout is at most 15 minutes and not disabled (-1)."""
+    def builder(model):
+        raw = model.setting("timestamp_timeout")
+        value = 15 if raw is None else _to_int(raw)
+        passed = value is not None and 0 <= value <= 15
+        shown = f"{value} minutes" + (" (default)" if raw is None else "")
+        return passed, f"timestamp_timeout: {shown}", shown
+    return _sudo_rule(builder)
+
+
+def su_restricted():
+    """Ensure su requires pam_wheel with use_uid and an empty group."""
+    try:
+        entries = [e for e in get_pam_index().find("su", "pam_wheel.so", "auth")
+                   if e.control == "required" and "use_uid" in e.options]
+        if not entries:
+            return _check_result(False, "pam_wheel.so use_uid is not required in /etc/pam.d/su", "Not restricted")
+        group = entries[0].options.get("group")
+        if not isinstance(group, str):
+            return _check_result(False, "pam_wheel.so has no group= argument", "No group")
+        db = get_account_database()
+        if group not in db.groups_by_name:
+            return _check_result(False, f"su group '{group}' does not exist", "Missing group")
+        members = sorted(db.members_of(group))
+        if members:
+            return _check_result(False, f"su group '{group}' has members: {', '.join(members)}", f"{len(members)} members")
+        return _check_result(True, f"su is restricted to empty group '{group}'", group)
+    except Exception as e:
+        return _error_result(e)
+
+
+# ----------------------- Home directory scanner -----------------------
+
+HOME_SCAN_WORKERS = 16
+# Seconds before a home (e.g. on a hung NFS mount) is reported and abandoned
+HOME_SCAN_TIMEOUT = 10
+HOME_FINDINGS_LIMIT = 100
+HOME_SCAN_MAX_AGE = 300
+
+HOME_DIRS = "home_dirs"
+DOT_FILES = "dot_files"
+
+
+def _scan_home(user):
+    """(rule, user, path, problem) findings for one home from a single scandir."""
+    findings = []
+    home = user.home
+    try:
+        st = os.stat(home)
+    except OSError:
+        return [(HOME_DIRS, user.name, home, "home directory does not exist")]
+    if not stat.S_ISDIR(st.st_mode):
+        return [(HOME_DIRS, user.name, home, "home is not a directory")]
+    if st.st_uid != user.uid:
+        findings.append((HOME_DIRS, user.name, home, f"owned by uid {st.st_uid}"))
+    mode = stat.S_IMODE(st.st_mode)
+    if mode & 0o027:
+        findings.append((HOME_DIRS, user.name, home, f"mode {mode:04o} exceeds 0750"))
+    try:
+        with os.scandir(home) as entries:
+            for entry in entries:
+                if not entry.name.startswith("."):
+                    continue
+                try:
+                    entry_st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if not stat.S_ISREG(entry_st.st_mode):
+                    continue
+                entry_mode = stat.S_IMODE(entry_st.st_mode)
+                if entry.name in (".forward", ".rhosts"):
+                    findings.append((DOT_FILES, user.name, entry.path, "file should not exist"))
+                    continue
+                limit = 0o600 if entry.name in (".netrc", ".bash_history") else 0o644
+                if entry_mode & ~limit:
+                    findings.append((DOT_FILES, user.name, entry.path, f"mode {entry_mode:04o} exceeds {limit:04o}"))
+                if entry_st.st_uid != user.uid:
+                    findings.append((DOT_FILES, user.name, entry.path, f"owned by uid {entry_st.st_uid}"))
+                if entry_st.st_gid != user.gid:
+                    findings.append((DOT_FILES, user.name, entry.path, f"group gid {entry_st.st_gid}"))
+    except OSError as e:
+        findings.append((HOME_DIRS, user.name, home, f"cannot be read: {e.strerror}"))
+    return findings
+
+
+# Home path -> thread of a timed-out scan that has not returned yet. These
+# threads cannot be stopped, so they count against max_workers until they
+# finish, across runs and --watch rounds.
+_stuck_home_scans = {}
+_stuck_home_lock = threading.Lock()
+
+
+def _live_stuck_home_scans():
+    with _stuck_home_lock:
+        for home, thread in list(_stuck_home_scans.items()):
+            if not thread.is_alive():
+                del _stuck_home_scans[home]
+        return dict(_stuck_home_scans)
+
+
+def iter_home_findings(users=None, max_workers=HOME_SCAN_WORKERS, timeout=HOME_SCAN_TIMEOUT):
+    """
+    Scan interactive users' homes with at most max_workers live threads and
+    yield findings as each home completes. A home still running after
+    `timeout` seconds is reported and abandoned so it cannot stall the run;
+    its thread keeps a worker slot until it returns, and the home is not
+    scanned again meanwhile. Once every slot is held by a stuck scan, the
+    remaining homes are reported as not scanned.
+    """
+    pending = collections.deque(users if users is not None else get_account_database().interactive_users())
+    results = queue.Queue()
+    running = {}
+
+    def scan(key, user):
+        try:
+            results.put((key, _scan_home(user)))
+        except Exception as e:
+            results.put((key, [(HOME_DIRS, user.name, user.home, f"scan failed: {e}")]))
+
+    next_key = 0
+    while pending or running:
+        stuck = _live_stuck_home_scans()
+        while pending and len(running) + len(stuck) < max_workers:
+            user = pending.popleft()
+            if user.home in stuck:
+                yield (HOME_DIRS, user.name, user.home, "not scanned: an earlier scan is still blocked")
+                continue
+            thread = threading.Thread(target=scan, args=(next_key, user), daemon=True)
+            running[next_key] = (user, time.monotonic(), thread)
+            thread.start()
+            next_key += 1
+        if pending and not running and len(stuck) >= max_workers:
+            for user in pending:
+                yield (HOME_DIRS, user.name, user.home,
+                       f"not scanned: {len(stuck)} earlier home scans are still blocked")
+            return
+        try:
+            key, findings = results.get(timeout=0.2)
+        except queue.Empty:
+            pass
+        else:
+            # Late results from abandoned scans are dropped
+            if running.pop(key, None) is not None:
+                for finding in findings:
+                    yield finding
+        # Swept on every pass so a hung home times out even while others keep finishing
+        now = time.monotonic()
+        for key, (user, started, thread) in list(running.items()):
+            if now - started > timeout:
+                del running[key]
+                with _stuck_home_lock:
+                    _stuck_home_scans[user.home] = thread
+                yield (HOME_DIRS, user.name, user.home, f"scan timed out after {timeout}s")
+
+
+class HomeScan:
+    """Exact counts plus the first `limit` findings for the home and dot-file rules."""
+
+    def __init__(self, limit=HOME_FINDINGS_LIMIT):
+        self.limit = limit
+        self.counts = {HOME_DIRS: 0, DOT_FILES: 0}
+        self.samples = {HOME_DIRS: [], DOT_FILES: []}
+
+    def run(self, findings=None):
+        for rule, user, path, problem in (findings if findings is not None else iter_home_findings()):
+            self.counts[rule] += 1
+            if len(self.samples[rule]) < self.limit:
+                self.samples[rule].append(f"{path} ({problem})")
+        return self
+
+
+def get_home_scan():
+    """Run (or reuse) the shared scan used by both home directory rules."""
+    return _cached_fact("homes", [PASSWD_FILE], lambda: HomeScan().run(), max_age=HOME_SCAN_MAX_AGE)
+
+
+def _home_rule(rule, label):
+    try:
+        scan = get_home_scan()
+        count = scan.counts[rule]
+        if count:
+            return _check_result(False, f"{count} {label} issues: {'; '.join(scan.samples[rule][:10])}", f"{count} found")
+        return _check_result(True, f"{label} are configured correctly", "Compliant")
+    except Exception as e:
+        return _error_result(e)
+
+
+def interactive_home_directories():
+    """Ensure interactive users' home directories exist, are owned by them and are 0750 or stricter."""
+    return _home_rule(HOME_DIRS, "Home directories")
+
+
+def interactive_dot_files():
+    """Ensure interactive users' dot files are owned by them and not group/world writable."""
+    return _home_rule(DOT_FILES, "Dot files")
+
+
+# ----------------------- Transactional remediation -----------------------
+
+SUDOERS_REMEDIATION_FILE = "/etc/sudoers.d/50-hardensys"
+AUDIT_REMEDIATION_FILE = os.path.join(AUDIT_RULES_DIR, "50-hardensys.rules")
+AUDIT_FINALIZE_FILE = os.path.join(AUDIT_RULES_DIR, "99-finalize.rules")
+
+# PAM module -> (service, type) whose module arguments override its config file
+PAM_REMEDIATION_TARGETS = {
+    "pam_faillock.so": ("common-auth", "auth"),
+    "pam_pwquality.so": ("common-password", "password"),
+    "pam_pwhistory.so": ("common-password", "password"),
+}
+
+
+def _fix_pam_option(module, key, value=None):
+    """Set key in the module's config file and rewrite it where the PAM line overrides it."""
+    def apply(tx):
+        service, pam_type = PAM_REMEDIATION_TARGETS[module]
+        tx.edit(os.path.join(SECURITY_DIR, PAM_MODULE_CONFIGS[module][0]), remediation.set_option(key, value), "pam")
+        tx.edit(os.path.join(PAM_DIR, service),
+                remediation.pam_argument(pam_type, module, key, value, add=False), "pam")
+    return apply
+
+
+def _fix_pam_argument(module, argument):
+    def apply(tx):
+        service, pam_type = PAM_REMEDIATION_TARGETS[module]
+        tx.edit(os.path.join(PAM_DIR, service), remediation.pam_argument(pam_type, module, argument), "pam")
+    return apply
+
+
+def _fix_sudo_default(name, value=None):
+    def apply(tx):
+        tx.edit(SUDOERS_REMEDIATION_FILE, remediation.set_option(f"Defaults {name}", value, "="), "sudo", mode=0o440)
+    return apply
+
+
+def _fix_audit_requirement(script_key):
+    """Add the required lines whose rules are missing from the on-disk configuration."""
+    def apply(tx):
+        lines = AUDIT_REQUIREMENTS[script_key][1]
+        disk, _ = get_audit_rules()
+        missing = [line for line in (lines() if callable(lines) else lines)
+                   if disk.missing(AuditRuleset.from_lines([line]))]
+        if missing:
+            tx.edit(AUDIT_REMEDIATION_FILE, remediation.ensure_lines(missing), "auditd", mode=0o640)
+    return apply
+
+
+def _fix_audit_immutable(tx):
+    tx.edit(AUDIT_FINALIZE_FILE, remediation.set_option("-e", 2, " "), "auditd", mode=0o640)
+
+
+# script_key -> function(tx) queuing the edits that bring the rule into compliance
+REMEDIATIONS = {
+    "faillock_deny": _fix_pam_option("pam_faillock.so", "deny", 5),
+    "faillock_unlock_time": _fix_pam_option("pam_faillock.so", "unlock_time", 900),
+    "faillock_root": _fix_pam_option("pam_faillock.so", "even_deny_root"),
+    "pwquality_difok": _fix_pam_option("pam_pwquality.so", "difok", 2),
+    "pwquality_minlen": _fix_pam_option("pam_pwquality.so", "minlen", 14),
+    "pwquality_maxrepeat": _fix_pam_option("pam_pwquality.so", "maxrepeat", 3),
+    "pwquality_maxsequence": _fix_pam_option("pam_pwquality.so", "maxsequence", 3),
+    "pwquality_dictcheck": _fix_pam_option("pam_pwquality.so", "dictcheck", 1),
+    "pwquality_enforcing": _fix_pam_option("pam_pwquality.so", "enforcing", 1),
+    "pwquality_enforce_for_root": _fix_pam_option("pam_pwquality.so", "enforce_for_root"),
+    "pwhistory_remember": _fix_pam_option("pam_pwhistory.so", "remember", 24),
+    "pwhistory_enforce_for_root": _fix_pam_option("pam_pwhistory.so", "enforce_for_root"),
+    "pwhistory_use_authtok": _fix_pam_argument("pam_pwhistory.so", "use_authtok"),
+    "sudo_use_pty": _fix_sudo_default("use_pty"),
+    "sudo_logfile": _fix_sudo_default("logfile", '"/var/log/sudo.log"'),
+    "sudo_timestamp_timeout": _fix_sudo_default("timestamp_timeout", 15),
+    "audit_immutable": _fix_audit_immutable,
+}
+REMEDIATIONS.update({key: _fix_audit_requirement(key) for key in AUDIT_REQUIREMENTS})
+
+
+def remediate(script_keys, backup_dir=None):
+    """
+    Queue the remediation of every script_key that has one into a single
+    transaction and commit it. Returns (remediated keys, RemediationResult).
+    """
+    tx = remediation.RemediationTransaction(backup_dir)
+    applied = []
+    for key in script_keys:
+        fix = REMEDIATIONS.get(key)
+        if fix:
+            fix(tx)
+            applied.append(key)
+    return applied, tx.commit()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+HardenSys PDF Report
+Builds the compliance PDF of a results-store run, normally in a worker
+process started with start_pdf_report(). Rows are read from the store page
+by page and the story is handed to reportlab's build() as a list filled
+from a generator, so flowables are laid out and released as they are
+produced instead of all existing at once. The summary table is emitted as
+tables of CHUNK_ROWS rows, each with its header.
+"""
+
+import html
+import time
+import multiprocessing
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from results_store import ResultStore
+
+# Rows per summary table; each chunk repeats the header row
+CHUNK_ROWS = 200
+# Flowables produced ahead of the one being laid out (room for keepWithNext)
+STORY_LOOKAHEAD = 10
+SEVERITY_GROUPS = ("HIGH", "MEDIUM", "LOW")
+TABLE_HEADER = ["Parameter", "Previous", "Current", "Status", "Severity", "Timestamp"]
+
+
+def _x(value) -> str:
+    """Text escaped for reportlab's paragraph markup."""
+    return html.escape("" if value is None else str(value), quote=False)
+
+
+def _group(severity) -> str:
+    severity = str(severity or "").upper()
+    return severity if severity in SEVERITY_GROUPS else "LOW"
+
+
+class _LazyStory(list):
+    """
+    Story list for build() filled from an iterator as it is consumed.
+    build() takes len() of the story before each flowable, which tops it up
+    to `ahead` flowables, so only a small window of the report exists at a
+    time while keepWithNext still sees the flowables that follow a heading.
+    That is reportlab behaviour rather than API, so check_consumed() makes
+    a build that stopped early fail instead of writing a truncated report.
+    """
+
+    def __init__(self, flowables: Iterable, ahead: int = STORY_LOOKAHEAD):
+        super().__init__()
+        self._source = iter(flowables)
+        self._ahead = ahead
+
+    def __len__(self):
+        while self._source is not None and list.__len__(self) < self._ahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return list.__len__(self)
+
+    def check_consumed(self):
+        """Raise if build() returned before laying out every flowable."""
+        if len(self):
+            raise RuntimeError("PDF build ended before the end of the report; "
+                               "this reportlab version does not consume the story as expected")
+
+
+class _Progress:
+    """Reports whole percentages of `total` processed rows, each at most once."""
+
+    def __init__(self, total: int, callback: Optional[Callable[[int], None]]):
+        self.total = max(total, 1)
+        self.callback = callback
+        self.done = 0
+        self.reported = -1
+
+    def step(self, n: int = 1):
+        self.done += n
+        pct = min(99, self.done * 100 // self.total)
+        if self.callback and pct != self.reported:
+            self.reported = pct
+            self.callback(pct)
+
+
+def build_pdf_report(path: str, store: ResultStore, run_id: Optional[int],
+                     progress: Callable[[int], None] = None) -> str:
+    """Write the PDF report of `run_id` (no run: an empty report) to `path`."""
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib import colors
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+        from reportlab.lib.styles import getSampleStyleSheet
+    except Exception as e:
+        raise RuntimeError("ReportLab is not installed. Please install reportlab.") from e
+
+    doc = SimpleDocTemplate(path, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    styles = getSampleStyleSheet()
+    # Headings are kept on the same page as what follows them
+    for name in ('Heading2', 'Heading3'):
+        styles[name].keepWithNext = 1
+    severity_colors = {"HIGH": colors.red, "MEDIUM": colors.orange, "LOW": colors.green}
+
+    if run_id is None:
+        counts: Dict[str, int] = {}
+        total_actions = total_compliance = 0
+    else:
+        counts = store.severity_counts(run_id)
+        total_actions = store.count("actions", run_id)
+        total_compliance = store.count("results", run_id)
+    # Missing or unknown severities count as LOW, as in the sections below
+    group_sizes = {"HIGH": counts.get("HIGH", 0), "MEDIUM": counts.get("MEDIUM", 0)}
+    group_sizes["LOW"] = total_compliance - group_sizes["HIGH"] - group_sizes["MEDIUM"]
+    tracker = _Progress(total_actions + 2 * total_compliance, progress)
+
+    def actions() -> Iterator:
+        for i, a in enumerate(store.iter_actions(run_id) if run_id is not None else (), 1):
+            action_text = f"<b>[{_x(a['timestamp'])}]</b> {_x(a['action'])}"
+            if a['details']:
+                action_text += f": {_x(a['details'])}"
+            yield Paragraph(f"{i}. {action_text}", styles['Normal'])
+            tracker.step()
+
+    def severity_group(severity: str) -> Iterator:
+        color = severity_colors[severity]
+        yield Paragraph(f"<font color='{color.hexval()}'><b>{severity} SEVERITY ISSUES ({group_sizes[severity]})</b></font>",
+                        styles['Heading3'])
+        for r in store.iter_results(run_id):
+            if _group(r['severity']) != severity:
+                continue
+            yield Paragraph(f"<b>Parameter:</b> {_x(r['title'])}", styles['Normal'])
+            yield Paragraph(f"<b>Previous Value:</b> {_x(r['previous'])}", styles['Normal'])
+            yield Paragraph(f"<b>Current Value:</b> {_x(r['current'])}", styles['Normal'])
+            yield Paragraph(f"<b>Status:</b> {_x(r['status'])}", styles['Normal'])
+            yield Paragraph(f"<b>Severity:</b> {_x(r['severity'] or '')}", styles['Normal'])
+            yield Paragraph(f"<b>Timestamp:</b> {_x(r['timestamp'])}", styles['Normal'])
+            yield Spacer(1, 6)
+            tracker.step()
+        yield Spacer(1, 12)
+
+    def summary_tables() -> Iterator:
+        rows: List[List[str]] = []
+        row_colors: List[Tuple] = []
+
+        def table():
+            style = [
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+            ]
+            style.extend(('TEXTCOLOR', (4, i), (4, i), color) for i, color in row_colors)
+            t = Table([TABLE_HEADER] + rows, repeatRows=1)
+            t.setStyle(TableStyle(style))
+            return t
+
+        for r in store.iter_results(run_id):
+            rows.append([str(r['title'] or ''), str(r['previous'] or ''), str(r['current'] or ''),
+                         str(r['status'] or ''), str(r['severity'] or ''), str(r['timestamp'] or '')])
+            row_colors.append((len(rows), severity_colors[_group(r['severity'])]))
+            tracker.step()
+            if len(rows) == CHUNK_ROWS:
+                yield table()
+                rows, row_colors = [], []
+        if rows:
+            yield table()
+
+    def story() -> Iterator:
+        summary_text = f"""
+        <b>Total Actions Performed:</b> {total_actions}<br/>
+        <b>Compliance Records:</b> {total_compliance}<br/>
+        <b>High Severity Issues:</b> {group_sizes['HIGH']}<br/>
+        <b>Medium Severity Issues:</b> {group_sizes['MEDIUM']}<br/>
+        <b>Low Severity Issues:</b> {group_sizes['LOW']}<br/>
+        """
+        yield Paragraph("HardenSys Compliance Report", styles['Title'])
+        yield Paragraph(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])
+        yield Spacer(1, 12)
+        yield Paragraph("Executive Summary", styles['Heading2'])
+        yield Paragraph(summary_text, styles['Normal'])
+        yield Spacer(1, 12)
+
+        yield Paragraph("Audit Trail - Actions Log", styles['Heading2'])
+        yield Paragraph("All actions performed during the hardening process with timestamps:", styles['Normal'])
+        yield Spacer(1, 6)
+        if total_actions:
+            yield from actions()
+        else:
+            yield Paragraph("No actions recorded.", styles['Normal'])
+        yield PageBreak()
+
+        yield Paragraph("Compliance Results with Severity Ratings", styles['Heading2'])
+        yield Paragraph("Detailed compliance results showing parameter changes and severity levels:", styles['Normal'])
+        yield Spacer(1, 12)
+        if total_compliance:
+            for severity in SEVERITY_GROUPS:
+                if group_sizes[severity]:
+                    yield from severity_group(severity)
+            yield Paragraph("Compliance Summary Table", styles['Heading3'])
+            yield from summary_tables()
+        else:
+            yield Paragraph("No compliance records available.", styles['Normal'])
+
+        yield Spacer(1, 24)
+        yield Paragraph("End of Report", styles['Normal'])
+        yield Paragraph(f"Report generated by HardenSys on {time.strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])
+
+    flowables = _LazyStory(story())
+    doc.build(flowables)
+    flowables.check_consumed()
+    if progress:
+        progress(100)
+    return path
+
+
+def _pdf_worker(path: str, db_path: str, run_id: Optional[int], events):
+    """Worker process entry point: puts ('progress', pct), then ('done', path) or ('error', message)."""
+    store = None
+    try:
+        store = ResultStore(db_path)
+        build_pdf_report(path, store, run_id, lambda pct: events.put(("progress", pct)))
+        events.put(("done", path))
+    except Exception as e:
+        events.put(("error", str(e)))
+    finally:
+        if store is not None:
+            store.close()
+
+
+def start_pdf_report(path: str, db_path: str, run_id: Optional[int]):
+    """
+    Start building a report in a separate process (the caller's store must
+    be flushed first). Returns (process, events queue).
+    """
+    ctx = multiprocessing.get_context("spawn")
+    events = ctx.Queue()
+    process = ctx.Process(target=_pdf_worker, args=(path, db_path, run_id, events), daemon=True)
+    process.start()
+    return process, events
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+HardenSys Remediation Transactions
+Collect configuration edits per file, write every file once atomically and
+reload each affected subsystem once, rolling back if validation fails.
+"""
+
+import os
+import re
+import json
+import stat
+import shutil
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Use repo-local backup directory: <repo>/backup
+BACKUP_DIR = Path(__file__).resolve().parent / "backup"
+MANIFEST_NAME = "manifest.json"
+
+# Subsystem -> (validation command, reload command). Validation runs once the
+# new files are in place and before anything is reloaded. A reload given as a
+# list of commands tries each in turn until one succeeds (the ssh unit is
+# "ssh" on Debian/Ubuntu and "sshd" on RHEL/SUSE).
+SUBSYSTEMS = {
+    "sysctl": (None, ["sysctl", "--system"]),
+    "sshd": (["sshd", "-t"], [["systemctl", "reload", "ssh"], ["systemctl", "reload", "sshd"]]),
+    "auditd": (None, ["augenrules", "--load"]),
+    "sudo": (["visudo", "-c"], None),
+    "pam": (None, None),
+    "modprobe": (None, None),
+}
+# Subsystem -> command checking a single staged file (its path is appended).
+# Staged files are checked before any file is put in place, so a broken
+# sudoers fragment is never live.
+FILE_VALIDATORS = {
+    "sudo": ["visudo", "-cf"],
+}
+
+Editor = Callable[[List[str]], List[str]]
+
+
+# ----------------------- Line editors -----------------------
+
+def _key_pattern(key: str):
+    return re.compile(r"^\s*" + re.escape(key) + r"(?=\s|=|$)", re.IGNORECASE)
+
+
+def set_option(key: str, value=None, separator: str = " = ", before: str = None) -> Editor:
+    """
+    Set 'key<separator>value' (a bare flag when value is None). The first
+    active line for key is replaced and later duplicates are dropped; when
+    there is none the line is appended. Lines from the first match of the
+    'before' regex on (e.g. sshd Match blocks) are left untouched.
+    """
+    line = key if value is None else f"{key}{separator}{value}"
+    pattern = _key_pattern(key)
+    stop = re.compile(before) if before else None
+
+    def apply(lines):
+        end = next((i for i, l in enumerate(lines) if stop and stop.match(l)), len(lines))
+        head, placed = [], False
+        for existing in lines[:end]:
+            if pattern.match(existing):
+                if not placed:
+                    head.append(line)
+                    placed = True
+                continue
+            head.append(existing)
+        if not placed:
+            head.append(line)
+        return head + lines[end:]
+    return apply
+
+
+def ensure_lines(required: List[str]) -> Editor:
+    """Append every required line not already present (whitespace-insensitive)."""
+    def normalize(text):
+        return " ".join(text.split())
+
+    def apply(lines):
+        present = {normalize(l) for l in lines}
+        return lines + [l for l in required if normalize(l) not in present]
+    return apply
+
+
+def pam_argument(pam_type: str, module: str, argument: str, value=None, add: bool = True) -> Editor:
+    """
+    Set a module argument ('argument=value', or a bare flag) on every active
+    PAM line of pam_type loading module. With add=False only an argument that
+    is already on the line is rewritten.
+    """
+    line_re = re.compile(r"^(\s*-?" + re.escape(pam_type) + r"\s+(?:\[[^\]]*\]|\S+)\s+\S*"
+                         + re.escape(module) + r")(.*)$")
+    wanted = argument if value is None else f"{argument}={value}"
+
+    def apply(lines):
+        result = []
+        for line in lines:
+            match = line_re.match(line)
+            if not match:
+                result.append(line)
+                continue
+            args = match.group(2).split()
+            found = [i for i, a in enumerate(args) if a == argument or a.startswith(argument + "=")]
+            if found:
+                args[found[0]] = wanted
+                args = [a for i, a in enumerate(args) if i not in found[1:]]
+            elif add:
+                args.append(wanted)
+            result.append(" ".join([match.group(1)] + args))
+        return result
+    return apply
+
+
+# ----------------------- Atomic file writes -----------------------
+
+def atomic_write(path: str, data: bytes, mode: int = 0o644):
+    """
+    Replace path with data through a temporary file in the same directory and
+    a rename. An existing file keeps its mode and owner; symlinks are followed.
+    """
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    uid = gid = None
+    try:
+        st = os.stat(path)
+        mode, uid, gid = stat.S_IMODE(st.st_mode), st.st_uid, st.st_gid
+    except FileNotFoundError:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        if uid is not None and (uid, gid) != (os.getuid(), os.getgid()):
+            os.chown(tmp_path, uid, gid)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _run(command: List[str]):
+    """Run command and return (ok, combined output)."""
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except OSError as e:
+        return False, str(e)
+    return result.returncode == 0, (result.stdout + result.stderr).strip()
+
+
+def _run_any(commands):
+    """Run a command, or each of a list of alternatives until one succeeds."""
+    if commands and isinstance(commands[0], str):
+        commands = [commands]
+    outputs = []
+    for command in commands:
+        ok, output = _run(command)
+        if ok:
+            return True, output
+        outputs.append(output or f"{' '.join(command)} failed")
+    return False, "; ".join(outputs)
+
+
+def validate_staged(command: List[str], path: str, data: bytes, mode: int) -> Optional[str]:
+    """
+    Check data as the new content of path with command + [file], using a
+    temporary copy next to path (dot-prefixed, so include directories skip
+    it). Returns the error output, or None when it is valid.
+    """
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        ok, output = _run(command + [tmp_path])
+        return None if ok else (output or f"{' '.join(command)} failed")
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+# ----------------------- Transactions -----------------------
+
+class RemediationResult:
+    """Outcome of a committed transaction."""
+
+    def __init__(self):
+        self.changed: List[str] = []
+        self.reloaded: List[str] = []
+        self.errors: Dict[str, str] = {}
+        self.rolled_back = False
+        self.backup: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> str:
+        if self.rolled_back:
+            return f"Rolled back {len(self.changed)} files: " + "; ".join(f"{k}: {v}" for k, v in self.errors.items())
+        text = f"{len(self.changed)} files changed, reloaded: {', '.join(self.reloaded) or 'nothing'}"
+        if self.errors:
+            text += " (errors: " + "; ".join(f"{k}: {v}" for k, v in self.errors.items()) + ")"
+        return text
+
+
+class RemediationTransaction:
+    """
+    Edits queued per file. commit() reads each file once, applies all of its
+    editors, checks staged files that have a FILE_VALIDATORS entry, writes
+    each file once atomically after backing it up, validates the affected
+    subsystems and reloads each of them once.
+    """
+
+    def __init__(self, backup_dir: Path = None, subsystems: Dict = None):
+        self.backup_root = Path(backup_dir or BACKUP_DIR)
+        self.subsystems = subsystems or SUBSYSTEMS
+        self.files: Dict[str, Dict] = {}
+
+    def edit(self, path: str, editor: Editor, subsystem: str = None, mode: int = 0o644):
+        """Queue editor(lines) -> lines for path; mode applies only to new files."""
+        change = self.files.setdefault(path, {"editors": [], "subsystems": [], "mode": mode})
+        change["editors"].append(editor)
+        if subsystem and subsystem not in change["subsystems"]:
+            change["subsystems"].append(subsystem)
+
+    def plan(self) -> Dict[str, tuple]:
+        """path -> (original bytes or None, new bytes) for files that would change."""
+        planned = {}
+        for path, change in self.files.items():
+            original = _read_bytes(path)
+            lines = original.decode("utf-8", "surrogateescape").splitlines() if original is not None else []
+            for editor in change["editors"]:
+                lines = editor(lines)
+            data = ("\n".join(lines) + "\n").encode("utf-8", "surrogateescape") if lines else b""
+            if data != original:
+                planned[path] = (original, data)
+        return planned
+
+    def _backup(self, planned) -> Path:
+        directory = self.backup_root / f"linux_backup_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        directory.mkdir(parents=True)
+        manifest = {}
+        for path, (original, _) in planned.items():
+            manifest[path] = {"existed": original is not None}
+            if original is not None:
+                target = directory / path.lstrip("/")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(path, target)
+        with open(directory / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return directory
+
+    def _restore(self, planned, written):
+        for path in reversed(written):
+            original = planned[path][0]
+            if original is None:
+                os.unlink(path)
+            else:
+                atomic_write(path, original)
+
+    def commit(self) -> RemediationResult:
+        result = RemediationResult()
+        planned = self.plan()
+        if not planned:
+            return result
+
+        for path, (original, data) in planned.items():
+            for name in self.files[path]["subsystems"]:
+                command = FILE_VALIDATORS.get(name)
+                if not command:
+                    continue
+                mode = self.files[path]["mode"]
+                if original is not None:
+                    mode = stat.S_IMODE(os.stat(path).st_mode)
+                try:
+                    error = validate_staged(command, path, data, mode)
+                except OSError as e:
+                    error = str(e)
+                if error:
+                    result.errors[path] = error
+                    return result
+        result.backup = self._backup(planned)
+
+        written = []
+        try:
+            for path, (_, data) in planned.items():
+                atomic_write(path, data, self.files[path]["mode"])
+                written.append(path)
+        except OSError as e:
+            result.errors[path] = str(e)
+            self._restore(planned, written)
+            result.changed, result.rolled_back = written, True
+            return result
+        result.changed = written
+
+        affected = list(dict.fromkeys(s for path in written for s in self.files[path]["subsystems"]))
+        for name in affected:
+            validate = self.subsystems.get(name, (None, None))[0]
+            if validate:
+                ok, output = _run(validate)
+                if not ok:
+                    result.errors[name] = output or f"{' '.join(validate)} failed"
+                    self._restore(planned, written)
+                    result.rolled_back = True
+                    return result
+
+        for name in affected:
+            reload = self.subsystems.get(name, (None, None))[1]
+            if reload:
+                ok, output = _run_any(reload)
+                if ok:
+                    result.reloaded.append(name)
+                else:
+                    result.errors[name] = output
+        return result
+
+
+def restore_backup(directory) -> List[str]:
+    """Put back every file recorded in a transaction backup; returns the restored paths."""
+    directory = Path(directory)
+    with open(directory / MANIFEST_NAME, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    restored = []
+    for path, entry in manifest.items():
+        if entry.get("existed"):
+            with open(directory / path.lstrip("/"), "rb") as f:
+                atomic_write(path, f.read())
+        elif os.path.lexists(path):
+            os.unlink(path)
+        restored.append(path)
+    return restored
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+HardenSys Run Comparison
+Join runs by rule id and report regressions, fixes, new/removed rules and
+value changes per heading. Sources are JSON reports or results-store runs;
+a series of runs is compared pairwise with only two runs in memory.
+"""
+
+import collections
+from typing import Dict, Iterator, List, Tuple
+
+from report_stream import iter_report_results, rule_id
+
+REGRESSION = "regression"
+FIX = "fix"
+NEW = "new"
+REMOVED = "removed"
+VALUE_CHANGE = "value_change"
+CHANGE_KINDS = (REGRESSION, FIX, NEW, REMOVED, VALUE_CHANGE)
+
+# rule id -> (heading, title, status, current)
+RunSnapshot = Dict[str, Tuple[str, str, str, str]]
+
+
+def _snapshot(results) -> RunSnapshot:
+    snapshot = {}
+    for r in results:
+        snapshot[rule_id(r)] = (r.get("heading") or "", r.get("title") or "", r.get("status") or "",
+                                "" if r.get("current") is None else str(r.get("current")))
+    return snapshot
+
+
+def load_snapshot(source: str, store=None) -> RunSnapshot:
+    """
+    Load one run: 'run:<id>' from the results store, else a JSON report.
+    'run:latest' and 'run:-N' count back through finished full CLI runs;
+    'run:<source>:latest' or 'run:<source>:-N' through another source
+    ('gui', 'cli-sample').
+    """
+    if source.startswith("run:"):
+        if store is None:
+            from results_store import get_store
+            store = get_store()
+        run_source, _, ref = source[4:].rpartition(":")
+        if ref == "latest" or ref.startswith("-"):
+            back = 1 if ref == "latest" else -int(ref)
+            if back < 1:
+                raise ValueError(f"Invalid run reference {source}: count back from run:-1")
+            runs = store.runs(limit=back, source=run_source or "cli", finished=True)
+            if len(runs) < back:
+                raise ValueError(f"No run {source} in the results store")
+            run_id = runs[-1]["id"]
+        elif run_source:
+            raise ValueError(f"Invalid run reference {source}: a source only applies to latest or -N")
+        else:
+            run_id = int(ref)
+        return _snapshot(store.results(run_id))
+    return _snapshot(iter_report_results(source))
+
+
+class RunDiff:
+    """Differences between two runs, grouped by heading."""
+
+    def __init__(self, before: str, after: str):
+        self.before = before
+        self.after = after
+        self.changes: Dict[str, List[Dict]] = collections.defaultdict(list)
+        self.counts = collections.Counter()
+
+    def add(self, kind: str, key: str, heading: str, title: str, old=None, new=None):
+        self.changes[heading].append({"kind": kind, "rule": key, "title": title, "before": old, "after": new})
+        self.counts[kind] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "before": self.before,
+            "after": self.after,
+            "counts": {kind: self.counts[kind] for kind in CHANGE_KINDS},
+            "changes": dict(self.changes),
+        }
+
+
+def diff_snapshots(before: RunSnapshot, after: RunSnapshot, before_name: str = "", after_name: str = "") -> RunDiff:
+    """Join two runs by rule id."""
+    diff = RunDiff(before_name, after_name)
+    for key, (heading, title, status, current) in after.items():
+        old = before.get(key)
+        if old is None:
+            diff.add(NEW, key, heading, title, None, {"status": status, "current": current})
+            continue
+        old_status, old_current = old[2], old[3]
+        if old_status == "success" and status != "success":
+            kind = REGRESSION
+        elif old_status != "success" and status == "success":
+            kind = FIX
+        elif old_current != current:
+            kind = VALUE_CHANGE
+        else:
+            continue
+        diff.add(kind, key, heading, title, {"status": old_status, "current": old_current},
+                 {"status": status, "current": current})
+    for key, (heading, title, status, current) in before.items():
+        if key not in after:
+            diff.add(REMOVED, key, heading, title, {"status": status, "current": current}, None)
+    return diff
+
+
+def compare_series(sources: List[str], store=None) -> Iterator[RunDiff]:
+    """Diff each run against the next one, keeping only two runs loaded at a time."""
+    previous_name, previous = None, None
+    for source in sources:
+        current = load_snapshot(source, store)
+        if previous is not None:
+            yield diff_snapshots(previous, current, previous_name, source)
+        previous_name, previous = source, current
+
+
+def format_diff(diff: RunDiff, verbose: bool = False) -> str:
+    """Text rendering of one diff; value changes are listed only when verbose."""
+    labels = {REGRESSION: "REGRESSION", FIX: "FIXED", NEW: "NEW", REMOVED: "REMOVED", VALUE_CHANGE: "CHANGED"}
+    lines = [f"{diff.before} -> {diff.after}",
+             "  " + ", ".join(f"{labels[kind].title()}: {diff.counts[kind]}" for kind in CHANGE_KINDS)]
+    for heading in sorted(diff.changes):
+        entries = [c for c in diff.changes[heading] if verbose or c["kind"] != VALUE_CHANGE]
+        if not entries:
+            continue
+        lines.append(f"  {heading or 'Unknown'}")
+        for c in sorted(entries, key=lambda c: (CHANGE_KINDS.index(c["kind"]), c["title"])):
+            old = f"{c['before']['status']} ({c['before']['current']})" if c["before"] else "-"
+            new = f"{c['after']['status']} ({c['after']['current']})" if c["after"] else "-"
+            lines.append(f"    {labels[c['kind']]:<10} {c['title'] or c['rule']}: {old} -> {new}")
+    return "\n".join(lines)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+HardenSys Report Streaming
+Incremental reader for JSON reports written by `HardenSys.py --format json`,
+yielding result entries one at a time instead of loading the whole file.
+"""
+
+import os
+import json
+from typing import Dict, Iterator, List, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Buffer:
+    """Text window over a file that grows on demand and drops consumed text."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in report at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode one JSON value, reading more of the file while it is incomplete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A number at the end of the window, or cut before its fraction
+                # or exponent ('1.' / '1e'), may continue in the next chunk
+                if (self.eof or not isinstance(value, (int, float))
+                        or (end < len(self.text) and self.text[end] not in ".eE")):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self.fill():
+                continue
+
+
+def iter_report(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, object]]:
+    """
+    Yield (key, value) for each top-level member of a JSON report, except
+    that every element of 'results' is yielded on its own as ('result', item).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buf = _Buffer(f, chunk_size)
+        buf.expect("{")
+        if buf.peek() == "}":
+            return
+        while True:
+            key = buf.value()
+            buf.expect(":")
+            if key == "results" and buf.peek() == "[":
+                buf.expect("[")
+                if buf.peek() == "]":
+                    buf.pos += 1
+                else:
+                    while True:
+                        yield "result", buf.value()
+                        if buf.peek() == ",":
+                            buf.pos += 1
+                            continue
+                        buf.expect("]")
+                        break
+            else:
+                yield key, buf.value()
+            if buf.peek() == ",":
+                buf.pos += 1
+                continue
+            buf.expect("}")
+            return
+
+
+def iter_report_results(path: str) -> Iterator[Dict]:
+    """Result entries of a JSON report, one at a time."""
+    for key, value in iter_report(path):
+        if key == "result":
+            yield value
+
+
+def rule_id(result: Dict) -> str:
+    """Stable identifier of a result's rule: its script_key, else its title."""
+    return result.get("script_key") or result.get("title") or ""
+
+
+def expand_report_paths(sources: List[str]) -> List[str]:
+    """Files as given; directories replaced by the *.json reports they contain, sorted."""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(sorted(os.path.join(source, name) for name in os.listdir(source)
+                                if name.endswith(".json")))
+        else:
+            paths.append(source)
+    return paths
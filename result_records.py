@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+HardenSys Result Records
+Compact in-memory results. A result refers to its task in the loaded
+catalog by integer id instead of copying heading/title/details, statuses
+are interned as small codes, and a ResultSet keeps a run's results as
+column arrays. Dict/JSON views are only built on export.
+"""
+
+import sys
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+# Status codes; statuses not listed here are interned and appended on first use
+STATUSES: List[str] = ["success", "error"]
+_STATUS_CODES: Dict[str, int] = {status: code for code, status in enumerate(STATUSES)}
+
+# Fields read from the catalog entry rather than stored per result
+TASK_FIELDS = ("heading", "subheading", "title", "details", "script_key")
+RESULT_FIELDS = ("status", "message", "previous", "current", "timestamp", "fingerprint", "cached")
+
+
+def status_code(status: str) -> int:
+    code = _STATUS_CODES.get(status)
+    if code is None:
+        status = sys.intern(str(status))
+        code = len(STATUSES)
+        STATUSES.append(status)
+        _STATUS_CODES[status] = code
+    return code
+
+
+class TaskCatalog:
+    """Loaded task entries addressed by integer id (their position)."""
+
+    def __init__(self, tasks: List[Dict]):
+        self.tasks = tasks
+
+    def __getitem__(self, task_id: int) -> Dict:
+        return self.tasks[task_id]
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+
+class ResultRecord:
+    """
+    One result. Task fields resolve through the catalog; get() and item
+    access accept the keys of a rule result dict so existing readers work.
+    """
+
+    __slots__ = ("catalog", "task_id", "status_code", "message", "previous", "current",
+                 "timestamp", "fingerprint", "cached")
+
+    def __init__(self, catalog: TaskCatalog, task_id: int, status: int, message=None, previous=None,
+                 current=None, timestamp: float = 0.0, fingerprint: str = None, cached: bool = False):
+        self.catalog = catalog
+        self.task_id = task_id
+        self.status_code = status
+        self.message = message
+        self.previous = previous
+        self.current = current
+        self.timestamp = timestamp
+        self.fingerprint = fingerprint
+        self.cached = cached
+
+    @property
+    def task(self) -> Dict:
+        return self.catalog[self.task_id]
+
+    @property
+    def status(self) -> str:
+        return STATUSES[self.status_code]
+
+    def get(self, key: str, default=None):
+        if key == "status":
+            return self.status
+        if key == "timestamp":
+            return datetime.fromtimestamp(self.timestamp).isoformat() if self.timestamp else default
+        if key in TASK_FIELDS:
+            return self.task.get(key, "")
+        if key in RESULT_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return default
+
+    def __getitem__(self, key: str):
+        if key not in TASK_FIELDS and key not in RESULT_FIELDS:
+            raise KeyError(key)
+        return self.get(key)
+
+    def to_dict(self, details: bool = True) -> Dict:
+        """The result in the shape of a rule result dict plus its task fields."""
+        result = {"status": self.status, "message": self.message,
+                  "previous": self.previous, "current": self.current}
+        if self.fingerprint:
+            result["fingerprint"] = self.fingerprint
+        if self.cached:
+            result["cached"] = True
+        task = self.task
+        for field in TASK_FIELDS:
+            if details or field != "details":
+                result[field] = task.get(field, "")
+        result["timestamp"] = self.get("timestamp")
+        return result
+
+
+class ResultSet:
+    """
+    A run's results as parallel columns: task ids, status codes, timestamps
+    and cached flags in typed arrays, the rule-produced values in lists.
+    """
+
+    def __init__(self, catalog: TaskCatalog):
+        self.catalog = catalog
+        self.task_ids = array("I")
+        self.status_codes = array("B")
+        self.timestamps = array("d")
+        self.cached = array("B")
+        self.messages: List = []
+        self.previous: List = []
+        self.current: List = []
+        self.fingerprints: List[Optional[str]] = []
+
+    def append(self, task_id: int, result: Dict, timestamp: float = None):
+        """Add a rule result dict for the catalog task `task_id`."""
+        self.task_ids.append(task_id)
+        self.status_codes.append(status_code(result.get("status")))
+        self.timestamps.append(timestamp if timestamp is not None else datetime.now().timestamp())
+        self.cached.append(bool(result.get("cached")))
+        self.messages.append(result.get("message"))
+        self.previous.append(result.get("previous"))
+        self.current.append(result.get("current"))
+        self.fingerprints.append(result.get("fingerprint"))
+
+    def replace(self, index: int, result: Dict, timestamp: float = None):
+        """Overwrite the result at `index`, keeping its task."""
+        self.status_codes[index] = status_code(result.get("status"))
+        self.timestamps[index] = timestamp if timestamp is not None else datetime.now().timestamp()
+        self.cached[index] = bool(result.get("cached"))
+        self.messages[index] = result.get("message")
+        self.previous[index] = result.get("previous")
+        self.current[index] = result.get("current")
+        self.fingerprints[index] = result.get("fingerprint")
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+    def __getitem__(self, index: int) -> ResultRecord:
+        return ResultRecord(self.catalog, self.task_ids[index], self.status_codes[index],
+                            self.messages[index], self.previous[index], self.current[index],
+                            self.timestamps[index], self.fingerprints[index], bool(self.cached[index]))
+
+    def __iter__(self) -> Iterator[ResultRecord]:
+        for index in range(len(self.task_ids)):
+            yield self[index]
+
+    def count(self, status: str) -> int:
+        code = _STATUS_CODES.get(status)
+        return 0 if code is None else self.status_codes.count(code)
+
+    def to_dicts(self, details: bool = True) -> Iterator[Dict]:
+        """Result dicts, built one at a time."""
+        for record in self:
+            yield record.to_dict(details)
+
+    def details(self) -> Dict[str, str]:
+        """script_key (else title) -> details, once per task present in the set."""
+        catalog = {}
+        for task_id in sorted(set(self.task_ids)):
+            task = self.catalog[task_id]
+            key = task.get("script_key") or task.get("title") or ""
+            if task.get("details"):
+                catalog[key] = task["details"]
+        return catalog
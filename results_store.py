@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+HardenSys Results Store
+Persistent SQLite (WAL) store for compliance runs, results, actions and
+rollback records, shared by the CLI and the GUI.
+"""
+
+import os
+import socket
+import sqlite3
+import platform
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Use repo-local data directory: <repo>/data
+DATA_DIR = Path(__file__).resolve().parent / "data"
+DEFAULT_DB_PATH = DATA_DIR / "hardensys.db"
+# Rows buffered per table before they are written in one transaction
+BATCH_SIZE = 200
+# Rows fetched per query when iterating a large run
+PAGE_SIZE = 1000
+# Result statuses counted as passed: rule dicts use 'success', the GUI log 'Executed'
+PASSED_STATUSES = ("success", "Executed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    host TEXT,
+    platform TEXT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    total INTEGER,
+    passed INTEGER,
+    failed INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    script_key TEXT,
+    heading TEXT,
+    subheading TEXT,
+    title TEXT,
+    status TEXT,
+    severity TEXT,
+    previous TEXT,
+    current TEXT,
+    message TEXT,
+    timestamp TEXT NOT NULL,
+    fingerprint TEXT,
+    inputs TEXT,
+    cached INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_results_key_time ON results(script_key, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_title_time ON results(title, timestamp);
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id) ON DELETE CASCADE,
+    timestamp TEXT NOT NULL,
+    action TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_actions_run ON actions(run_id);
+CREATE INDEX IF NOT EXISTS idx_actions_time ON actions(timestamp);
+CREATE TABLE IF NOT EXISTS rollbacks (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id) ON DELETE SET NULL,
+    timestamp TEXT NOT NULL,
+    parameter TEXT,
+    backup_path TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_rollbacks_time ON rollbacks(timestamp);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    format TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    host TEXT,
+    run_id INTEGER REFERENCES runs(id) ON DELETE SET NULL,
+    passed INTEGER,
+    failed INTEGER,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_reports_created ON reports(created_at);
+"""
+
+_INSERTS = {
+    "results": "INSERT INTO results (run_id, script_key, heading, subheading, title, status, severity, "
+               "previous, current, message, timestamp, fingerprint, inputs, cached) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "actions": "INSERT INTO actions (run_id, timestamp, action, details) VALUES (?, ?, ?, ?)",
+    "rollbacks": "INSERT INTO rollbacks (run_id, timestamp, parameter, backup_path) VALUES (?, ?, ?, ?)",
+}
+
+
+def _text(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class ResultStore:
+    """
+    Thread-safe store. Rows are buffered and written in one transaction per
+    BATCH_SIZE rows, or whenever a query, finish_run() or flush() needs them.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size: int = BATCH_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._pending: Dict[str, List[tuple]] = {table: [] for table in _INSERTS}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        """Add columns introduced after a database was created."""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(results)")}
+        for name, definition in (("fingerprint", "TEXT"), ("inputs", "TEXT"),
+                                 ("cached", "INTEGER NOT NULL DEFAULT 0")):
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE results ADD COLUMN {name} {definition}")
+
+    # ---- writes ----
+
+    def _queue(self, table: str, row: tuple):
+        with self._lock:
+            self._pending[table].append(row)
+            if sum(len(rows) for rows in self._pending.values()) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Write every buffered row in a single transaction."""
+        with self._lock:
+            if not any(self._pending.values()):
+                return
+            with self._conn:
+                for table, rows in self._pending.items():
+                    if rows:
+                        self._conn.executemany(_INSERTS[table], rows)
+            for rows in self._pending.values():
+                rows.clear()
+
+    def start_run(self, source: str, started_at: str = None) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (source, host, platform, started_at) VALUES (?, ?, ?, ?)",
+                (source, socket.gethostname(), platform.platform(), started_at or datetime.now().isoformat()))
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int):
+        """Flush the run's rows and store its totals."""
+        with self._lock:
+            self.flush()
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE runs SET finished_at = ?, "
+                    "total = (SELECT COUNT(*) FROM results WHERE run_id = ?), "
+                    "passed = (SELECT COUNT(*) FROM results WHERE run_id = ? AND status IN (?, ?)), "
+                    "failed = (SELECT COUNT(*) FROM results WHERE run_id = ? AND status NOT IN (?, ?)) "
+                    "WHERE id = ?",
+                    (datetime.now().isoformat(), run_id, run_id, *PASSED_STATUSES,
+                     run_id, *PASSED_STATUSES, run_id))
+
+    def add_result(self, run_id: int, result: Dict, severity: str = None, inputs: str = None):
+        """
+        Queue a rule result dict (status/message/previous/current plus task
+        fields). inputs is the serialized input signature behind the
+        result's 'fingerprint', used to reuse it on the next run.
+        """
+        self._queue("results", (
+            run_id, result.get("script_key"), result.get("heading"), result.get("subheading"),
+            result.get("title"), result.get("status"), severity, _text(result.get("previous")),
+            _text(result.get("current")), _text(result.get("message")),
+            result.get("timestamp") or datetime.now().isoformat(),
+            result.get("fingerprint"), inputs, int(bool(result.get("cached")))))
+
+    def add_action(self, run_id: Optional[int], action: str, details: str = "", timestamp: str = None):
+        self._queue("actions", (run_id, timestamp or datetime.now().isoformat(), action, details))
+
+    def add_rollback(self, run_id: Optional[int], parameter: str, backup_path: str, timestamp: str = None):
+        self._queue("rollbacks", (run_id, timestamp or datetime.now().isoformat(), parameter, backup_path))
+
+    def delete_run(self, run_id: int):
+        with self._lock:
+            self.flush()
+            with self._conn:
+                self._conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def add_report(self, path: str, format: str, run_id: int = None, created_at: str = None,
+                   passed: int = None, failed: int = None):
+        """Index a generated report file (replacing any entry for the same path)."""
+        size = os.path.getsize(path) if os.path.exists(path) else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports (path, format, created_at, host, run_id, passed, failed, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(path), format, created_at or datetime.now().isoformat(), socket.gethostname(),
+                 run_id, passed, failed, size))
+
+    def delete_report(self, path: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reports WHERE path = ?", (str(path),))
+
+    def delete_rollbacks(self, backup_paths: List[str]):
+        """Drop the rollback points of backups that no longer exist."""
+        with self._lock:
+            self.flush()
+            with self._conn:
+                self._conn.executemany("DELETE FROM rollbacks WHERE backup_path = ?",
+                                       [(str(path),) for path in backup_paths])
+
+    def rename_report(self, path: str, new_path: str, size: int = None):
+        """Point an index entry at a moved (e.g. compressed) report file."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE reports SET path = ?, size = COALESCE(?, size) WHERE path = ?",
+                               (str(new_path), size, str(path)))
+
+    def clear_reports(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reports")
+
+    # ---- queries ----
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict]:
+        with self._lock:
+            self.flush()
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def _iter_rows(self, table: str, run_id: int, page_size: int) -> Iterator[Dict]:
+        """Rows of one run in id order, fetched page by page (keyset pagination)."""
+        last_id = 0
+        while True:
+            rows = self._query(f"SELECT * FROM {table} WHERE run_id = ? AND id > ? ORDER BY id LIMIT ?",
+                               (run_id, last_id, page_size))
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def iter_results(self, run_id: int, page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+        """Results of a run without loading them all at once."""
+        return self._iter_rows("results", run_id, page_size)
+
+    def iter_actions(self, run_id: int, page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+        """Actions of a run without loading them all at once."""
+        return self._iter_rows("actions", run_id, page_size)
+
+    def runs(self, limit: int = 50, source: str = None, finished: bool = False) -> List[Dict]:
+        conditions, params = [], []
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if finished:
+            conditions.append("finished_at IS NOT NULL")
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        return self._query(f"SELECT * FROM runs {where}ORDER BY id DESC LIMIT ?", tuple(params) + (limit,))
+
+    def run(self, run_id: int) -> Optional[Dict]:
+        rows = self._query("SELECT * FROM runs WHERE id = ?", (run_id,))
+        return rows[0] if rows else None
+
+    def results(self, run_id: int) -> List[Dict]:
+        return self._query("SELECT * FROM results WHERE run_id = ? ORDER BY id", (run_id,))
+
+    def actions(self, run_id: int = None, limit: int = None) -> List[Dict]:
+        where, params = ("WHERE run_id = ?", (run_id,)) if run_id is not None else ("", ())
+        if limit:
+            # Latest `limit` rows, returned oldest first
+            return self._query(f"SELECT * FROM (SELECT * FROM actions {where} ORDER BY id DESC LIMIT ?) "
+                               "ORDER BY id", params + (limit,))
+        return self._query(f"SELECT * FROM actions {where} ORDER BY id", params)
+
+    def latest_results(self) -> Dict[str, Dict]:
+        """script_key -> the most recent stored result of that rule."""
+        rows = self._query("SELECT r.* FROM results r JOIN (SELECT MAX(id) AS id FROM results "
+                           "WHERE script_key IS NOT NULL GROUP BY script_key) latest ON r.id = latest.id")
+        return {row["script_key"]: row for row in rows}
+
+    def last_evaluated(self) -> Dict[str, int]:
+        """script_key (else title) -> id of the rule's most recent stored result."""
+        rows = self._query("SELECT COALESCE(NULLIF(script_key, ''), title) AS rule, MAX(id) AS id FROM results "
+                           "WHERE COALESCE(NULLIF(script_key, ''), title) IS NOT NULL GROUP BY 1")
+        return {row["rule"]: row["id"] for row in rows}
+
+    def result_counts(self, run_id: int) -> Dict[str, int]:
+        """{'passed': n, 'failed': n} of one run, whether or not it is finished."""
+        rows = self._query("SELECT COALESCE(SUM(status IN (?, ?)), 0) AS passed, "
+                           "COALESCE(SUM(status NOT IN (?, ?) OR status IS NULL), 0) AS failed "
+                           "FROM results WHERE run_id = ?", (*PASSED_STATUSES, *PASSED_STATUSES, run_id))
+        return rows[0]
+
+    def reports(self, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """Indexed reports, newest first."""
+        return self._query("SELECT * FROM reports ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                           (limit, offset))
+
+    def report_count(self) -> int:
+        return self._query("SELECT COUNT(*) AS n FROM reports")[0]["n"]
+
+    def rollbacks(self, limit: int = 100) -> List[Dict]:
+        return self._query("SELECT * FROM rollbacks ORDER BY id DESC LIMIT ?", (limit,))
+
+    def history(self, key: str, limit: int = 50) -> List[Dict]:
+        """Latest results of one rule, by script_key or title."""
+        return self._query("SELECT * FROM results WHERE script_key = ? OR title = ? "
+                           "ORDER BY timestamp DESC LIMIT ?", (key, key, limit))
+
+    def count(self, table: str, run_id: int = None) -> int:
+        if table not in _INSERTS:
+            raise ValueError(f"Unknown table: {table}")
+        where, params = ("WHERE run_id = ?", (run_id,)) if run_id is not None else ("", ())
+        return self._query(f"SELECT COUNT(*) AS n FROM {table} {where}", params)[0]["n"]
+
+    def severity_counts(self, run_id: int) -> Dict[str, int]:
+        rows = self._query("SELECT UPPER(COALESCE(severity, '')) AS severity, COUNT(*) AS n "
+                           "FROM results WHERE run_id = ? GROUP BY 1", (run_id,))
+        return {row["severity"]: row["n"] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_store(path=None) -> ResultStore:
+    """Shared store for this process (DEFAULT_DB_PATH unless a path is given first)."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ResultStore(path or os.environ.get("HARDENSYS_DB", DEFAULT_DB_PATH))
+        return _default_store
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+HardenSys Retention
+Keeps reports/ and backup/ from growing forever. Each artifact group (HTML
+and PDF reports, secedit INF backups, Linux remediation backups) is pruned
+by its policy: keep the last N, keep the newest artifact of each day for X
+days, and stay under a size cap. Kept text artifacts beyond the newest few
+are gzip-compressed in place; open_artifact() and extracted() read them
+back transparently.
+"""
+
+import os
+import gzip
+import json
+import time
+import atexit
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+CONFIG_PATH = BASE_DIR / "retention.json"
+COMPRESSED_SUFFIX = ".gz"
+
+# group -> (directory relative to BASE_DIR, patterns); a pattern also matches its .gz form
+ARTIFACT_GROUPS = {
+    "html_reports": ("reports/html", ["*.html"]),
+    "pdf_reports": ("reports/pdf", ["*.pdf"]),
+    "policy_backups": ("backup", ["secpol_backup_*.inf"]),
+    "linux_backups": ("backup", ["linux_backup_*"]),
+}
+# Only text artifacts are compressed; PDFs are compressed already and
+# remediation backups are directories restored in place
+COMPRESSIBLE_SUFFIXES = (".html", ".inf", ".json", ".txt")
+
+DEFAULT_POLICY = {"keep_last": 20, "keep_daily_days": 30, "max_mb": None, "compress_after": 5}
+
+
+class RetentionPolicy:
+    """
+    keep_last: newest artifacts always kept; keep_daily_days: the newest
+    artifact of each of the last X days is kept too (with neither set,
+    everything is kept). max_mb: after compression, the oldest kept
+    artifacts are removed until the group fits (the newest is never
+    removed). compress_after: artifacts beyond the newest N are compressed.
+    """
+
+    def __init__(self, keep_last: Optional[int] = None, keep_daily_days: Optional[int] = None,
+                 max_mb: Optional[float] = None, compress_after: Optional[int] = None):
+        self.keep_last = keep_last
+        self.keep_daily_days = keep_daily_days
+        self.max_mb = max_mb
+        self.compress_after = compress_after
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RetentionPolicy":
+        return cls(data.get("keep_last"), data.get("keep_daily_days"), data.get("max_mb"), data.get("compress_after"))
+
+
+class Artifact:
+    __slots__ = ("path", "mtime", "size")
+
+    def __init__(self, path: Path):
+        self.path = path
+        stat = path.stat()
+        self.mtime = stat.st_mtime
+        self.size = _tree_size(path) if path.is_dir() else stat.st_size
+
+
+class RetentionResult:
+    def __init__(self):
+        self.deleted: List[str] = []
+        self.compressed: List[str] = []
+        self.freed = 0
+        self.errors: List[str] = []
+
+    def summary(self) -> str:
+        text = (f"{len(self.deleted)} removed, {len(self.compressed)} compressed, "
+                f"{self.freed / (1024 * 1024):.1f} MB freed")
+        return text + (f", {len(self.errors)} errors" if self.errors else "")
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def load_policies(path=CONFIG_PATH) -> Dict[str, RetentionPolicy]:
+    """
+    Policy per group: DEFAULT_POLICY overridden by a JSON file mapping group
+    (or "default") to policy fields, if the file exists.
+    """
+    config = {}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    base = dict(DEFAULT_POLICY, **config.get("default", {}))
+    return {group: RetentionPolicy.from_dict(dict(base, **config.get(group, {}))) for group in ARTIFACT_GROUPS}
+
+
+def find_artifacts(directory: Path, patterns: List[str]) -> List[Artifact]:
+    """Artifacts matching the patterns (plain or compressed), newest first."""
+    found = {}
+    for pattern in patterns:
+        for path in list(directory.glob(pattern)) + list(directory.glob(pattern + COMPRESSED_SUFFIX)):
+            try:
+                found[path] = Artifact(path)
+            except OSError:
+                continue
+    return sorted(found.values(), key=lambda a: a.mtime, reverse=True)
+
+
+def plan_retention(artifacts: List[Artifact], policy: RetentionPolicy, now: float = None) -> List[Artifact]:
+    """The artifacts (newest first) kept by the count and daily rules."""
+    if policy.keep_last is None and policy.keep_daily_days is None:
+        return list(artifacts)
+    keep = set()
+    if policy.keep_last:
+        keep.update(id(a) for a in artifacts[:policy.keep_last])
+    if policy.keep_daily_days:
+        cutoff = (now or time.time()) - policy.keep_daily_days * 86400
+        days = set()
+        for a in artifacts:
+            if a.mtime < cutoff:
+                break
+            day = time.strftime("%Y-%m-%d", time.localtime(a.mtime))
+            if day not in days:
+                days.add(day)
+                keep.add(id(a))
+    return [a for a in artifacts if id(a) in keep]
+
+
+def compress_file(path: Path) -> Path:
+    """gzip a file in place (keeping its mtime) and return the compressed path."""
+    target = path.with_name(path.name + COMPRESSED_SUFFIX)
+    tmp = target.with_name(target.name + ".tmp")
+    stat = path.stat()
+    with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.chmod(tmp, stat.st_mode & 0o7777)
+    os.utime(tmp, (stat.st_atime, stat.st_mtime))
+    os.replace(tmp, target)
+    path.unlink()
+    return target
+
+
+def _remove(artifact: Artifact, result: RetentionResult, store, dry_run: bool):
+    if not dry_run:
+        if artifact.path.is_dir():
+            shutil.rmtree(artifact.path)
+        else:
+            artifact.path.unlink()
+        if store is not None:
+            path = str(artifact.path)
+            store.delete_report(path)
+            # Rollback points name the backup as recorded, before any compression
+            store.delete_rollbacks([original_path(path)])
+    result.deleted.append(str(artifact.path))
+    result.freed += artifact.size
+
+
+def apply_group(group: str, policy: RetentionPolicy, store=None, dry_run: bool = False,
+                base_dir: Path = BASE_DIR, result: RetentionResult = None) -> RetentionResult:
+    """
+    Apply one group's policy. `store` (a ResultStore) has its report index
+    and the rollback points of removed backups kept in step.
+    """
+    result = result or RetentionResult()
+    directory, patterns = ARTIFACT_GROUPS[group]
+    directory = Path(base_dir) / directory
+    if not directory.is_dir():
+        return result
+    artifacts = find_artifacts(directory, patterns)
+    kept = plan_retention(artifacts, policy)
+    kept_ids = {id(a) for a in kept}
+    for artifact in artifacts:
+        if id(artifact) not in kept_ids:
+            try:
+                _remove(artifact, result, store, dry_run)
+            except OSError as e:
+                result.errors.append(f"{artifact.path}: {e}")
+
+    if policy.compress_after is not None:
+        for artifact in kept[policy.compress_after:]:
+            path = artifact.path
+            if path.is_dir() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+                continue
+            result.compressed.append(str(path))
+            if dry_run:
+                continue
+            try:
+                compressed = compress_file(path)
+            except OSError as e:
+                result.errors.append(f"{path}: {e}")
+                continue
+            new_size = compressed.stat().st_size
+            result.freed += artifact.size - new_size
+            artifact.path, artifact.size = compressed, new_size
+            if store is not None:
+                store.rename_report(str(path), str(compressed), new_size)
+
+    if policy.max_mb is not None:
+        limit = policy.max_mb * 1024 * 1024
+        total = sum(a.size for a in kept)
+        while total > limit and len(kept) > 1:
+            artifact = kept.pop()
+            total -= artifact.size
+            try:
+                _remove(artifact, result, store, dry_run)
+            except OSError as e:
+                result.errors.append(f"{artifact.path}: {e}")
+    return result
+
+
+def apply_retention(groups: List[str] = None, policies: Dict[str, RetentionPolicy] = None, store=None,
+                    dry_run: bool = False, base_dir: Path = BASE_DIR) -> RetentionResult:
+    """Apply the retention policies of `groups` (default: all groups)."""
+    policies = policies or load_policies()
+    result = RetentionResult()
+    for group in groups or ARTIFACT_GROUPS:
+        apply_group(group, policies[group], store, dry_run, base_dir, result)
+    return result
+
+
+# ---- reading retained artifacts ----
+
+def is_compressed(path) -> bool:
+    return str(path).endswith(COMPRESSED_SUFFIX)
+
+
+def original_path(path) -> str:
+    """The path an artifact was recorded under, before retention compressed it."""
+    path = str(path)
+    return path[:-len(COMPRESSED_SUFFIX)] if is_compressed(path) else path
+
+
+def resolve_artifact(path) -> str:
+    """The path as recorded, or its compressed form if retention compressed it since."""
+    path = str(path)
+    if not os.path.exists(path) and os.path.exists(path + COMPRESSED_SUFFIX):
+        return path + COMPRESSED_SUFFIX
+    return path
+
+
+def open_artifact(path, mode: str = "rb", encoding: str = None):
+    """Open an artifact for reading, decompressing it if needed."""
+    path = resolve_artifact(path)
+    if is_compressed(path):
+        return gzip.open(path, mode if "b" in mode else "rt", encoding=encoding)
+    return open(path, mode, encoding=encoding)
+
+
+def decompress_to(path, target):
+    """Write the (decompressed) content of an artifact to `target`."""
+    with open_artifact(path) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+
+@contextlib.contextmanager
+def extracted(path) -> Iterator[str]:
+    """A plain file path for an artifact: itself, or a temporary decompressed copy."""
+    path = resolve_artifact(path)
+    if not is_compressed(path):
+        yield path
+        return
+    directory = tempfile.mkdtemp(prefix="hardensys_")
+    target = os.path.join(directory, os.path.basename(path)[:-len(COMPRESSED_SUFFIX)])
+    try:
+        decompress_to(path, target)
+        yield target
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+_view_dirs: List[str] = []
+
+
+def _remove_view_dirs():
+    for directory in _view_dirs:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+atexit.register(_remove_view_dirs)
+
+
+def extract_for_viewing(path) -> str:
+    """
+    Decompressed copy of an artifact for an external viewer (browser, PDF
+    reader) that opens it after we return. Each copy gets its own private
+    mkdtemp() directory, removed when this process exits.
+    """
+    path = resolve_artifact(path)
+    if not is_compressed(path):
+        return path
+    directory = tempfile.mkdtemp(prefix="hardensys_view_")
+    _view_dirs.append(directory)
+    target = os.path.join(directory, os.path.basename(path)[:-len(COMPRESSED_SUFFIX)])
+    decompress_to(path, target)
+    return target
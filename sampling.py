@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+HardenSys Sampling Audit
+Evaluates a stratified subset of rules instead of the whole catalog and
+estimates pass rates from it. Each heading is a stratum contributing at
+least ceil(rules / period) rules; within a heading the rules evaluated
+longest ago (never evaluated first, ties at random) are taken, so coverage
+rotates and every rule is evaluated at least once per `period` sampled runs.
+"""
+
+import math
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from report_stream import rule_id
+
+DEFAULT_FRACTION = 0.1
+# Sampled runs within which every rule is evaluated at least once
+DEFAULT_PERIOD = 24
+Z_95 = 1.96
+
+
+def _rate(value: float) -> float:
+    return round(value * 100, 1)
+
+
+def stratify(tasks: List[Dict], task_ids: Iterable[int]) -> Dict[str, List[int]]:
+    """heading -> task ids, in catalog order."""
+    strata: Dict[str, List[int]] = {}
+    for task_id in task_ids:
+        strata.setdefault(tasks[task_id].get("heading") or "", []).append(task_id)
+    return strata
+
+
+def sample_size(population: int, fraction: float, period: int) -> int:
+    """Rules taken from a stratum: the fraction, but enough to cover it within `period` runs."""
+    if population <= 0:
+        return 0
+    return min(population, max(1, math.ceil(population * fraction), math.ceil(population / period)))
+
+
+def select_sample(tasks: List[Dict], task_ids: Iterable[int], last_seen: Dict[str, int],
+                  fraction: float = DEFAULT_FRACTION, period: int = DEFAULT_PERIOD,
+                  rng: random.Random = None) -> List[int]:
+    """
+    Task ids to evaluate, in catalog order. last_seen maps a rule id
+    (script_key, else title) to an increasing marker of its latest stored
+    evaluation, such as the result row id.
+    """
+    rng = rng or random.Random()
+    chosen = []
+    for ids in stratify(tasks, task_ids).values():
+        order = sorted(ids, key=lambda i: (last_seen.get(rule_id(tasks[i]), -1), rng.random()))
+        chosen.extend(order[:sample_size(len(ids), fraction, period)])
+    return sorted(chosen)
+
+
+def wilson_interval(passed: int, sampled: int, population: int = None, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Wilson score interval of a pass rate. With a population, sampling
+    without replacement narrows it (finite population correction); a fully
+    evaluated population gives the exact rate.
+    """
+    if sampled <= 0:
+        return 0.0, 1.0
+    p = passed / sampled
+    n = sampled
+    if population:
+        if sampled >= population:
+            return p, p
+        if population > 1:
+            n = sampled * (population - 1) / (population - sampled)
+    centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def estimate_pass_rates(strata: Dict[str, Tuple[int, int, int]], z: float = Z_95) -> Dict:
+    """
+    Estimates from heading -> (rules, sampled, passed). The overall rate
+    weights each heading by its number of rules; its interval is the
+    stratified normal interval, with each heading's variance taken at the
+    Agresti-Coull rate (passed + 2) / (sampled + 4) so that headings sampled
+    as all-pass or all-fail still add uncertainty.
+    """
+    headings = {}
+    total = sum(population for population, _, _ in strata.values())
+    overall = variance = 0.0
+    for heading, (population, sampled, passed) in sorted(strata.items()):
+        low, high = wilson_interval(passed, sampled, population, z)
+        rate = passed / sampled if sampled else 0.0
+        headings[heading] = {"rules": population, "sampled": sampled, "passed": passed,
+                             "pass_rate": _rate(rate), "ci": [_rate(low), _rate(high)]}
+        if total and sampled:
+            weight = population / total
+            overall += weight * rate
+            if sampled < population:
+                adjusted = (passed + 2) / (sampled + 4)
+                fpc = (population - sampled) / (population - 1)
+                variance += weight * weight * fpc * adjusted * (1 - adjusted) / sampled
+    half = z * math.sqrt(variance)
+    ci = [_rate(max(0.0, overall - half)), _rate(min(1.0, overall + half))]
+    if len(headings) == 1:
+        # A single heading is its own estimate
+        ci = list(next(iter(headings.values()))["ci"])
+    return {
+        "rules": total,
+        "sampled": sum(s for _, s, _ in strata.values()),
+        "pass_rate": _rate(overall),
+        "ci": ci,
+        "headings": headings,
+    }
+
+
+def sample_strata(population: Dict[str, int], results: Iterable) -> Dict[str, Tuple[int, int, int]]:
+    """heading -> (rules, sampled, passed) from sampled results (dicts or ResultRecords)."""
+    counts = {heading: [0, 0] for heading in population}
+    for result in results:
+        heading = result.get("heading") or ""
+        if heading in counts:
+            counts[heading][0] += 1
+            counts[heading][1] += result.get("status") == "success"
+    return {heading: (population[heading], sampled, passed) for heading, (sampled, passed) in counts.items()}
+
+
+def format_estimates(estimates: Dict, period: Optional[int] = None) -> List[str]:
+    """Text report lines for estimate_pass_rates() output."""
+    lines = [
+        f"Sampled: {estimates['sampled']} of {estimates['rules']} rules"
+        + (f", full coverage every {period} sampled runs" if period else ""),
+        f"Estimated pass rate: {estimates['pass_rate']}% "
+        f"(95% CI {estimates['ci'][0]}-{estimates['ci'][1]}%)",
+    ]
+    for heading, h in estimates["headings"].items():
+        lines.append(f"  {heading or 'Unknown'}: {h['pass_rate']}% (95% CI {h['ci'][0]}-{h['ci'][1]}%), "
+                     f"{h['passed']}/{h['sampled']} passed of {h['rules']} rules")
+    return lines
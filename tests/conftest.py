@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep test runs from writing the persistent fact cache under cache/
+os.environ.setdefault("HARDENSYS_FACT_CACHE", "0")
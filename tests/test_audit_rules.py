@@ -0,0 +1,81 @@
+import os
+
+from linux_tasks import AuditRuleset, load_disk_audit_rules, parse_audit_rule
+
+AUDIT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "audit")
+
+
+def _lines(name):
+    with open(os.path.join(AUDIT_FIXTURES, name), encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_comparison_field_with_C():
+    rule = parse_audit_rule("-a always,exit -F arch=b64 -C euid!=uid -F auid!=unset -S execve -k user_emulation")
+    assert rule.kind == "syscall"
+    assert rule.list_action == "always,exit"
+    assert rule.syscalls == {"execve"}
+    assert ("C:euid", "!=", "uid") in rule.fields
+    assert rule.key == "user_emulation"
+
+
+def test_C_operands_match_in_either_order():
+    written = parse_audit_rule("-a always,exit -F arch=b64 -C euid!=uid -S execve")
+    listed = parse_audit_rule("-a always,exit -F arch=b64 -S execve -C uid!=euid")
+    assert written.atoms() == listed.atoms()
+
+
+def test_unset_auid_spellings_are_equal():
+    atoms = [parse_audit_rule(f"-a always,exit -F arch=b64 -S execve -F auid!={value}").atoms()
+             for value in ("unset", "-1", "4294967295")]
+    assert atoms[0] == atoms[1] == atoms[2]
+
+
+def test_key_does_not_take_part_in_matching():
+    assert (parse_audit_rule("-w /etc/sudoers -p wa -k scope").atoms()
+            == parse_audit_rule("-w /etc/sudoers -p wa -F key=other").atoms())
+
+
+def test_watch_and_listed_path_rule_are_equal():
+    watch = parse_audit_rule("-w /etc/sudoers.d/ -p aw")
+    listed = parse_audit_rule("-a always,exit -S all -F dir=/etc/sudoers.d -F perm=wa -F key=scope")
+    assert watch.kind == listed.kind == "watch"
+    assert watch.atoms() == listed.atoms() == {
+        ("watch", "/etc/sudoers.d", "a", frozenset()), ("watch", "/etc/sudoers.d", "w", frozenset())}
+
+
+def test_syscall_rules_split_into_one_atom_per_syscall():
+    rule = parse_audit_rule("-a exit,always -F arch=b64 -S adjtimex,settimeofday")
+    assert {atom[3] for atom in rule.atoms()} == {"adjtimex", "settimeofday"}
+    assert {atom[1] for atom in rule.atoms()} == {"always,exit"}
+
+
+def test_control_and_comment_lines():
+    assert parse_audit_rule("# comment") is None
+    assert parse_audit_rule("   ") is None
+    control = parse_audit_rule("-e 2")
+    assert control.kind == "control"
+    assert control.atoms() == {("control", ("-e", "2"))}
+
+
+def test_disk_rules_cover_required_lines():
+    disk = load_disk_audit_rules(os.path.join(AUDIT_FIXTURES, "rules.d"))
+    required = AuditRuleset.from_lines([
+        "-w /etc/sudoers -p wa",
+        "-w /etc/sudoers.d -p wa",
+        "-a always,exit -F arch=b64 -C euid!=uid -F auid!=unset -S execve",
+        "-a always,exit -F arch=b64 -S clock_settime -F a0=0x0",
+    ], "required")
+    assert disk.missing(required) == set()
+    assert [r.source.rsplit("/", 1)[-1] for r in disk.controls()] == ["99-finalize.rules:1"]
+
+
+def test_running_rules_report_only_the_missing_atoms():
+    running = AuditRuleset.from_lines(_lines("auditctl-l.txt"), "auditctl")
+    required = AuditRuleset.from_lines([
+        "-w /etc/sudoers -p wa",
+        "-w /etc/sudoers.d -p wa",
+        "-a always,exit -F arch=b64 -C euid!=uid -F auid!=unset -S execve",
+        "-a always,exit -F arch=b64 -S adjtimex,settimeofday",
+    ], "required")
+    assert running.missing(required) == {("syscall", "always,exit", "b64", "settimeofday", frozenset())}
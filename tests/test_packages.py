@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from linux_tasks import DpkgPackageIndex, compare_debian_versions
+
+STATUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "packages", "status")
+
+
+@pytest.mark.parametrize("older, newer", [
+    ("1.0", "1.1"),
+    ("1.9", "1.10"),                    # digit runs compare numerically
+    ("9.9", "1:0.1"),                   # any epoch beats no epoch
+    ("1:2.0", "2:1.0"),
+    ("1.0~rc1", "1.0"),                 # tilde sorts before the end of the string
+    ("1.0~~", "1.0~"),
+    ("1.0~rc1", "1.0~rc2"),
+    ("1.0", "1.0a"),                    # the end sorts before letters
+    ("1.0a", "1.0+"),                   # letters sort before other characters
+    ("1.0", "1.0.1"),
+    ("1.0-1", "1.0-1ubuntu1"),          # revisions compare with the same rules
+    ("1.0-1ubuntu1~22.04", "1.0-1ubuntu1"),
+    ("1.0-beta-1", "1.0-beta-2"),       # the revision is after the last hyphen
+])
+def test_version_ordering(older, newer):
+    assert compare_debian_versions(older, newer) == -1
+    assert compare_debian_versions(newer, older) == 1
+
+
+@pytest.mark.parametrize("a, b", [
+    ("1.0", "1.0"),
+    ("0:1.0", "1.0"),                   # epoch 0 is the default
+    ("1.0", "1.0-0"),                   # a missing revision is 0
+    ("1.01", "1.1"),
+])
+def test_version_equality(a, b):
+    assert compare_debian_versions(a, b) == 0
+
+
+def _index():
+    index = DpkgPackageIndex()
+    index.status_file = STATUS_FILE
+    return index.load()
+
+
+def test_status_database_stanzas():
+    index = _index()
+    assert index.version("openssh-server") == "1:9.6p1-3ubuntu13.5"
+    assert not index.installed("telnet")
+    assert index.get("telnet") == ("config-files", "0.17+2.5-3ubuntu4")
+    assert index.get("missing") is None
+
+
+def test_multiarch_keeps_the_installed_architecture():
+    assert _index().get("libc6") == ("installed", "2.39-0ubuntu8.3")
+
+
+def test_version_at_least():
+    index = _index()
+    assert index.version_at_least("openssh-server", "1:9.6p1-3ubuntu13")
+    assert not index.version_at_least("openssh-server", "1:9.6p1-3ubuntu14")
+    assert not index.version_at_least("sudo", "1.9.15p5-3ubuntu5")
+    assert not index.version_at_least("telnet", "0.1")
@@ -0,0 +1,50 @@
+import os
+
+from linux_tasks import PamIndex, _parse_module_options, _split_pam_tokens
+
+PAM_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pam")
+
+
+def _index():
+    return PamIndex(os.path.join(PAM_FIXTURES, "pam.d"), os.path.join(PAM_FIXTURES, "security"))
+
+
+def test_bracketed_control_is_one_token():
+    assert _split_pam_tokens("auth [success=1 default=ignore] pam_unix.so nullok") == [
+        "auth", "[success=1 default=ignore]", "pam_unix.so", "nullok"]
+
+
+def test_escaped_bracket_and_comment_inside_brackets():
+    tokens = _split_pam_tokens(r"password requisite pam_pwquality.so [badwords=foo\] bar#baz] minlen=14 # note")
+    assert tokens == ["password", "requisite", "pam_pwquality.so", "[badwords=foo] bar#baz]", "minlen=14"]
+    assert _parse_module_options(tokens[3:]) == {"badwords": "foo] bar#baz", "minlen": "14"}
+
+
+def test_trailing_comment_is_dropped():
+    assert _split_pam_tokens("auth required pam_deny.so # deny all") == ["auth", "required", "pam_deny.so"]
+
+
+def test_includes_and_substacks_are_expanded_in_order():
+    stack = _index().stack("login")
+    assert [(e.type, e.module) for e in stack] == [
+        ("auth", "pam_unix.so"),
+        ("auth", "pam_deny.so"),
+        ("auth", "pam_faillock.so"),
+        ("auth", "pam_gnome_keyring.so"),
+        ("password", "pam_pwquality.so"),
+        ("password", "pam_unix.so"),
+        ("session", "pam_limits.so"),
+    ]
+    assert [e.optional for e in stack if e.type == "auth"] == [False, False, False, True]
+
+
+def test_continuation_lines_are_joined():
+    unix = _index().find("common-password", "pam_unix.so")[0]
+    assert unix.args == ["obscure", "use_authtok", "yescrypt", "remember=5"]
+    assert unix.source.endswith("common-password:3")
+
+
+def test_line_arguments_override_module_config():
+    # pwquality.conf.d is read before pwquality.conf; the PAM line wins over both
+    options = _index().effective_options("login", "pam_pwquality.so", "password")
+    assert options == [{"minlen": "14", "dcredit": "-1", "ucredit": "-1", "retry": "3", "badwords": "foo] bar#baz"}]
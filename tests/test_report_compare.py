@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from report_compare import FIX, NEW, REGRESSION, REMOVED, VALUE_CHANGE, compare_series, load_snapshot
+from results_store import ResultStore
+
+REPORTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "reports")
+BEFORE = os.path.join(REPORTS, "before.json")
+AFTER = os.path.join(REPORTS, "after.json")
+
+
+def test_diff_joins_by_rule_id():
+    diff = next(compare_series([BEFORE, AFTER]))
+    assert {kind: diff.counts[kind] for kind in (REGRESSION, FIX, NEW, REMOVED, VALUE_CHANGE)} == {
+        REGRESSION: 1, FIX: 1, NEW: 1, REMOVED: 1, VALUE_CHANGE: 1}
+    kinds = {c["rule"]: c["kind"] for changes in diff.changes.values() for c in changes}
+    assert kinds["sudo_use_pty"] == REGRESSION
+    assert kinds["ufw_default_deny"] == FIX
+    assert kinds["telnet_removed"] == REMOVED
+    assert kinds["nis_removed"] == NEW
+    # Without a script_key the title identifies the rule
+    assert kinds['Ensure "auditd" is installed ✓ – ünïcode'] == VALUE_CHANGE
+
+
+def test_snapshot_keeps_null_current_as_empty():
+    snapshot = load_snapshot(BEFORE)
+    assert snapshot['Ensure "auditd" is installed ✓ – ünïcode'][3] == ""
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+
+    def run(source, keys, finish=True):
+        run_id = store.start_run(source)
+        for key in keys:
+            store.add_result(run_id, {"script_key": key, "title": key, "heading": "H", "status": "success"})
+        if finish:
+            store.finish_run(run_id)
+        return run_id
+
+    run("cli", ["a", "b", "c"])
+    run("cli", ["a", "b"])
+    run("gui", ["g"])
+    run("cli-sample", ["a"])
+    run("cli", ["unfinished"], finish=False)
+    yield store
+    store.close()
+
+
+def test_latest_runs_count_finished_cli_runs(store):
+    assert sorted(load_snapshot("run:latest", store)) == ["a", "b"]
+    assert sorted(load_snapshot("run:-2", store)) == ["a", "b", "c"]
+
+
+def test_source_qualifier(store):
+    assert sorted(load_snapshot("run:gui:latest", store)) == ["g"]
+    assert sorted(load_snapshot("run:cli-sample:-1", store)) == ["a"]
+    assert sorted(load_snapshot("run:5", store)) == ["unfinished"]
+
+
+@pytest.mark.parametrize("source", ["run:-0", "run:-3", "run:gui:-2", "run:gui:5"])
+def test_invalid_run_references(store, source):
+    with pytest.raises(ValueError):
+        load_snapshot(source, store)
@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from report_stream import expand_report_paths, iter_report, iter_report_results
+
+REPORTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "reports")
+BEFORE = os.path.join(REPORTS, "before.json")
+AFTER = os.path.join(REPORTS, "after.json")
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 16, 64, 1 << 16])
+def test_tokens_split_across_read_chunks(chunk_size):
+    # Every chunk size puts strings, escapes, numbers and literals across boundaries
+    expected = _load(BEFORE)
+    members = list(iter_report(BEFORE, chunk_size))
+    assert [value for key, value in members if key == "result"] == expected["results"]
+    assert dict((key, value) for key, value in members if key != "result") == {
+        "summary": expected["summary"], "timestamp": expected["timestamp"]}
+
+
+@pytest.mark.parametrize("number", ["12345", "1.5", "1e5", "1.25e-3", "-0.5E+2"])
+def test_number_at_the_end_of_a_chunk(tmp_path, number):
+    path = tmp_path / "report.json"
+    path.write_text('{"results": [], "n": ' + number + "}", encoding="utf-8")
+    for chunk_size in range(1, len(path.read_text()) + 1):
+        assert dict(iter_report(str(path), chunk_size))["n"] == json.loads(number)
+
+
+def test_empty_report_and_results(tmp_path):
+    empty = tmp_path / "empty.json"
+    empty.write_text("{ }", encoding="utf-8")
+    assert list(iter_report(str(empty))) == []
+    no_results = tmp_path / "none.json"
+    no_results.write_text('{"results": [ ], "total": 0}', encoding="utf-8")
+    assert list(iter_report(str(no_results), 2)) == [("total", 0)]
+
+
+def test_truncated_report_raises(tmp_path):
+    path = tmp_path / "truncated.json"
+    path.write_text('{"results": [{"title": "a"}, {"title": "b', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_report_results(str(path)))
+
+
+def test_expand_report_paths():
+    assert expand_report_paths([REPORTS, "run:latest"]) == [AFTER, BEFORE, "run:latest"]
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from sampling import (estimate_pass_rates, format_estimates, sample_size, sample_strata, select_sample,
+                      wilson_interval)
+
+
+def test_wilson_bounds_at_zero_and_one():
+    low, high = wilson_interval(0, 20)
+    assert low == 0.0 and 0.0 < high < 0.2
+    low, high = wilson_interval(20, 20)
+    assert high == 1.0 and 0.8 < low < 1.0
+
+
+def test_wilson_is_symmetric():
+    low, high = wilson_interval(3, 20)
+    mirror_low, mirror_high = wilson_interval(17, 20)
+    assert low == pytest.approx(1 - mirror_high)
+    assert high == pytest.approx(1 - mirror_low)
+
+
+def test_wilson_known_value():
+    # 8/10 at 95%: the textbook Wilson interval is 0.490-0.943
+    low, high = wilson_interval(8, 10)
+    assert (round(low, 3), round(high, 3)) == (0.49, 0.943)
+
+
+def test_finite_population_narrows_the_interval():
+    infinite = wilson_interval(5, 10)
+    finite = wilson_interval(5, 10, population=20)
+    assert infinite[0] < finite[0] < 0.5 < finite[1] < infinite[1]
+
+
+def test_wilson_edge_cases():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    assert wilson_interval(7, 10, population=10) == (0.7, 0.7)
+    assert wilson_interval(1, 1, population=1) == (1.0, 1.0)
+
+
+def test_sample_size():
+    assert sample_size(0, 0.1, 24) == 0
+    assert sample_size(5, 0.1, 24) == 1
+    assert sample_size(100, 0.1, 24) == 10
+    assert sample_size(100, 0.01, 24) == 5       # ceil(100 / 24) covers the heading within 24 runs
+    assert sample_size(3, 1.0, 24) == 3
+
+
+def _tasks():
+    return ([{"heading": "A", "script_key": f"a{i}"} for i in range(30)]
+            + [{"heading": "B", "script_key": f"b{i}"} for i in range(7)])
+
+
+def test_every_rule_is_evaluated_within_the_period():
+    tasks = _tasks()
+    rng = random.Random(1)
+    last_seen, seen = {}, set()
+    for run in range(5):
+        chosen = select_sample(tasks, range(len(tasks)), last_seen, fraction=0.1, period=5, rng=rng)
+        assert chosen == sorted(chosen)
+        assert sum(tasks[i]["heading"] == "A" for i in chosen) == 6
+        assert sum(tasks[i]["heading"] == "B" for i in chosen) == 2
+        for marker, i in enumerate(chosen):
+            last_seen[tasks[i]["script_key"]] = run * 100 + marker
+            seen.add(i)
+    assert seen == set(range(len(tasks)))
+
+
+def test_never_evaluated_rules_come_first():
+    tasks = _tasks()
+    last_seen = {task["script_key"]: 1 for task in tasks if task["script_key"] != "a7"}
+    chosen = select_sample(tasks, range(30), last_seen, fraction=0.01, period=30, rng=random.Random(0))
+    assert chosen == [7]
+
+
+def test_single_heading_estimate_is_its_own_interval():
+    estimates = estimate_pass_rates({"A": (100, 10, 10)})
+    assert estimates["pass_rate"] == 100.0
+    assert estimates["ci"] == estimates["headings"]["A"]["ci"]
+    assert estimates["ci"][1] == 100.0 and estimates["ci"][0] < 100.0
+
+
+def test_stratified_estimate():
+    estimates = estimate_pass_rates({"A": (300, 30, 15), "B": (100, 10, 10)})
+    # Headings are weighted by their number of rules: 0.75 * 50% + 0.25 * 100%
+    assert estimates["pass_rate"] == 62.5
+    assert estimates["rules"] == 400 and estimates["sampled"] == 40
+    low, high = estimates["ci"]
+    assert 0.0 < low < 62.5 < high < 100.0
+
+
+def test_fully_evaluated_headings_have_no_uncertainty():
+    estimates = estimate_pass_rates({"A": (4, 4, 1), "B": (4, 4, 3)})
+    assert estimates["pass_rate"] == 50.0
+    assert estimates["ci"] == [50.0, 50.0]
+
+
+def test_sample_strata_and_format():
+    results = [{"heading": "A", "status": "success"}, {"heading": "A", "status": "error"},
+               {"heading": None, "status": "success"}, {"heading": "Other", "status": "success"}]
+    strata = sample_strata({"A": 20, "": 5}, results)
+    assert strata == {"A": (20, 2, 1), "": (5, 1, 1)}
+    lines = format_estimates(estimate_pass_rates(strata), period=24)
+    assert lines[0] == "Sampled: 3 of 25 rules, full coverage every 24 sampled runs"
+    assert any(line.startswith("  Unknown: 100.0%") for line in lines)
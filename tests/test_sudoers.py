@@ -0,0 +1,62 @@
+import os
+
+from linux_tasks import SudoersModel, _split_sudoers_list
+
+SUDOERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sudoers")
+
+
+def _model():
+    return SudoersModel(os.path.join(SUDOERS_DIR, "sudoers")).load()
+
+
+def _relative(paths):
+    return [os.path.relpath(path, SUDOERS_DIR) for path in paths]
+
+
+def test_includedir_files_read_in_order_skipping_dotted_and_backup_names():
+    model = _model()
+    assert _relative(model.files) == [
+        "sudoers", "sudoers.local",
+        os.path.join("sudoers.d", "10-logging"), os.path.join("sudoers.d", "20-ops"),
+        os.path.join("sudoers.d", "30-timeout"), os.path.join("sudoers.d", "40-loop"),
+        os.path.join("sudoers.d", "README"),
+    ]
+    assert _relative(model.directories) == ["sudoers.d"]
+
+
+def test_source_paths_cover_the_include_tree():
+    model = _model()
+    assert set(model.source_paths()) == set(model.directories) | set(model.files)
+
+
+def test_later_files_override_settings():
+    model = _model()
+    assert model.setting("timestamp_timeout") == "5"
+    assert model.setting("use_pty") is True
+    assert model.setting("logfile") == "/var/log/sudo.log"
+    assert model.setting("requiretty", ":alice") is False
+    assert model.setting("requiretty") is None
+
+
+def test_default_sources_point_at_the_defining_line():
+    sources = _model().default_sources("timestamp_timeout")
+    assert _relative(sources) == ["sudoers:5", os.path.join("sudoers.d", "30-timeout:1")]
+
+
+def test_quoted_values_and_escaped_commas():
+    model = _model()
+    assert model.setting("secure_path") == "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin"
+    # The escaped comma does not split the parameter
+    assert model.setting("passprompt").endswith("please: ")
+
+
+def test_tags_and_aliases():
+    model = _model()
+    assert [text for text, _ in model.specs_with_tag("NOPASSWD")] == ["%ops	ALL=(ALL) NOPASSWD: ALL"]
+    assert len(model.specs_with_tag("NOEXEC")) == 1
+    kind, members = model.aliases["SHUTDOWN"]
+    assert (kind, [m.strip() for m in members.split(",")]) == ("Cmnd_Alias", ["/sbin/shutdown", "/sbin/reboot"])
+
+
+def test_split_list_keeps_quoted_and_escaped_commas():
+    assert _split_sudoers_list('a, b="x,y", c\\,d') == ["a", 'b="x,y"', "c\\,d"]
@@ -0,0 +1,57 @@
+import os
+
+from linux_tasks import UfwRule, UfwRuleset, _parse_ufw_tuple
+
+UFW_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ufw")
+
+
+def _ruleset():
+    return UfwRuleset(os.path.join(UFW_FIXTURES, "ufw"), os.path.join(UFW_FIXTURES, "default-ufw")).load()
+
+
+def test_v6_tuple():
+    rule = _parse_ufw_tuple("### tuple ### allow udp 53 ::/0 any 2001:db8::/32 in", True)
+    assert rule == UfwRule("allow", "udp", "53", "::/0", "any", "2001:db8::/32", "in", None, True)
+
+
+def test_v6_loopback_deny_tuple():
+    rule = _parse_ufw_tuple("### tuple ### deny any any ::/0 any ::1 in", True)
+    assert (rule.action, rule.src, rule.direction, rule.v6) == ("deny", "::1", "in", True)
+
+
+def test_application_names_and_comment_are_skipped():
+    rule = _parse_ufw_tuple("### tuple ### allow tcp 22 0.0.0.0/0 any 0.0.0.0/0 OpenSSH - in comment=6f70", False)
+    assert rule == UfwRule("allow", "tcp", "22", "0.0.0.0/0", "any", "0.0.0.0/0", "in", None, False)
+
+
+def test_interface_suffix():
+    rule = _parse_ufw_tuple("### tuple ### allow tcp 5432 0.0.0.0/0 any 0.0.0.0/0 in_lo", False)
+    assert (rule.direction, rule.interface) == ("in", "lo")
+
+
+def test_truncated_tuple():
+    assert _parse_ufw_tuple("### tuple ### allow tcp 22", False) is None
+
+
+def test_config_and_default_policies():
+    ruleset = _ruleset()
+    assert ruleset.installed and ruleset.enabled
+    assert [ruleset.policy(chain) for chain in ("INPUT", "OUTPUT", "FORWARD")] == ["DROP", "ACCEPT", "REJECT"]
+    assert len([r for r in ruleset.rules if r.v6]) == 3
+
+
+def test_uncovered_ports():
+    open_ports = {("tcp", 22), ("tcp", 443), ("udp", 6005), ("udp", 53), ("tcp", 5432), ("tcp", 8080), ("udp", 7000)}
+    # 5432 is only allowed on lo and 8080 only as a route rule
+    assert _ruleset().uncovered_ports(open_ports) == [("tcp", 5432), ("tcp", 8080), ("udp", 7000)]
+
+
+def test_loopback_configured():
+    assert _ruleset().loopback_configured() == []
+
+
+def test_loopback_deny_is_checked_per_address_family():
+    ruleset = _ruleset()
+    ruleset.rules = [r for r in ruleset.rules if r.v6]
+    ruleset.before_rules = []
+    assert ruleset.loopback_configured() == ["allow in on lo", "allow out on lo", "deny in from 127.0.0.0/8"]
@@ -6,6 +6,9 @@ import tempfile
 import re
 from pathlib import Path
 
+# Optional CLI features this platform module supports (see HardenSys.py)
+CAPABILITIES = frozenset()
+
 def is_admin():
     """Check if the current process is running with administrator privileges."""
     try: